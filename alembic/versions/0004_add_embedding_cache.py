@@ -0,0 +1,35 @@
+"""
+add embedding_cache table
+
+Revision ID: 0004_add_embedding_cache
+Revises: 0003_add_document_chunks
+Create Date: 2026-10-17 00:00:00.000000
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "0004_add_embedding_cache"
+down_revision = "0003_add_document_chunks"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "embedding_cache",
+        sa.Column("model", sa.String(255), primary_key=True),
+        sa.Column("content_hash", sa.String(64), primary_key=True),
+        sa.Column("dim", sa.Integer(), nullable=False),
+        sa.Column("embedding", sa.LargeBinary(), nullable=False),
+        sa.Column(
+            "created_at",
+            sa.DateTime(),
+            server_default=sa.func.now(),
+        ),
+    )
+
+
+def downgrade():
+    op.drop_table("embedding_cache")
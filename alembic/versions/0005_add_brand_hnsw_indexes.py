@@ -0,0 +1,63 @@
+"""
+per-brand HNSW indexes on documents.embedding
+
+One partial index per brand (WHERE brand_id = ...), matching
+app/services/vector_indexes.py; brands created later are indexed on first
+ingest. Built CONCURRENTLY so ingest keeps running during the upgrade.
+Replaces the global ivfflat index from services/create_pgvector_index.sql.
+
+Revision ID: 0005_add_brand_hnsw_indexes
+Revises: 0004_add_embedding_cache
+Create Date: 2026-10-17 00:00:00.000000
+"""
+
+from uuid import UUID
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "0005_add_brand_hnsw_indexes"
+down_revision = "0004_add_embedding_cache"
+branch_labels = None
+depends_on = None
+
+HNSW_M = 16
+HNSW_EF_CONSTRUCTION = 64
+
+
+def _index_name(brand_id):
+    return f"ix_documents_embedding_hnsw_{UUID(str(brand_id)).hex}"
+
+
+def upgrade():
+    bind = op.get_bind()
+    brand_ids = [
+        row[0] for row in bind.execute(
+            sa.text("SELECT DISTINCT brand_id FROM documents WHERE brand_id IS NOT NULL")
+        )
+    ]
+
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS documents_embedding_ivfflat")
+        for brand_id in brand_ids:
+            op.execute(
+                f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {_index_name(brand_id)} "
+                f"ON documents USING hnsw (embedding vector_cosine_ops) "
+                f"WITH (m = {HNSW_M}, ef_construction = {HNSW_EF_CONSTRUCTION}) "
+                f"WHERE brand_id = '{UUID(str(brand_id))}'"
+            )
+    op.execute("ANALYZE documents")
+
+
+def downgrade():
+    bind = op.get_bind()
+    index_names = [
+        row[0] for row in bind.execute(sa.text(
+            "SELECT indexname FROM pg_indexes "
+            "WHERE tablename = 'documents' AND indexname LIKE 'ix_documents_embedding_hnsw_%'"
+        ))
+    ]
+    with op.get_context().autocommit_block():
+        for name in index_names:
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
@@ -0,0 +1,35 @@
+"""
+GIN full-text index on document chunks
+
+Backs the lexical leg of hybrid retrieval (app/services/hybrid_search.py).
+The indexed expression must match hybrid_search.chunk_tsvector() exactly,
+or the planner falls back to a sequential scan. Built CONCURRENTLY so
+ingest keeps running during the upgrade.
+
+Revision ID: 0006_add_chunk_fulltext_index
+Revises: 0005_add_brand_hnsw_indexes
+Create Date: 2026-10-17 00:00:00.000000
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "0006_add_chunk_fulltext_index"
+down_revision = "0005_add_brand_hnsw_indexes"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_documents_chunk_fulltext "
+            "ON documents USING gin (to_tsvector('english'::regconfig, COALESCE(chunk_text, content))) "
+            "WHERE is_chunk = true"
+        )
+    op.execute("ANALYZE documents")
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_documents_chunk_fulltext")
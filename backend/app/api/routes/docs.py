@@ -3,7 +3,7 @@ from sqlalchemy.orm import Session
 from app.db.database import SessionLocal
 from app.models.document import Document, DocumentChunk
 from app.services.chunker import chunk_text
-from app.services.embeddings import get_embedding
+from app.services.embedding_cache import embed_texts_cached
 import aiofiles
 import uuid
 import httpx
@@ -34,9 +34,9 @@ async def upload_doc(file: UploadFile = File(...), brand_id: int = Form(None), d
     db.refresh(doc)
 
     chunks = chunk_text(text)
-    # embed and store chunks
-    for i, chunk in enumerate(chunks):
-        emb = get_embedding(chunk)
+    # embed (one batch, cached by content hash) and store chunks
+    embeddings = embed_texts_cached(chunks, db=db)
+    for i, (chunk, emb) in enumerate(zip(chunks, embeddings)):
         chunk_row = DocumentChunk(
             document_id=doc.id,
             brand_id=brand_id,
@@ -68,8 +68,8 @@ async def scrape_url(url: str = Form(...), brand_id: int = Form(None), db: Sessi
     db.refresh(doc)
 
     chunks = chunk_text(text)
-    for i, chunk in enumerate(chunks):
-        emb = get_embedding(chunk)
+    embeddings = embed_texts_cached(chunks, db=db)
+    for i, (chunk, emb) in enumerate(zip(chunks, embeddings)):
         chunk_row = DocumentChunk(
             document_id=doc.id,
             brand_id=brand_id,
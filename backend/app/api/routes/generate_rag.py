@@ -3,7 +3,7 @@ from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 from app.db.database import SessionLocal
 from app.models.brand import Brand
-from app.services.embedder import embed_texts
+from app.services.embedding_cache import embed_texts_cached
 from app.services.retrieval import retrieve_top_k
 from app.services.prompt_builder import build_rag_prompt
 from app.services.llm_service import call_hermes
@@ -31,8 +31,8 @@ async def generate_rag(req: GenerateRequest, db: Session = Depends(get_db)):
     if not brand:
         raise HTTPException(404, "Brand not found")
     # embed the user instruction to query similar docs
-    q_emb = embed_texts([req.instruction])[0]  # list->vector
-    retrieved = retrieve_top_k(brand_id=req.brand_id, query_embedding=q_emb, k=req.k)
+    q_emb = embed_texts_cached([req.instruction], db=db, persist=False)[0]  # list->vector
+    retrieved = retrieve_top_k(brand_id=req.brand_id, query_embedding=q_emb, k=req.k, db=db)
     # Build prompt (optionally pull template instructions from Template table if template_id provided)
     template_instructions = ""
     if req.template_id:
@@ -18,6 +18,36 @@ class Settings:
     VOYAGE_API_KEY = os.getenv("VOYAGE_API_KEY")
     VOYAGE_MODEL = "voyage-large-3"
     EMBEDDING_MODEL = os.getenv("EMBEDDING_MODEL", "sentence-transformers/all-MiniLM-L6-v2")
+
+    # Embedding client (services/embedding_client.py)
+    EMBEDDING_BACKEND = os.getenv("EMBEDDING_BACKEND", "voyage")  # voyage | local
+    VOYAGE_EMBEDDINGS_URL = os.getenv("VOYAGE_EMBEDDINGS_URL", "https://api.voyageai.com/v1/embeddings")
+    VOYAGE_BATCH_SIZE = int(os.getenv("VOYAGE_BATCH_SIZE", "128"))
+    LOCAL_EMBEDDING_MODEL = os.getenv("LOCAL_EMBEDDING_MODEL", "all-MiniLM-L6-v2")
+    LOCAL_EMBEDDING_BATCH_SIZE = int(os.getenv("LOCAL_EMBEDDING_BATCH_SIZE", "64"))
+    EMBEDDING_CONCURRENCY = int(os.getenv("EMBEDDING_CONCURRENCY", "4"))
+    EMBEDDING_MAX_RETRIES = int(os.getenv("EMBEDDING_MAX_RETRIES", "4"))
+    EMBEDDING_CACHE_SIZE = int(os.getenv("EMBEDDING_CACHE_SIZE", "50000"))  # in-process LRU entries
+
+    # pgvector retrieval (services/vector_indexes.py)
+    RAG_HNSW_M = int(os.getenv("RAG_HNSW_M", "16"))
+    RAG_HNSW_EF_CONSTRUCTION = int(os.getenv("RAG_HNSW_EF_CONSTRUCTION", "64"))
+    RAG_HNSW_EF_SEARCH = int(os.getenv("RAG_HNSW_EF_SEARCH", "100"))  # raised for category-filtered searches
+
+    # In-process per-brand vector index (services/brand_vector_index.py)
+    RAG_LOCAL_INDEX = os.getenv("RAG_LOCAL_INDEX", "false").lower() == "true"
+    RAG_LOCAL_INDEX_DIR = os.getenv("RAG_LOCAL_INDEX_DIR", "data/vector_index")
+    RAG_LOCAL_INDEX_MAX_CHUNKS = int(os.getenv("RAG_LOCAL_INDEX_MAX_CHUNKS", "50000"))
+    RAG_LOCAL_INDEX_DTYPE = os.getenv("RAG_LOCAL_INDEX_DTYPE", "float32")  # float32 | int8
+    RAG_LOCAL_INDEX_CHECK_INTERVAL = float(os.getenv("RAG_LOCAL_INDEX_CHECK_INTERVAL", "30"))  # s between chunk-count checks
+
+    # Hybrid lexical + vector retrieval (services/hybrid_search.py)
+    RAG_HYBRID = os.getenv("RAG_HYBRID", "true").lower() == "true"
+    RAG_VECTOR_WEIGHT = float(os.getenv("RAG_VECTOR_WEIGHT", "1.0"))
+    RAG_LEXICAL_WEIGHT = float(os.getenv("RAG_LEXICAL_WEIGHT", "1.0"))
+    RAG_RRF_K = int(os.getenv("RAG_RRF_K", "60"))
+    RAG_HYBRID_CANDIDATES = int(os.getenv("RAG_HYBRID_CANDIDATES", "20"))  # per leg, before fusion
+    RAG_HYBRID_MIN_SIMILARITY = float(os.getenv("RAG_HYBRID_MIN_SIMILARITY", "0.3"))  # vector leg floor
     HF_TOKEN = os.getenv("HF_TOKEN")
     LOCAL_LLM_PATH = os.getenv("LOCAL_LLM_PATH")
     OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
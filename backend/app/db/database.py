@@ -59,6 +59,7 @@ async def init_db():
         from app.models.email import Email
         from app.models.daily_send import DailySend
         from app.models.send_log import SendLog
+        from app.models.embedding_cache import EmbeddingCacheEntry
         
         async with engine.begin() as conn:
             await conn.run_sync(Base.metadata.create_all)
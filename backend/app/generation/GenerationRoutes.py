@@ -44,7 +44,8 @@ async def generate_content(
         if request.rag_enabled:
             rag_query = request.custom_prompt or f"Content about {request.category}"
             rag_context = await rag_service.get_context_for_generation(
-                db, request.brand_id, rag_query, category=request.category
+                db, request.brand_id, rag_query, category=request.category,
+                vector_weight=request.rag_vector_weight, lexical_weight=request.rag_lexical_weight
             )
         
         # Generate content
@@ -124,7 +125,8 @@ async def batch_generate(
             if request.rag_enabled:
                 query = f"Content about {category}"
                 rag_context = await rag_service.get_context_for_generation(
-                    db, request.brand_id, query, category=category
+                    db, request.brand_id, query, category=category,
+                    vector_weight=request.rag_vector_weight, lexical_weight=request.rag_lexical_weight
                 )
             
             # Generate
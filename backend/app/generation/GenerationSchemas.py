@@ -27,6 +27,8 @@ class QuickGenerateRequest(BaseModel):
     platform: Optional[str] = None
     custom_prompt: Optional[str] = None
     rag_enabled: bool = False  # Default to False since Voyage API key may not be configured
+    rag_vector_weight: Optional[float] = Field(None, ge=0.0)  # hybrid retrieval weights, None = server default
+    rag_lexical_weight: Optional[float] = Field(None, ge=0.0)
     variations_count: int = 3
 
 # Batch Generate Request
@@ -35,6 +37,8 @@ class BatchGenerateRequest(BaseModel):
     categories: List[str] = Field(..., min_items=1)
     count_per_category: int = Field(default=10, ge=1, le=100)
     rag_enabled: bool = False  # Default to False since Voyage API key may not be configured
+    rag_vector_weight: Optional[float] = Field(None, ge=0.0)  # hybrid retrieval weights, None = server default
+    rag_lexical_weight: Optional[float] = Field(None, ge=0.0)
 
 # Response Schema
 class GenerationResponse(GenerationBase):
@@ -7,6 +7,8 @@ FULLY INTEGRATED: All classes and functions from scraper, validator, sender, dat
 
 from fastapi import FastAPI, Depends, HTTPException, BackgroundTasks
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
+from sqlalchemy import func, select
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from pydantic import BaseModel, EmailStr
@@ -18,17 +20,29 @@ from database import (
     ScanJob, SendBatch, EmailVerificationJob, DomainCooldown,
     EmailStatus, EmailDiscoveryStatus, CampaignStatus, ScanStatus, VerificationStatus, SendStatus
 )
-from scraper import start_scan, get_scan_status, PeopleDiscovery, EmailDiscovery, EmailScraper, ScanJobManager
+from scraper import (
+    get_scan_status, run_bulk_people_scan,
+    PeopleDiscovery, EmailDiscovery, EmailScraper, ScanJobManager
+)
 from email_validator import (
     validate_email_full, is_allowed_role, batch_validate_emails, is_blocked_prefix,
     is_company_domain_match, is_blocked_domain, is_disposable_email, is_human_like, 
-    check_mx_record, verify_smtp, calculate_confidence_score, normalize_role,
+    check_mx_record, get_mx_cache_stats, verify_smtp, calculate_confidence_score, normalize_role,
     validate_email_format, DECISION_MAKER_ROLES, BLOCKED_PREFIXES, BLOCKED_DOMAINS,
     DISPOSABLE_DOMAINS, HUMAN_EMAIL_PATTERNS
 )
+from verification_jobs import (
+    run_verification_job, get_verification_job_progress,
+    resume_interrupted_jobs, VERIFY_RESUME_ON_STARTUP
+)
 from email_sender import (
     CampaignManager, EmailSender, EmailCampaignSender
 )
+from scan_queue import enqueue_scan, ScanWorker, SCAN_EMBEDDED_WORKERS
+from email_patterns import EmailPatternLearner
+from listing import (
+    keyset_conditions, next_cursor, clamp_limit, stream_json_array, NEXT_CURSOR_HEADER
+)
 
 # Initialize FastAPI app
 app = FastAPI(
@@ -44,6 +58,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER],
 )
 
 
@@ -64,6 +79,7 @@ class ScanRequest(BaseModel):
     scan_linkedin: bool = False
     max_pages: int = 5
     verify_emails: bool = True
+    page_max_age: Optional[int] = None  # seconds; 0 = revalidate every cached page
 
 
 class ScanJobCreate(BaseModel):
@@ -139,6 +155,13 @@ class FullScanRequest(BaseModel):
     scan_linkedin: bool = False
     max_pages: int = 5
     verify_emails: bool = True
+    page_max_age: Optional[int] = None  # seconds; 0 = revalidate every cached page
+
+
+class BulkPeopleScanRequest(BaseModel):
+    company_ids: List[int]
+    max_pages: int = 5
+    max_workers: Optional[int] = None
 
 
 class PeopleExtractionRequest(BaseModel):
@@ -200,10 +223,31 @@ class CampaignResponse(BaseModel):
 # Startup Event
 # ============================================================================
 
+# Queue worker running scans inside the API process (SCAN_EMBEDDED_WORKERS > 0)
+embedded_scan_worker: Optional[ScanWorker] = None
+
+
 @app.on_event("startup")
 async def startup_event():
     """Initialize database on startup"""
+    global embedded_scan_worker
     init_db()
+    
+    if VERIFY_RESUME_ON_STARTUP:
+        resumed = resume_interrupted_jobs()
+        if resumed:
+            print(f"[VERIFY] Resuming interrupted verification jobs: {resumed}")
+    
+    if SCAN_EMBEDDED_WORKERS > 0:
+        embedded_scan_worker = ScanWorker(concurrency=SCAN_EMBEDDED_WORKERS)
+        embedded_scan_worker.start_in_thread()
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Stop claiming scans; unfinished ones are requeued by other workers"""
+    if embedded_scan_worker is not None:
+        embedded_scan_worker.stop(timeout=0)
 
 
 # ============================================================================
@@ -220,6 +264,72 @@ async def health_check():
     }
 
 
+# ============================================================================
+# Listing helpers (keyset pagination, streamed JSON)
+# ============================================================================
+
+def _keyset_or_400(created_col, id_col, cursor: Optional[str]) -> list:
+    try:
+        return keyset_conditions(created_col, id_col, cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+def _listing_response(statement, serialize, cursor: Optional[str]) -> StreamingResponse:
+    headers = {NEXT_CURSOR_HEADER: cursor} if cursor else {}
+    return StreamingResponse(
+        stream_json_array(statement, serialize),
+        media_type="application/json",
+        headers=headers
+    )
+
+
+def _company_row(row) -> dict:
+    return {
+        "id": row.id,
+        "name": row.name,
+        "domain": row.domain,
+        "status": row.status,
+        "last_scanned": row.last_scanned,
+        "people_count": row.people_count,
+        "email_count": row.email_count
+    }
+
+
+def _person_row(row) -> dict:
+    return {
+        "id": row.id,
+        "full_name": row.full_name,
+        "role": row.role,
+        "role_confidence": row.role_confidence,
+        "company": row.company_name,
+        "email_count": row.email_count,
+        "created_at": row.created_at
+    }
+
+
+def _email_row(row) -> dict:
+    return {
+        "id": row.id,
+        "email_address": row.email_address,
+        "person": {
+            "id": row.person_id,
+            "full_name": row.full_name,
+            "role": row.role,
+            "role_confidence": row.role_confidence
+        } if row.person_id is not None else None,
+        "status": row.status,
+        "verification_status": row.verification_status,
+        "quality_score": row.quality_score,
+        "confidence_score": row.confidence_score,
+        "confidence_level": row.confidence_level,
+        "source_type": row.source_type,
+        "source_url": row.source_url,
+        "discovery_method": row.discovery_method,
+        "company": row.company_name
+    }
+
+
 # ============================================================================
 # Company Endpoints
 # ============================================================================
@@ -269,31 +379,37 @@ async def get_company_by_domain(domain: str, db: Session = Depends(get_db)):
 
 @app.get("/companies/")
 async def list_companies(
+    cursor: Optional[str] = None,
     skip: int = 0,
     limit: int = 100,
     db: Session = Depends(get_db)
 ):
-    """List all companies"""
-    companies = db.query(Company).offset(skip).limit(limit).all()
-    
-    result = []
-    for c in companies:
-        validated_emails = db.query(Email).filter(
-            Email.company_id == c.id,
-            Email.discovery_status == EmailDiscoveryStatus.VALIDATED
-        ).count()
-        
-        result.append({
-            "id": c.id,
-            "name": c.name,
-            "domain": c.domain,
-            "status": c.status,
-            "last_scanned": c.last_scanned,
-            "people_count": len(c.people),
-            "email_count": validated_emails
-        })
-    
-    return result
+    """
+    List all companies, oldest first
+    Pass the X-Next-Cursor response header back as ?cursor= for the next page
+    (skip is still honoured for old clients, but scans every skipped row)
+    """
+    conditions = _keyset_or_400(Company.created_at, Company.id, cursor)
+    limit = clamp_limit(limit)
+    skip = 0 if cursor else skip
+
+    people_count = select(func.count(Person.id)).where(
+        Person.company_id == Company.id
+    ).correlate(Company).scalar_subquery()
+    email_count = select(func.count(Email.id)).where(
+        Email.company_id == Company.id,
+        Email.discovery_status == EmailDiscoveryStatus.VALIDATED
+    ).correlate(Company).scalar_subquery()
+
+    statement = select(
+        Company.id, Company.name, Company.domain, Company.status, Company.last_scanned,
+        people_count.label("people_count"), email_count.label("email_count")
+    ).where(*conditions).order_by(Company.created_at, Company.id).offset(skip).limit(limit)
+
+    return _listing_response(
+        statement, _company_row,
+        next_cursor(db, Company.created_at, Company.id, conditions, limit, skip)
+    )
 
 
 @app.get("/companies/{company_id}")
@@ -330,39 +446,29 @@ async def get_company(company_id: int, db: Session = Depends(get_db)):
 async def scan_company(
     company_id: int,
     scan_request: ScanRequest,
-    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db)
 ):
     """
     PRIMARY ENDPOINT: Scan company to discover people and emails
     This triggers the full pipeline: Company → People → Roles → Emails → Drafts
+    The scan is queued and run by a scan worker (scan_queue.py)
     """
     company = db.query(Company).filter(Company.id == company_id).first()
     if not company:
         raise HTTPException(status_code=404, detail="Company not found")
     
-    scan_job = ScanJob(
-        company_id=company_id,
-        status=ScanStatus.PENDING,
-        progress_percentage=0
-    )
-    db.add(scan_job)
-    db.commit()
-    db.refresh(scan_job)
-    
-    background_tasks.add_task(
-        start_scan,
+    scan_job = enqueue_scan(
         db,
         company_id,
-        scan_request.scan_website,
-        scan_request.scan_linkedin,
-        scan_request.max_pages,
-        scan_request.verify_emails,
-        scan_job.id
+        scan_website=scan_request.scan_website,
+        scan_linkedin=scan_request.scan_linkedin,
+        max_pages=scan_request.max_pages,
+        verify_emails=scan_request.verify_emails,
+        page_max_age=scan_request.page_max_age
     )
     
     return {
-        "status": "started",
+        "status": "queued",
         "scan_job_id": scan_job.id,
         "company_id": company_id,
         "company_name": company.name,
@@ -445,7 +551,7 @@ async def discover_email_for_person(
         company_id=0  # Temporary
     )
     
-    email_discovery = EmailDiscovery()
+    email_discovery = EmailDiscovery(EmailPatternLearner(db))
     discovered_emails = email_discovery.discover_email(
         person,
         request.company_domain,
@@ -500,33 +606,55 @@ async def scrape_website_endpoint(
 @app.post("/scraper/run-full-scan")
 async def run_full_scan_endpoint(
     request: FullScanRequest,
-    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db)
 ):
     """
     Direct access to EmailScraper.run_full_scan()
-    Run complete scan pipeline with all options
+    Run complete scan pipeline with all options (queued for a scan worker)
     """
-    scraper = EmailScraper(db)
-    
-    def scan_task():
-        result = scraper.run_full_scan(
-            company_id=request.company_id,
-            scan_website=request.scan_website,
-            scan_linkedin=request.scan_linkedin,
-            max_pages=request.max_pages,
-            verify_emails=request.verify_emails
-        )
-        return result
-    
-    background_tasks.add_task(scan_task)
+    if not db.query(Company.id).filter(Company.id == request.company_id).first():
+        raise HTTPException(status_code=404, detail="Company not found")
+
+    scan_job = enqueue_scan(
+        db,
+        request.company_id,
+        scan_website=request.scan_website,
+        scan_linkedin=request.scan_linkedin,
+        max_pages=request.max_pages,
+        verify_emails=request.verify_emails,
+        page_max_age=request.page_max_age
+    )
     
     return {
-        "message": "Full scan started",
+        "message": "Full scan queued",
+        "scan_job_id": scan_job.id,
         "company_id": request.company_id
     }
 
 
+@app.post("/scraper/bulk-people-scan")
+async def bulk_people_scan_endpoint(
+    request: BulkPeopleScanRequest,
+    background_tasks: BackgroundTasks
+):
+    """
+    Bulk people discovery for many companies
+    Page parsing and people extraction run in a process pool so large
+    overnight scans scale with cores instead of the API's thread pool
+    """
+    background_tasks.add_task(
+        run_bulk_people_scan,
+        request.company_ids,
+        request.max_pages,
+        request.max_workers
+    )
+    
+    return {
+        "message": "Bulk people scan started",
+        "companies": len(request.company_ids)
+    }
+
+
 @app.post("/scraper/create-scan-job")
 async def create_scan_job_manual(
     job: ScanJobCreate,
@@ -680,10 +808,11 @@ async def validate_email_endpoint(request: EmailValidationRequest):
 
 
 @app.post("/validator/batch-validate")
-async def batch_validate_endpoint(request: BatchEmailValidationRequest):
+def batch_validate_endpoint(request: BatchEmailValidationRequest):
     """
     Direct access to batch_validate_emails()
     Validate multiple emails at once
+    Sync handler: large uploads are CPU bound and run in the threadpool
     """
     results = batch_validate_emails(
         request.emails,
@@ -789,6 +918,15 @@ async def check_mx_record_endpoint(request: DomainCheckRequest):
     }
 
 
+@app.get("/validator/mx-cache-stats")
+async def mx_cache_stats_endpoint():
+    """
+    MX resolution cache counters
+    hits/misses/coalesced lookups and actual resolver calls
+    """
+    return get_mx_cache_stats()
+
+
 @app.post("/validator/verify-smtp")
 async def verify_smtp_endpoint(request: EmailCheckRequest):
     """
@@ -1063,36 +1201,37 @@ async def finalize_send_run_endpoint(db: Session = Depends(get_db)):
 @app.get("/people/")
 async def list_people(
     company_id: Optional[int] = None,
+    cursor: Optional[str] = None,
     skip: int = 0,
     limit: int = 100,
     db: Session = Depends(get_db)
 ):
-    """List discovered people (decision makers only)"""
-    query = db.query(Person)
-    
+    """
+    List discovered people (decision makers only), oldest first
+    Paged by cursor like /companies/
+    """
+    conditions = _keyset_or_400(Person.created_at, Person.id, cursor)
     if company_id:
-        query = query.filter(Person.company_id == company_id)
-    
-    people = query.offset(skip).limit(limit).all()
-    
-    result = []
-    for p in people:
-        validated_emails = db.query(Email).filter(
-            Email.person_id == p.id,
-            Email.discovery_status == EmailDiscoveryStatus.VALIDATED
-        ).count()
-        
-        result.append({
-            "id": p.id,
-            "full_name": p.full_name,
-            "role": p.role,
-            "role_confidence": p.role_confidence,
-            "company": p.company.name if p.company else None,
-            "email_count": validated_emails,
-            "created_at": p.created_at
-        })
-    
-    return result
+        conditions.append(Person.company_id == company_id)
+    limit = clamp_limit(limit)
+    skip = 0 if cursor else skip
+
+    email_count = select(func.count(Email.id)).where(
+        Email.person_id == Person.id,
+        Email.discovery_status == EmailDiscoveryStatus.VALIDATED
+    ).correlate(Person).scalar_subquery()
+
+    statement = select(
+        Person.id, Person.full_name, Person.role, Person.role_confidence,
+        Company.name.label("company_name"), email_count.label("email_count"), Person.created_at
+    ).outerjoin(Company, Company.id == Person.company_id).where(*conditions).order_by(
+        Person.created_at, Person.id
+    ).offset(skip).limit(limit)
+
+    return _listing_response(
+        statement, _person_row,
+        next_cursor(db, Person.created_at, Person.id, conditions, limit, skip)
+    )
 
 
 @app.get("/people/{person_id}")
@@ -1141,51 +1280,52 @@ async def list_emails(
     company_id: Optional[int] = None,
     person_id: Optional[int] = None,
     min_confidence: Optional[float] = None,
+    confidence_level: Optional[str] = None,
+    cursor: Optional[str] = None,
     skip: int = 0,
     limit: int = 100,
     db: Session = Depends(get_db)
 ):
     """
-    List emails with filters
+    List emails with filters, oldest first
     ONLY RETURNS VALIDATED EMAILS
+    Paged by cursor like /companies/; each filter has a (filter, created_at, id) index
     """
-    query = db.query(Email).filter(
-        Email.discovery_status == EmailDiscoveryStatus.VALIDATED
-    )
+    conditions = _keyset_or_400(Email.created_at, Email.id, cursor)
+    conditions.append(Email.discovery_status == EmailDiscoveryStatus.VALIDATED)
     
     if status:
-        query = query.filter(Email.status == status)
+        conditions.append(Email.status == status)
     
     if company_id:
-        query = query.filter(Email.company_id == company_id)
+        conditions.append(Email.company_id == company_id)
     
     if person_id:
-        query = query.filter(Email.person_id == person_id)
+        conditions.append(Email.person_id == person_id)
     
-    if min_confidence:
-        query = query.filter(Email.confidence_score >= min_confidence)
+    if confidence_level:
+        conditions.append(Email.confidence_level == confidence_level)
     
-    emails = query.offset(skip).limit(limit).all()
-    
-    return [{
-        "id": e.id,
-        "email_address": e.email_address,
-        "person": {
-            "id": e.person.id,
-            "full_name": e.person.full_name,
-            "role": e.person.role,
-            "role_confidence": e.person.role_confidence
-        } if e.person else None,
-        "status": e.status,
-        "verification_status": e.verification_status,
-        "quality_score": e.quality_score,
-        "confidence_score": e.confidence_score,
-        "confidence_level": e.confidence_level,
-        "source_type": e.source_type,
-        "source_url": e.source_url,
-        "discovery_method": e.discovery_method,
-        "company": e.company.name if e.company else None
-    } for e in emails]
+    if min_confidence:
+        conditions.append(Email.confidence_score >= min_confidence)
+    
+    limit = clamp_limit(limit)
+    skip = 0 if cursor else skip
+
+    statement = select(
+        Email.id, Email.email_address, Email.status, Email.verification_status,
+        Email.quality_score, Email.confidence_score, Email.confidence_level,
+        Email.source_type, Email.source_url, Email.discovery_method,
+        Person.id.label("person_id"), Person.full_name, Person.role, Person.role_confidence,
+        Company.name.label("company_name")
+    ).outerjoin(Person, Person.id == Email.person_id).outerjoin(
+        Company, Company.id == Email.company_id
+    ).where(*conditions).order_by(Email.created_at, Email.id).offset(skip).limit(limit)
+
+    return _listing_response(
+        statement, _email_row,
+        next_cursor(db, Email.created_at, Email.id, conditions, limit, skip)
+    )
 
 
 @app.post("/emails/queue")
@@ -1278,70 +1418,27 @@ async def verify_bulk_emails(
     db: Session = Depends(get_db)
 ):
     """Verify multiple emails in bulk"""
-    emails_to_verify = db.query(Email).filter(
+    has_emails = db.query(Email.id).filter(
         Email.id.in_(request.email_ids),
         Email.discovery_status == EmailDiscoveryStatus.VALIDATED
-    ).all()
+    ).first()
     
-    if not emails_to_verify:
+    if not has_emails:
         raise HTTPException(status_code=404, detail="No emails found")
     
     job = EmailVerificationJob(
         email_ids=json.dumps(request.email_ids),
         total_emails=len(request.email_ids),
+        check_mx=request.check_mx,
+        check_smtp=request.check_smtp,
         status='pending'
     )
     db.add(job)
     db.commit()
     db.refresh(job)
     
-    def verify_emails_task():
-        job.status = 'running'
-        job.started_at = datetime.utcnow()
-        db.commit()
-        
-        for idx, email in enumerate(emails_to_verify):
-            company = db.query(Company).filter(Company.id == email.company_id).first()
-            
-            validation = validate_email_full(
-                email.email_address,
-                company.domain,
-                role_confidence=email.person.role_confidence if email.person else 1.0,
-                discovery_method=email.discovery_method,
-                check_mx=request.check_mx,
-                check_smtp=request.check_smtp
-            )
-            
-            email.quality_score = validation['quality_score']
-            email.confidence_score = validation['confidence_score']
-            email.confidence_level = validation['confidence_level']
-            email.is_validated = True
-            email.mx_valid = validation['mx_valid']
-            email.is_disposable = validation['is_disposable']
-            email.is_role_email = validation['is_role_email']
-            email.verification_status = validation['verification_status']
-            email.verified_at = datetime.utcnow()
-            
-            if not validation['is_valid']:
-                email.status = EmailStatus.DELETED
-                email.discovery_status = EmailDiscoveryStatus.REJECTED_QUALITY
-                job.invalid_count += 1
-            elif validation['verification_status'] == VerificationStatus.VALID:
-                job.valid_count += 1
-            else:
-                job.risky_count += 1
-            
-            job.verified_count += 1
-            job.current_email_index = idx
-            job.progress_percentage = int((idx / len(emails_to_verify)) * 100)
-            db.commit()
-        
-        job.status = 'completed'
-        job.completed_at = datetime.utcnow()
-        job.progress_percentage = 100
-        db.commit()
-    
-    background_tasks.add_task(verify_emails_task)
+    # Runner uses its own session (request session closes with the response)
+    background_tasks.add_task(run_verification_job, job.id)
     
     return {
         "message": "Bulk verification started",
@@ -1360,7 +1457,7 @@ async def get_verification_job_status(job_id: int, db: Session = Depends(get_db)
     if not job:
         raise HTTPException(status_code=404, detail="Verification job not found")
     
-    return {
+    status = {
         "id": job.id,
         "status": job.status,
         "progress_percentage": job.progress_percentage,
@@ -1369,9 +1466,48 @@ async def get_verification_job_status(job_id: int, db: Session = Depends(get_db)
         "valid_count": job.valid_count,
         "invalid_count": job.invalid_count,
         "risky_count": job.risky_count,
+        "current_email_index": job.current_email_index,
         "started_at": job.started_at,
         "completed_at": job.completed_at
     }
+    
+    # Live counters when the job runs in this process (DB is updated per chunk)
+    live = get_verification_job_progress(job.id)
+    if live and live['status'] == 'running' and job.status == 'running':
+        status.update(live)
+    
+    return status
+
+
+@app.post("/emails/verify/job/{job_id}/resume")
+async def resume_verification_job(
+    job_id: int,
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db)
+):
+    """Resume an interrupted verification job from current_email_index"""
+    job = db.query(EmailVerificationJob).filter(
+        EmailVerificationJob.id == job_id
+    ).first()
+    
+    if not job:
+        raise HTTPException(status_code=404, detail="Verification job not found")
+    
+    if job.status == 'completed':
+        raise HTTPException(status_code=400, detail="Verification job already completed")
+    
+    live = get_verification_job_progress(job.id)
+    if live and live['status'] == 'running':
+        raise HTTPException(status_code=409, detail="Verification job is already running")
+    
+    background_tasks.add_task(run_verification_job, job.id)
+    
+    return {
+        "message": "Verification job resumed",
+        "job_id": job.id,
+        "resume_from": job.current_email_index,
+        "total_emails": job.total_emails
+    }
 
 
 # ============================================================================
@@ -1605,9 +1741,8 @@ async def get_overview_stats(db: Session = Depends(get_db)):
         Campaign.status == CampaignStatus.ACTIVE
     ).count()
     
-    total_sent = db.query(SendLog).filter(
-        SendLog.status == SendStatus.SENT
-    ).count()
+    # Sum of per-campaign counters (not a SendLog scan)
+    total_sent = db.query(func.coalesce(func.sum(Campaign.total_sent), 0)).scalar()
     
     return {
         "companies": total_companies,
@@ -1646,6 +1781,18 @@ async def reset_email_queue(db: Session = Depends(get_db)):
     }
 
 
+@app.post("/utils/rebuild-campaign-counters")
+async def rebuild_campaign_counters(campaign_id: Optional[int] = None, db: Session = Depends(get_db)):
+    """Recompute campaign sent/failed/bounced counters from send logs"""
+    manager = CampaignManager(db)
+    updated = manager.rebuild_campaign_counters(campaign_id)
+    
+    return {
+        "message": "Campaign counters rebuilt",
+        "campaigns_updated": updated
+    }
+
+
 # ============================================================================
 # NEW: Database Model Access Endpoints
 # ============================================================================
@@ -0,0 +1,118 @@
+"""
+Benchmark of crawl order: how soon people pages are reached
+Local HTTP server: homepage links 30 product / case-study pages before
+/about; /team and /leadership are only listed in sitemap.xml (announced in
+robots.txt, which also disallows /internal/)
+- fifo:      legacy order (links in page order, no robots / sitemap)
+- priority:  score_people_url frontier + robots.txt + sitemap seeding
+
+Usage: python bench_crawl_priority.py [max_pages] [latency_ms]
+"""
+import asyncio
+import re
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from crawler import AsyncCrawler
+from scraper import score_people_url
+from site_index import SiteIndexCache
+
+PEOPLE_PAGES = {"/about", "/team", "/leadership"}
+HREF_REGEX = re.compile(r'href="([^"]+)"')
+
+
+def make_handler(latency: float, stats: dict):
+    filler = "<p>" + "Reliable software for modern teams. " * 20 + "</p>"
+    product_pages = [f"/product/feature-{i}" for i in range(15)] + [f"/case-studies/customer-{i}" for i in range(15)]
+    home_links = product_pages + ["/about", "/internal/admin"]
+
+    def page(links, people=False):
+        anchors = "".join(f'<a href="{link}">{link}</a>' for link in links)
+        team = "<h2>Jane Doe</h2><p>CEO</p><h2>John Roe</h2><p>CTO</p>" if people else ""
+        return f"<html><body>{anchors}{team}{filler}</body></html>"
+
+    bodies = {"/": page(home_links)}
+    for path in product_pages:
+        bodies[path] = page(["/"])
+    for path in PEOPLE_PAGES:
+        bodies[path] = page(["/"], people=True)
+    bodies["/internal/admin"] = page([])
+
+    def sitemap(base):
+        paths = ["/"] + product_pages + sorted(PEOPLE_PAGES)
+        urls = "".join(f"<url><loc>{base}{path}</loc></url>" for path in paths)
+        return f'<?xml version="1.0"?><urlset>{urls}</urlset>'
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, *args):
+            pass
+
+        def do_GET(self):
+            time.sleep(latency)
+            base = f"http://{self.headers['Host']}"
+            if self.path == "/robots.txt":
+                body, content_type = f"User-agent: *\nDisallow: /internal/\nSitemap: {base}/sitemap.xml\n", "text/plain"
+            elif self.path == "/sitemap.xml":
+                body, content_type = sitemap(base), "application/xml"
+            elif self.path in bodies:
+                stats['pages'].append(self.path)
+                body, content_type = bodies[self.path], "text/html"
+            else:
+                self.send_response(404)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            data = body.encode()
+            self.send_response(200)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+    return Handler
+
+
+def crawl(start_url: str, max_pages: int, prioritized: bool):
+    found = []
+
+    def on_page(url, html):
+        if "Jane Doe" in html:
+            found.append(url)
+        return [start_url.rstrip('/') + href for href in HREF_REGEX.findall(html)]
+
+    crawler = AsyncCrawler(
+        headers={'User-Agent': 'bench-crawler'},
+        concurrency=2,
+        rate_limit=0,
+        url_scorer=score_people_url if prioritized else None,
+        site_index=SiteIndexCache() if prioritized else None
+    )
+    asyncio.run(crawler.crawl(start_url, max_pages, on_page))
+    return found
+
+
+def main():
+    max_pages = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    latency = (float(sys.argv[2]) if len(sys.argv) > 2 else 20) / 1000
+
+    stats = {'pages': []}
+    server = ThreadingHTTPServer(("127.0.0.1", 0), make_handler(latency, stats))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    start_url = f"http://127.0.0.1:{server.server_address[1]}/"
+
+    for label, prioritized in (("fifo", False), ("priority", True)):
+        stats['pages'] = []
+        found = crawl(start_url, max_pages, prioritized)
+        people_pages = sorted({url.rsplit('/', 1)[1] for url in found})
+        print(f"{label:>9}: {len(stats['pages'])} pages fetched, {len(found)} people pages "
+              f"{people_pages}, order: {' '.join(stats['pages'])}")
+
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
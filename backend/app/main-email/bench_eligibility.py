@@ -0,0 +1,126 @@
+"""
+Benchmark EmailCampaignSender.get_eligible_emails on a seeded table
+Before: limit*2 queued emails, then one SendLog + one DomainCooldown query each
+After: one statement (anti-join, cooldown join, ROW_NUMBER per domain)
+
+Seeds a scratch SQLite file (never DATABASE_URL) unless BENCH_DATABASE_URL is set
+Usage: python bench_eligibility.py [emails] [limit]
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+
+from database import (
+    Base, Email, SendLog, DomainCooldown,
+    EmailStatus, EmailDiscoveryStatus, SendStatus
+)
+from email_sender import EmailCampaignSender
+
+CAMPAIGN_ID = 1
+EMAILS_PER_DOMAIN = 50
+
+
+def legacy_eligible_emails(sender: EmailCampaignSender, campaign_id: int, limit: int):
+    """Previous per-row implementation"""
+    db = sender.db
+    queued_emails = db.query(Email).filter(
+        Email.status == EmailStatus.QUEUED,
+        Email.is_validated == True
+    ).limit(limit * 2).all()
+
+    eligible = []
+    domains_contacted = set()
+    for email in queued_emails:
+        if len(eligible) >= limit:
+            break
+        already_sent = db.query(SendLog).filter(
+            SendLog.email_id == email.id,
+            SendLog.campaign_id == campaign_id
+        ).first()
+        if already_sent:
+            continue
+        domain = email.email_address.split('@')[1]
+        if domain in domains_contacted or not sender.check_domain_cooldown(domain):
+            continue
+        eligible.append(email)
+        domains_contacted.add(domain)
+    return eligible[:limit]
+
+
+def seed(engine, total: int):
+    random.seed(3)
+    Base.metadata.create_all(bind=engine)
+    now = datetime.utcnow()
+    domains = [f"company{i}.com" for i in range(max(1, total // EMAILS_PER_DOMAIN))]
+
+    with engine.begin() as conn:
+        batch = []
+        for i in range(1, total + 1):
+            batch.append({
+                'id': i,
+                'email_address': f"person{i}@{domains[i % len(domains)]}",
+                'person_id': 1, 'company_id': 1, 'scan_job_id': 1,
+                'status': EmailStatus.QUEUED,
+                'discovery_status': EmailDiscoveryStatus.VALIDATED,
+                'is_validated': True,
+                'source_type': 'bench', 'source_url': 'bench', 'discovery_method': 'regex'
+            })
+            if len(batch) == 50000:
+                conn.execute(insert(Email), batch)
+                batch = []
+        if batch:
+            conn.execute(insert(Email), batch)
+
+        # 10% already sent in the campaign, 30% of domains in cooldown
+        conn.execute(insert(SendLog), [
+            {'email_id': i, 'campaign_id': CAMPAIGN_ID, 'status': SendStatus.SENT}
+            for i in range(1, total + 1) if i % 10 == 0
+        ])
+        conn.execute(insert(DomainCooldown), [
+            {'domain': domain, 'last_contacted': now - timedelta(days=random.randint(0, 3)), 'contact_count': 1}
+            for domain in random.sample(domains, int(len(domains) * 0.3))
+        ])
+
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=engine, checkfirst=True)
+
+
+def main():
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    limit = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+
+    url = os.getenv("BENCH_DATABASE_URL")
+    if not url:
+        url = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench_eligibility.db')}"
+    engine = create_engine(url)
+
+    start = time.perf_counter()
+    seed(engine, total)
+    print(f"seeded {total} emails in {time.perf_counter() - start:.1f}s ({url})")
+
+    db = sessionmaker(bind=engine)()
+    sender = EmailCampaignSender(db)
+
+    for label, run in (
+        ("per-row", lambda: legacy_eligible_emails(sender, CAMPAIGN_ID, limit)),
+        ("set-based", lambda: sender.get_eligible_emails(CAMPAIGN_ID, limit)),
+    ):
+        db.expunge_all()
+        start = time.perf_counter()
+        eligible = run()
+        elapsed = time.perf_counter() - start
+        domains = {e.email_address.split('@')[1] for e in eligible}
+        print(f"{label:>10}: {elapsed * 1000:8.1f} ms  {len(eligible)} emails / {len(domains)} domains")
+
+    db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""
+Benchmark deep pages of the /emails/ listing on a seeded table
+Before: OFFSET skip LIMIT n, then a lazy Person + Company load per row
+After: (created_at, id) > cursor on the keyset index, columns joined in one statement
+
+Seeds a scratch SQLite file (never DATABASE_URL) unless BENCH_DATABASE_URL is set
+Usage: python bench_listing.py [emails] [limit]
+"""
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.orm import sessionmaker
+
+from database import Base, Company, Person, Email, EmailDiscoveryStatus
+from listing import encode_cursor, keyset_conditions
+
+EMAILS_PER_PERSON = 2
+
+
+def seed(engine, total: int):
+    Base.metadata.create_all(bind=engine)
+    start = datetime(2026, 1, 1)
+    people = max(1, total // EMAILS_PER_PERSON)
+
+    with engine.begin() as conn:
+        conn.execute(insert(Company), [{'id': 1, 'name': 'Bench', 'domain': 'bench.com'}])
+        conn.execute(insert(Person), [
+            {'id': i, 'company_id': 1, 'full_name': f"Person {i}", 'normalized_name': f"person {i}",
+             'source_page': 'bench'}
+            for i in range(1, people + 1)
+        ])
+        batch = []
+        for i in range(1, total + 1):
+            batch.append({
+                'id': i,
+                'email_address': f"person{i}@bench.com",
+                'person_id': 1 + (i - 1) // EMAILS_PER_PERSON, 'company_id': 1, 'scan_job_id': 1,
+                'discovery_status': EmailDiscoveryStatus.VALIDATED if i % 5 else EmailDiscoveryStatus.DISCOVERED,
+                'source_type': 'bench', 'source_url': 'bench', 'discovery_method': 'regex',
+                'created_at': start + timedelta(seconds=i // 3)
+            })
+            if len(batch) == 50000:
+                conn.execute(insert(Email), batch)
+                batch = []
+        if batch:
+            conn.execute(insert(Email), batch)
+
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=engine, checkfirst=True)
+
+
+def offset_page(db, skip: int, limit: int):
+    """Previous implementation"""
+    emails = db.query(Email).filter(
+        Email.discovery_status == EmailDiscoveryStatus.VALIDATED
+    ).offset(skip).limit(limit).all()
+    return [(e.id, e.person.full_name if e.person else None, e.company.name if e.company else None) for e in emails]
+
+
+def keyset_page(db, cursor: str, limit: int):
+    conditions = keyset_conditions(Email.created_at, Email.id, cursor)
+    return db.execute(
+        select(Email.id, Person.full_name, Company.name)
+        .outerjoin(Person, Person.id == Email.person_id)
+        .outerjoin(Company, Company.id == Email.company_id)
+        .where(Email.discovery_status == EmailDiscoveryStatus.VALIDATED, *conditions)
+        .order_by(Email.created_at, Email.id)
+        .limit(limit)
+    ).all()
+
+
+def main():
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    limit = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+
+    url = os.getenv("BENCH_DATABASE_URL")
+    if not url:
+        url = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench_listing.db')}"
+    engine = create_engine(url)
+
+    start = time.perf_counter()
+    seed(engine, total)
+    print(f"seeded {total} emails in {time.perf_counter() - start:.1f}s ({url})")
+
+    db = sessionmaker(bind=engine)()
+    validated = db.query(Email.created_at, Email.id).filter(
+        Email.discovery_status == EmailDiscoveryStatus.VALIDATED
+    ).order_by(Email.created_at, Email.id)
+
+    for fraction in (0.0, 0.5, 0.99):
+        skip = int(total * 0.8 * fraction)
+        cursor = encode_cursor(*validated.offset(skip - 1).first()) if skip else None
+
+        db.expunge_all()
+        start = time.perf_counter()
+        old = offset_page(db, skip, limit)
+        offset_ms = (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        new = keyset_page(db, cursor, limit)
+        keyset_ms = (time.perf_counter() - start) * 1000
+
+        same = [row[0] for row in old] == [row[0] for row in new]
+        print(f"skip {skip:>8}: offset {offset_ms:8.1f} ms  keyset {keyset_ms:6.1f} ms  same page: {same}")
+
+    db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Benchmark re-scanning a site with and without the page cache
+Local HTTP server: linked pages with ETag / Last-Modified, fixed latency
+per response plus transfer time proportional to body size
+- no cache:      every page downloaded again
+- revalidate:    warm cache, page_max_age=0 -> conditional GET, 304 each page
+- fresh:         warm cache within the freshness window -> no requests
+
+Uses a scratch cache directory (never PAGE_CACHE_DIR)
+Usage: python bench_page_cache.py [pages] [page_kb] [latency_ms]
+"""
+import asyncio
+import hashlib
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from crawler import AsyncCrawler
+from page_cache import FreshnessPolicy, PageCache
+
+LAST_MODIFIED = "Mon, 05 Oct 2026 08:00:00 GMT"
+
+
+def make_handler(pages: int, page_kb: int, latency: float, stats: dict):
+    filler = "<p>" + "Team, careers and company news. " * 32 + "</p>"
+    bodies = {}
+    for i in range(pages):
+        links = "".join(f'<a href="/p{j}">page {j}</a>' for j in range(pages))
+        body = f"<html><body><h1>Page {i}</h1>{links}{filler * page_kb}</body></html>".encode()
+        bodies[f"/p{i}"] = (body, '"' + hashlib.md5(body).hexdigest() + '"')
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, *args):
+            pass
+
+        def do_GET(self):
+            body, etag = bodies.get(self.path, bodies["/p0"])
+            time.sleep(latency)
+            stats['requests'] += 1
+            if self.headers.get("If-None-Match") == etag:
+                stats['not_modified'] += 1
+                self.send_response(304)
+                self.send_header("ETag", etag)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            # ~10 MB/s link
+            time.sleep(len(body) / 10_000_000)
+            stats['bytes'] += len(body)
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html")
+            self.send_header("ETag", etag)
+            self.send_header("Last-Modified", LAST_MODIFIED)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    return Handler
+
+
+def crawl(start_url: str, pages: int, cache, freshness=None) -> int:
+    base = start_url.rsplit('/', 1)[0]
+    links = [f"{base}/p{i}" for i in range(pages)]
+    crawler = AsyncCrawler(concurrency=4, rate_limit=0, page_cache=cache, freshness=freshness)
+    return asyncio.run(crawler.crawl(start_url, pages, lambda url, html: links))
+
+
+def main():
+    pages = int(sys.argv[1]) if len(sys.argv) > 1 else 40
+    page_kb = int(sys.argv[2]) if len(sys.argv) > 2 else 60
+    latency = (float(sys.argv[3]) if len(sys.argv) > 3 else 20) / 1000
+
+    stats = {'requests': 0, 'not_modified': 0, 'bytes': 0}
+    server = ThreadingHTTPServer(("127.0.0.1", 0), make_handler(pages, page_kb, latency, stats))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    start_url = f"http://127.0.0.1:{server.server_address[1]}/p0"
+
+    cache = PageCache(directory=tempfile.mkdtemp(), max_bytes=512 * 1024 * 1024)
+    crawl(start_url, pages, cache)  # warm the cache (first scan)
+
+    runs = [
+        ("no cache", None, None),
+        ("revalidate", cache, FreshnessPolicy(max_age=0)),
+        ("fresh", cache, FreshnessPolicy(max_age=3600)),
+    ]
+    for label, run_cache, freshness in runs:
+        for key in stats:
+            stats[key] = 0
+        start = time.perf_counter()
+        fetched = crawl(start_url, pages, run_cache, freshness)
+        elapsed = time.perf_counter() - start
+        print(f"{label:>10}: {elapsed:6.2f}s  {fetched} pages  {stats['requests']} requests  "
+              f"{stats['not_modified']} x 304  {stats['bytes'] / 1024:8.0f} KiB downloaded")
+
+    server.shutdown()
+    cache.close()
+
+
+if __name__ == "__main__":
+    main()
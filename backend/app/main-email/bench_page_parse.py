@@ -0,0 +1,62 @@
+"""
+Benchmark per-page CPU cost of people + email discovery
+Before: every strategy re-parses the raw HTML (1 + N parses per page)
+After: one ParsedPage shared by all strategies
+
+Usage: python bench_page_parse.py [people_per_page] [rounds]
+"""
+import sys
+import time
+
+from database import Person
+from page_document import ParsedPage
+from scraper import PeopleDiscovery, EmailDiscovery
+
+ROLES = ["CEO", "CTO", "Head of Engineering", "VP Sales", "Founder", "Staff Engineer"]
+FIRST = ["Alice", "Bruno", "Chloe", "David", "Emma", "Felix", "Grace", "Hugo", "Irene", "James"]
+LAST = ["Adams", "Baker", "Clark", "Dixon", "Evans", "Foster"]
+
+
+def build_team_page(people: int) -> str:
+    cards = []
+    for i in range(people):
+        name = f"{FIRST[i % len(FIRST)]} {LAST[(i // len(FIRST)) % len(LAST)]}"
+        local = name.lower().replace(" ", ".")
+        cards.append(
+            f'<div class="team-member"><h3>{name}</h3>'
+            f'<p class="title">{ROLES[i % len(ROLES)]}</p>'
+            f'<p><a href="mailto:{local}@acme.io">{local}@acme.io</a></p></div>'
+        )
+    filler = "<p>" + "We build reliable software for modern teams. " * 40 + "</p>"
+    return f"<html><body><nav>{filler}</nav>{''.join(cards)}<footer>{filler}</footer></body></html>"
+
+
+def run(html: str, shared: bool):
+    people_discovery = PeopleDiscovery()
+    email_discovery = EmailDiscovery()
+    url = "https://acme.io/team"
+
+    source = ParsedPage(html, url) if shared else html
+    people = people_discovery.extract_people(source, url, "acme.io")
+    for person_data in people:
+        person = Person(full_name=person_data['name'], source_page=url)
+        # Raw HTML input makes discover_email parse the page again per person
+        email_discovery.discover_email(person, "acme.io", html=source)
+    return len(people)
+
+
+def main():
+    people = int(sys.argv[1]) if len(sys.argv) > 1 else 30
+    rounds = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    html = build_team_page(people)
+
+    for label, shared in (("per-strategy parse", False), ("shared ParsedPage", True)):
+        start = time.process_time()
+        for _ in range(rounds):
+            found = run(html, shared)
+        elapsed = (time.process_time() - start) / rounds
+        print(f"{label:>20}: {elapsed * 1000:8.2f} ms CPU/page ({found} people)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Benchmark campaign sending against the local fake SMTP server
+Before: one SMTP connection + one commit per message, strictly serial
+After: send_campaign_batch (pooled connections, worker threads, bulk SendLog)
+Pacing is disabled so the numbers show protocol/DB overhead only
+
+Uses a scratch SQLite file (never DATABASE_URL)
+Usage: python bench_send_pipeline.py [recipients] [latency_ms]
+"""
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+
+from database import (
+    Base, Campaign, Company, Person, Email, SendLog,
+    CampaignStatus, EmailStatus, EmailDiscoveryStatus, SendStatus
+)
+from email_sender import EmailCampaignSender
+from fake_smtp import FakeSMTPServer
+
+
+def seed(db, recipients: int) -> int:
+    db.add(Company(id=1, name="Acme", domain="acme.io"))
+    db.execute(insert(Person), [
+        {'id': i, 'company_id': 1, 'full_name': f"Person {i}", 'normalized_name': f"person {i}",
+         'role': "CTO", 'source_page': "bench"}
+        for i in range(1, recipients + 1)
+    ])
+    db.execute(insert(Email), [
+        {'id': i, 'email_address': f"person{i}@domain{i}.com", 'person_id': i, 'company_id': 1,
+         'scan_job_id': 1, 'status': EmailStatus.QUEUED, 'is_validated': True,
+         'discovery_status': EmailDiscoveryStatus.VALIDATED,
+         'source_type': "bench", 'source_url': "bench", 'discovery_method': "regex"}
+        for i in range(1, recipients + 1)
+    ])
+    campaign = Campaign(
+        name="bench", subject="Hello {{name}}", body="Hi {{name}}, quick note for {{company}}.",
+        from_email="me@sender.io", status=CampaignStatus.ACTIVE
+    )
+    db.add(campaign)
+    db.commit()
+    return campaign.id
+
+
+def legacy_send(sender: EmailCampaignSender, campaign: Campaign, emails):
+    """Previous loop: connect + login per message, commit per message"""
+    db = sender.db
+    for email_record in emails:
+        body = sender._personalize_email(campaign.body, email_record)
+        result = sender.sender.send_email(
+            email_record.email_address, campaign.subject, body,
+            campaign.from_email, campaign.from_name
+        )
+        db.add(SendLog(
+            email_id=email_record.id, campaign_id=campaign.id,
+            sent_at=result['sent_at'] or datetime.utcnow(),
+            status=SendStatus.SENT if result['success'] else SendStatus.FAILED,
+            error_message=result['error'], subject_sent=campaign.subject, body_preview=body[:500]
+        ))
+        sender.update_domain_cooldown(email_record.email_address.split('@')[1])
+
+
+def main():
+    recipients = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    latency = (float(sys.argv[2]) if len(sys.argv) > 2 else 2) / 1000
+
+    with FakeSMTPServer(accept_all=True, latency=latency) as server:
+        os.environ.update({"SMTP_SERVER": "127.0.0.1", "SMTP_PORT": str(server.port), "SMTP_USE_TLS": "false"})
+
+        for label in ("per-message", "pipeline"):
+            engine = create_engine(f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench_send.db')}")
+            Base.metadata.create_all(bind=engine)
+            db = sessionmaker(bind=engine)()
+            campaign_id = seed(db, recipients)
+            sender = EmailCampaignSender(db)
+            server.stats['connections'] = 0
+
+            start = time.perf_counter()
+            if label == "per-message":
+                campaign = db.get(Campaign, campaign_id)
+                legacy_send(sender, campaign, sender.get_eligible_emails(campaign_id, recipients))
+            else:
+                sender.send_campaign_batch(
+                    campaign_id, daily_limit=recipients, delay_seconds=0, max_per_second=0
+                )
+            elapsed = time.perf_counter() - start
+
+            logged = db.query(SendLog).count()
+            print(f"{label:>12}: {elapsed:7.2f}s  {server.stats['connections']} connections  "
+                  f"{logged} send logs")
+            db.close()
+
+
+if __name__ == "__main__":
+    main()
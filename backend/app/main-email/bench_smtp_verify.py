@@ -0,0 +1,76 @@
+"""
+Benchmark SMTP verification against the local fake SMTP server
+Before: verify_smtp() style, one connection per address
+After: SMTPVerifier, one session per MX host for many RCPT TO probes
+
+Usage: python bench_smtp_verify.py [people] [latency_ms]
+"""
+import smtplib
+import sys
+import time
+
+from fake_smtp import FakeSMTPServer
+from smtp_verifier import SMTPVerifier
+
+DOMAINS = ["acme.io", "globex.com", "initech.dev", "umbrella.co", "hooli.xyz"]
+FIRST = ["alice", "bruno", "chloe", "david", "emma", "felix", "grace", "hugo"]
+LAST = ["adams", "baker", "clark", "dixon", "evans", "foster"]
+
+
+def build_candidates(people: int):
+    """Four inferred patterns per person, one real mailbox each"""
+    candidates, mailboxes = [], []
+    for i in range(people):
+        first, last = FIRST[i % len(FIRST)], LAST[(i // len(FIRST)) % len(LAST)]
+        domain = DOMAINS[i % len(DOMAINS)]
+        first = f"{first}{i}"
+        patterns = [f"{first}.{last}", first, f"{first[0]}{last}", f"{first[0]}.{last}"]
+        candidates.extend(f"{local}@{domain}" for local in patterns)
+        mailboxes.append(f"{patterns[0]}@{domain}")
+    return candidates, mailboxes
+
+
+def verify_per_connection(emails, port):
+    """Same protocol exchange as email_validator.verify_smtp"""
+    results = {}
+    for email in emails:
+        with smtplib.SMTP(timeout=10) as smtp:
+            smtp.connect('127.0.0.1', port)
+            smtp.helo('verification.test')
+            smtp.mail('verify@example.com')
+            code, _ = smtp.rcpt(email)
+            results[email] = code in [250, 251]
+    return results
+
+
+def main():
+    people = int(sys.argv[1]) if len(sys.argv) > 1 else 25
+    latency = (float(sys.argv[2]) if len(sys.argv) > 2 else 5) / 1000
+    candidates, mailboxes = build_candidates(people)
+
+    # Every domain resolves to the local fake MX
+    async def resolve(domain):
+        return True, '127.0.0.1'
+
+    with FakeSMTPServer(mailboxes=mailboxes, latency=latency) as server:
+        start = time.perf_counter()
+        baseline = verify_per_connection(candidates, server.port)
+        elapsed = time.perf_counter() - start
+        connections = server.stats['connections']
+        print(f"{'per-connection':>16}: {elapsed:7.3f}s  {connections} connections  "
+              f"{sum(baseline.values())}/{len(candidates)} valid")
+
+        server.stats['connections'] = 0
+        verifier = SMTPVerifier(port=server.port, mx_resolver=resolve, per_host_concurrency=4)
+        start = time.perf_counter()
+        pooled = verifier.verify_many_sync(candidates)
+        elapsed = time.perf_counter() - start
+        valid = sum(1 for ok, _ in pooled.values() if ok)
+        print(f"{'pooled':>16}: {elapsed:7.3f}s  {server.stats['connections']} connections  "
+              f"{valid}/{len(candidates)} valid")
+
+        assert all(pooled[email][0] == baseline[email] for email in candidates)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Microbenchmark of email / role extraction over page text
+Before: per person, text.lower().find(name) + EMAIL_REGEX over a 1000-char
+        window; per text block, one regex search per role (the scraper's
+        former ROLE_PATTERNS, rebuilt here from ROLE_PHRASES)
+After: PageTextIndex (email spans indexed once, bisect per person) and
+       RoleMatcher (one automaton pass per text block)
+
+Usage: python bench_text_extract.py [people_per_page] [rounds]
+"""
+import re
+import sys
+import time
+
+from email_validator import is_allowed_role, normalize_role
+from text_extractor import EMAIL_REGEX, ROLE_PHRASES, PageTextIndex, role_matcher, ahocorasick
+
+ROLES = ["CEO", "Chief Technology Officer", "Head of Engineering", "VP of Sales", "Co-Founder", "Staff Engineer"]
+FIRST = ["Alice", "Bruno", "Chloe", "David", "Emma", "Felix", "Grace", "Hugo", "Irene", "James"]
+LAST = ["Adams", "Baker", "Clark", "Dixon", "Evans", "Foster"]
+
+# One regex per role group, e.g. r'\b(ceo|chief\s+executive\s+officer)\b'
+LEGACY_ROLE_PATTERNS = [
+    r'\b(' + '|'.join(r'\s+'.join(re.escape(word) for word in phrase.split(' ')) for phrase in phrases) + r')\b'
+    for phrases in ROLE_PHRASES
+]
+
+
+def build_page(people: int):
+    names, blocks = [], []
+    filler = "We build reliable software for modern teams and ship every week. " * 6
+    for i in range(people):
+        name = f"{FIRST[i % len(FIRST)]} {LAST[(i // len(FIRST)) % len(LAST)]}"
+        local = name.lower().replace(" ", ".")
+        block = f"{name}\n{ROLES[i % len(ROLES)]}\n{local}@acme.io\n{filler}"
+        names.append(name)
+        blocks.append(block)
+    return "\n".join(blocks), names, blocks
+
+
+def legacy_emails(text: str, names):
+    found = []
+    for name in names:
+        index = text.lower().find(name.lower())
+        if index != -1:
+            found.append(EMAIL_REGEX.findall(text[max(0, index - 500):index + 500]))
+    return found
+
+
+def indexed_emails(text: str, names):
+    index = PageTextIndex(text)
+    found = []
+    for name in names:
+        position = index.find_name(name)
+        if position != -1:
+            found.append(index.emails_near(position))
+    return found
+
+
+def legacy_role(text: str):
+    for pattern in LEGACY_ROLE_PATTERNS:
+        match = re.search(pattern, text, re.IGNORECASE)
+        if match:
+            normalized = normalize_role(match.group(0))
+            if normalized and is_allowed_role(normalized):
+                return normalized
+    return None
+
+
+def timed(fn, rounds: int):
+    start = time.perf_counter()
+    for _ in range(rounds):
+        result = fn()
+    return (time.perf_counter() - start) / rounds * 1000, result
+
+
+def main():
+    people = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    rounds = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+    text, names, blocks = build_page(people)
+    print(f"page: {len(text)} chars, {people} people, automaton: "
+          f"{'pyahocorasick' if ahocorasick else 'compiled alternation'}")
+
+    before, expected = timed(lambda: legacy_emails(text, names), rounds)
+    after, result = timed(lambda: indexed_emails(text, names), rounds)
+    assert result == expected
+    print(f"emails near names: {before:8.2f} ms -> {after:8.2f} ms per page")
+
+    before, expected = timed(lambda: [legacy_role(block) for block in blocks], rounds)
+    after, result = timed(lambda: [role_matcher.first_role(block) for block in blocks], rounds)
+    assert result == expected
+    print(f"roles per block:   {before:8.2f} ms -> {after:8.2f} ms per page")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,258 @@
+"""
+Async crawl engine for website scans
+Bounded priority frontier, per-host politeness tokens, concurrent fetches,
+conditional GETs against the page cache, robots.txt / sitemap.xml per site
+Used by EmailScraper.scrape_website
+"""
+
+import asyncio
+import heapq
+import inspect
+import itertools
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+from urllib.parse import urldefrag, urlparse
+
+import httpx
+
+from page_cache import FreshnessPolicy, PageCache
+from site_index import SiteIndexCache
+
+
+class HostPoliteness:
+    """
+    Per-host token bucket
+    Each host gets `burst` tokens, refilled at one token per `interval` seconds
+    """
+
+    def __init__(self, interval: float = 0.5, burst: int = 5):
+        self.interval = interval
+        self.burst = max(1, burst)
+        self._buckets: Dict[str, List[float]] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self._overrides: Dict[str, Tuple[float, int]] = {}
+
+    def set_host_delay(self, host: str, delay: float):
+        """Crawl-delay from robots.txt: one request per `delay` seconds, no burst"""
+        if delay > self.interval:
+            self._overrides[host] = (delay, 1)
+            self._buckets.pop(host, None)
+
+    async def acquire(self, host: str):
+        """Wait until a request to host is allowed"""
+        interval, burst = self._overrides.get(host, (self.interval, self.burst))
+        if interval <= 0:
+            return
+
+        lock = self._locks.setdefault(host, asyncio.Lock())
+        async with lock:
+            bucket = self._buckets.setdefault(host, [float(burst), time.monotonic()])
+            while True:
+                now = time.monotonic()
+                bucket[0] = min(burst, bucket[0] + (now - bucket[1]) / interval)
+                bucket[1] = now
+
+                if bucket[0] >= 1:
+                    bucket[0] -= 1
+                    return
+
+                await asyncio.sleep((1 - bucket[0]) * interval)
+
+
+class CrawlFrontier:
+    """
+    Bounded priority frontier with a seen-set (each URL is queued at most once)
+    Highest score is popped first, equal scores in insertion order. When full,
+    a URL only gets in by evicting a strictly lower-scored one, so without
+    scores it behaves like the old FIFO frontier
+    """
+
+    def __init__(self, max_size: int = 50):
+        self.max_size = max_size
+        self._heap: List[Tuple[float, int, str]] = []
+        self._seen: Set[str] = set()
+        self._order = itertools.count()
+
+    @staticmethod
+    def canonical(url: str) -> str:
+        """Drop fragments so /team and /team#ceo are the same page"""
+        return urldefrag(url)[0]
+
+    def push(self, url: str, score: float = 0.0) -> bool:
+        """Queue URL if unseen and there is room (or a worse URL to drop). Returns True if queued"""
+        url = self.canonical(url)
+        if url in self._seen:
+            return False
+
+        if len(self._heap) >= self.max_size:
+            # Heap holds -score: the worst entry has the largest key
+            worst = max(range(len(self._heap)), key=lambda i: self._heap[i][:2], default=None)
+            if worst is None or -self._heap[worst][0] >= score:
+                return False
+            _, _, dropped = self._heap[worst]
+            self._heap[worst] = self._heap[-1]
+            self._heap.pop()
+            heapq.heapify(self._heap)
+            self._seen.discard(dropped)
+
+        self._seen.add(url)
+        heapq.heappush(self._heap, (-score, next(self._order), url))
+        return True
+
+    def pop(self) -> str:
+        return heapq.heappop(self._heap)[2]
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+
+class AsyncCrawler:
+    """
+    Crawls a single site with N concurrent fetches
+
+    on_page(url, html) is called for every fetched page and returns the
+    outgoing links to consider, or an awaitable resolving to them so the
+    page can be processed off the event loop. on_fetch_start(url, page_number)
+    is called before each fetch (used for progress reporting).
+    With a page_cache, pages within the freshness window are served without a
+    request and older ones are revalidated with a conditional GET.
+    url_scorer(url) ranks the frontier (None = do not crawl). With a
+    site_index, robots.txt rules and Crawl-delay are honoured and the site's
+    sitemap URLs are queued alongside the links found while crawling.
+    """
+
+    def __init__(
+        self,
+        headers: Optional[Dict[str, str]] = None,
+        concurrency: int = 5,
+        rate_limit: float = 0.5,
+        timeout: float = 10.0,
+        max_duration: float = 30.0,
+        frontier_size: int = 50,
+        page_cache: Optional[PageCache] = None,
+        freshness: Optional[FreshnessPolicy] = None,
+        url_scorer: Optional[Callable[[str], Optional[float]]] = None,
+        site_index: Optional[SiteIndexCache] = None
+    ):
+        self.headers = headers or {}
+        self.concurrency = max(1, concurrency)
+        self.timeout = timeout
+        self.max_duration = max_duration
+        self.frontier_size = frontier_size
+        self.politeness = HostPoliteness(interval=rate_limit, burst=self.concurrency)
+        self.page_cache = page_cache
+        self.freshness = freshness or FreshnessPolicy()
+        self.url_scorer = url_scorer
+        self.site_index = site_index
+        self.user_agent = self.headers.get('User-Agent', '*')
+
+    async def fetch(self, client: httpx.AsyncClient, url: str) -> Tuple[str, Optional[str]]:
+        """Fetch page content, respecting per-host politeness"""
+        try:
+            # Page cache calls are blocking SQLite I/O (plus zlib): worker thread
+            cached = None
+            if self.page_cache is not None:
+                body, cached = await asyncio.to_thread(self.page_cache.lookup, url, self.freshness)
+                if body is not None:
+                    return url, body
+
+            await self.politeness.acquire(urlparse(url).netloc)
+            headers = cached.conditional_headers() if cached is not None else None
+            response = await client.get(url, headers=headers)
+            if self.page_cache is not None:
+                return url, await asyncio.to_thread(self.page_cache.resolve, url, cached, response)
+            response.raise_for_status()
+            return url, response.text
+        except Exception as e:
+            print(f"Error fetching {url}: {e}")
+            return url, None
+
+    async def crawl(
+        self,
+        start_url: str,
+        max_pages: int,
+        on_page: Callable[[str, str], Iterable[str]],
+        on_fetch_start: Optional[Callable[[str, int], None]] = None
+    ) -> int:
+        """
+        Crawl from start_url until max_pages fetches were started,
+        the frontier is exhausted or max_duration is reached
+        Returns number of pages fetched
+        """
+        frontier = CrawlFrontier(self.frontier_size)
+        site = None
+
+        def enqueue(link: str):
+            if site is not None and not site.can_fetch(link, self.user_agent):
+                return
+            score = self.url_scorer(link) if self.url_scorer else 0.0
+            if score is not None:
+                frontier.push(link, score)
+
+        pages_started = 0
+        pages_fetched = 0
+        in_flight = set()
+        deadline = time.monotonic() + self.max_duration
+
+        limits = httpx.Limits(max_connections=self.concurrency)
+        async with httpx.AsyncClient(
+            headers=self.headers,
+            timeout=self.timeout,
+            limits=limits,
+            follow_redirects=True
+        ) as client:
+            if self.site_index is not None:
+                site = await self.site_index.get(client, start_url, self.politeness)
+                if not site.can_fetch(start_url, self.user_agent):
+                    print(f"[SCAN] {start_url} disallowed by robots.txt")
+                    return 0
+                delay = site.crawl_delay(self.user_agent)
+                if delay:
+                    self.politeness.set_host_delay(urlparse(start_url).netloc, delay)
+
+            # Start page first, then the best pages the sitemap knows about
+            frontier.push(start_url, float('inf'))
+            if site is not None:
+                host = urlparse(start_url).netloc
+                for link in site.sitemap_urls:
+                    if urlparse(link).netloc == host:
+                        enqueue(link)
+
+            while frontier or in_flight:
+                while frontier and len(in_flight) < self.concurrency and pages_started < max_pages:
+                    url = frontier.pop()
+                    pages_started += 1
+                    if on_fetch_start:
+                        on_fetch_start(url, pages_started)
+                    in_flight.add(asyncio.ensure_future(self.fetch(client, url)))
+
+                if not in_flight:
+                    break
+
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    print("[SCAN] Max scan duration reached, stopping crawl")
+                    for task in in_flight:
+                        task.cancel()
+                    await asyncio.gather(*in_flight, return_exceptions=True)
+                    break
+
+                done, in_flight = await asyncio.wait(
+                    in_flight,
+                    timeout=remaining,
+                    return_when=asyncio.FIRST_COMPLETED
+                )
+
+                for task in done:
+                    url, html = task.result()
+                    if not html:
+                        continue
+
+                    pages_fetched += 1
+                    links = on_page(url, html)
+                    if inspect.isawaitable(links):
+                        links = await links
+                    for link in links or []:
+                        enqueue(link)
+
+        return pages_fetched
@@ -19,6 +19,9 @@ from sqlalchemy import (
     Enum as SQLEnum,
     Float,
     Index,
+    inspect,
+    literal,
+    text,
 )
 from sqlalchemy.orm import sessionmaker, relationship, declarative_base
 
@@ -113,6 +116,11 @@ class Company(Base):
     emails = relationship("Email", back_populates="company", cascade="all, delete-orphan")
     scans = relationship("ScanJob", back_populates="company", cascade="all, delete-orphan")
 
+    __table_args__ = (
+        # Keyset listing (listing.py)
+        Index("ix_companies_created_id", "created_at", "id"),
+    )
+
 
 class Person(Base):
     __tablename__ = "people"
@@ -132,6 +140,9 @@ class Person(Base):
 
     __table_args__ = (
         Index("ix_people_company_name", "company_id", "normalized_name"),
+        # Keyset listing (listing.py): all people / one company's people
+        Index("ix_people_created_id", "created_at", "id"),
+        Index("ix_people_company_created_id", "company_id", "created_at", "id"),
     )
 
 
@@ -145,6 +156,15 @@ class ScanJob(Base):
     scan_website = Column(Boolean, default=True)
     scan_linkedin = Column(Boolean, default=False)
     max_pages = Column(Integer, default=2)
+    verify_emails = Column(Boolean, default=True)
+    page_max_age = Column(Integer)  # page cache freshness window (seconds); NULL = default
+
+    # Scan queue (scan_queue.py): claim, heartbeat and retry bookkeeping
+    attempts = Column(Integer, default=0)
+    max_attempts = Column(Integer, default=3)
+    locked_by = Column(String(255))
+    heartbeat_at = Column(DateTime)
+    available_at = Column(DateTime)  # retry backoff: not claimed before this
 
     people_found = Column(Integer, default=0)
     emails_discovered = Column(Integer, default=0)
@@ -205,6 +225,18 @@ class Email(Base):
     scan_job = relationship("ScanJob", back_populates="emails")
     send_logs = relationship("SendLog", back_populates="email")
 
+    __table_args__ = (
+        # Send eligibility scan: queued + validated, in id order
+        Index("ix_emails_status_validated_id", "status", "is_validated", "id"),
+        # Keyset listing of validated emails (listing.py), one per filter;
+        # the company/person ones also serve the per-row email_count subqueries
+        Index("ix_emails_discovery_created_id", "discovery_status", "created_at", "id"),
+        Index("ix_emails_discovery_status_created_id", "discovery_status", "status", "created_at", "id"),
+        Index("ix_emails_company_discovery_created_id", "company_id", "discovery_status", "created_at", "id"),
+        Index("ix_emails_person_discovery_created_id", "person_id", "discovery_status", "created_at", "id"),
+        Index("ix_emails_discovery_level_created_id", "discovery_status", "confidence_level", "created_at", "id"),
+    )
+
 
 class Campaign(Base):
     __tablename__ = "campaigns"
@@ -275,6 +307,11 @@ class SendLog(Base):
     campaign = relationship("Campaign", back_populates="send_logs")
     batch = relationship("SendBatch", back_populates="send_logs")
 
+    __table_args__ = (
+        # "Already sent in this campaign" anti-join
+        Index("ix_send_logs_campaign_email", "campaign_id", "email_id"),
+    )
+
 
 class DomainCooldown(Base):
     __tablename__ = "domain_cooldowns"
@@ -299,7 +336,10 @@ class EmailVerificationJob(Base):
     verified_count = Column(Integer, default=0)
 
     progress_percentage = Column(Integer, default=0)
-    current_email_index = Column(Integer, default=0)
+    current_email_index = Column(Integer, default=0)  # next email to verify (resume point)
+
+    check_mx = Column(Boolean, default=True)
+    check_smtp = Column(Boolean, default=False)
 
     valid_count = Column(Integer, default=0)
     invalid_count = Column(Integer, default=0)
@@ -309,13 +349,54 @@ class EmailVerificationJob(Base):
     completed_at = Column(DateTime)
     created_at = Column(DateTime, default=datetime.utcnow)
 
+class MXRecord(Base):
+    __tablename__ = "mx_records"
+
+    id = Column(Integer, primary_key=True)
+    domain = Column(String(255), unique=True, nullable=False, index=True)
+    has_mx = Column(Boolean, default=False)
+    mx_host = Column(String(255))
+    expires_at = Column(DateTime, nullable=False, index=True)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
 # ------------------------------------------------------------------------------
 # INIT / SESSION HELPERS
 # ------------------------------------------------------------------------------
 
+def _add_missing_columns():
+    """
+    create_all never alters existing tables: add columns introduced since a
+    database was created (ALTER TABLE ... ADD COLUMN, scalar default applied
+    to existing rows). Idempotent.
+    """
+    existing_tables = set(inspect(engine).get_table_names())
+    with engine.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            if table.name not in existing_tables:
+                continue
+            present = {col["name"] for col in inspect(conn).get_columns(table.name)}
+            for column in table.columns:
+                if column.name in present:
+                    continue
+                ddl = f"ALTER TABLE {table.name} ADD COLUMN {column.name} {column.type.compile(dialect=engine.dialect)}"
+                default = column.default.arg if column.default is not None and column.default.is_scalar else None
+                if default is not None:
+                    if isinstance(default, enum.Enum):
+                        default = default.name
+                    value = literal(default).compile(dialect=engine.dialect, compile_kwargs={"literal_binds": True})
+                    ddl += f" DEFAULT {value}"
+                conn.execute(text(ddl))
+
+
 def init_db():
     Base.metadata.create_all(bind=engine)
 
+    # create_all skips existing tables; add columns and indexes introduced since
+    _add_missing_columns()
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=engine, checkfirst=True)
+
 
 def get_db():
     db = SessionLocal()
@@ -0,0 +1,199 @@
+"""
+In-memory domain cooldown index for the campaign sender
+Cooldowns for a batch are loaded once and checked in memory; contacts are
+flushed as one upsert. Domains are claimed atomically before sending, so two
+sender processes never contact the same domain inside its cooldown window
+"""
+
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, Optional, Set, Tuple
+
+from sqlalchemy import bindparam, delete, insert, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from database import DomainCooldown
+
+DEFAULT_COOLDOWN_DAYS = 7
+
+cooldown_table = DomainCooldown.__table__
+
+
+def _dialect_insert(db: Session):
+    """INSERT construct with ON CONFLICT support when the dialect has it"""
+    dialect = db.get_bind().dialect.name
+    if dialect == 'postgresql':
+        return postgresql.insert(cooldown_table)
+    if dialect == 'sqlite':
+        return sqlite.insert(cooldown_table)
+    return None
+
+
+class DomainCooldownIndex:
+    """
+    domain -> (last_contacted, contact_count) for one send batch
+
+    claim(domains)       atomically reserve domains out of cooldown (commits)
+    can_contact(domain)  in-memory check
+    record_contact(...)  buffered; flush() writes one upsert (caller commits)
+    release(domains)     give back claimed domains that were not contacted
+    """
+
+    def __init__(self, db: Session, cooldown_days: int = DEFAULT_COOLDOWN_DAYS):
+        self.db = db
+        self.cooldown_days = cooldown_days
+        self._entries: Dict[str, Tuple[datetime, int]] = {}
+        self._pending: Dict[str, Tuple[datetime, int]] = {}
+        self._claim_time: Optional[datetime] = None
+        self._claimed: Set[str] = set()
+
+    def load(self, domains: Iterable[str]):
+        """One SELECT for all domains of the batch"""
+        domains = list(set(domains))
+        if not domains:
+            return
+        rows = self.db.query(
+            DomainCooldown.domain,
+            DomainCooldown.last_contacted,
+            DomainCooldown.contact_count
+        ).filter(DomainCooldown.domain.in_(domains)).all()
+        for domain, last_contacted, contact_count in rows:
+            self._entries[domain] = (last_contacted, contact_count or 0)
+
+    def can_contact(self, domain: str, now: Optional[datetime] = None) -> bool:
+        if domain in self._claimed:
+            return True
+        entry = self._entries.get(domain)
+        if not entry:
+            return True
+        now = now or datetime.utcnow()
+        return now > entry[0] + timedelta(days=self.cooldown_days)
+
+    def claim(self, domains: Iterable[str]) -> Set[str]:
+        """
+        Reserve domains for this batch by stamping last_contacted with a
+        claim time - only where the domain is absent or out of cooldown.
+        Rows carrying our claim time afterwards are ours
+        """
+        domains = sorted(set(domains))
+        if not domains:
+            return set()
+
+        self.load(domains)
+        claim_time = datetime.utcnow()
+        cutoff = claim_time - timedelta(days=self.cooldown_days)
+
+        new_domains = [domain for domain in domains if domain not in self._entries]
+        if new_domains:
+            rows = [
+                {'domain': domain, 'last_contacted': claim_time, 'contact_count': 0,
+                 'cooldown_days': self.cooldown_days}
+                for domain in new_domains
+            ]
+            stmt = _dialect_insert(self.db)
+            if stmt is not None:
+                self.db.execute(stmt.on_conflict_do_nothing(index_elements=['domain']), rows)
+            else:
+                self.db.execute(insert(cooldown_table).prefix_with('IGNORE'), rows)
+
+        self.db.execute(
+            update(cooldown_table).where(
+                cooldown_table.c.domain.in_(domains),
+                cooldown_table.c.last_contacted < cutoff
+            ).values(last_contacted=claim_time)
+        )
+
+        claimed = {
+            domain for (domain,) in self.db.query(DomainCooldown.domain).filter(
+                DomainCooldown.domain.in_(domains),
+                DomainCooldown.last_contacted == claim_time
+            )
+        }
+        self.db.commit()
+
+        self._claim_time = claim_time
+        self._claimed |= claimed
+        return claimed
+
+    def record_contact(self, domain: str, contacted_at: Optional[datetime] = None):
+        contacted_at = contacted_at or datetime.utcnow()
+        last, count = self._pending.get(domain, (contacted_at, 0))
+        self._pending[domain] = (max(last, contacted_at), count + 1)
+
+    def flush(self):
+        """Write buffered contacts as one upsert (no commit)"""
+        if not self._pending:
+            return
+
+        rows = [
+            {'domain': domain, 'last_contacted': last, 'contact_count': count,
+             'cooldown_days': self.cooldown_days, 'updated_at': datetime.utcnow()}
+            for domain, (last, count) in self._pending.items()
+        ]
+
+        stmt = _dialect_insert(self.db)
+        if stmt is not None:
+            stmt = stmt.on_conflict_do_update(
+                index_elements=['domain'],
+                set_={
+                    'last_contacted': stmt.excluded.last_contacted,
+                    'contact_count': cooldown_table.c.contact_count + stmt.excluded.contact_count,
+                    'updated_at': stmt.excluded.updated_at
+                }
+            )
+            self.db.execute(stmt, rows)
+        else:
+            # Rows exist for claimed domains; insert the rest
+            self.load(self._pending)
+            missing = [row for row in rows if row['domain'] not in self._entries]
+            existing = [row for row in rows if row['domain'] in self._entries]
+            if existing:
+                self.db.execute(
+                    update(cooldown_table).where(
+                        cooldown_table.c.domain == bindparam('b_domain')
+                    ).values(
+                        last_contacted=bindparam('b_last'),
+                        contact_count=cooldown_table.c.contact_count + bindparam('b_count')
+                    ),
+                    [{'b_domain': r['domain'], 'b_last': r['last_contacted'], 'b_count': r['contact_count']}
+                     for r in existing]
+                )
+            if missing:
+                self.db.execute(insert(cooldown_table), missing)
+
+        for domain, (last, count) in self._pending.items():
+            previous_count = self._entries.get(domain, (last, 0))[1]
+            self._entries[domain] = (last, previous_count + count)
+        self._pending.clear()
+
+    def release(self, domains: Iterable[str]):
+        """Undo claims for domains that were not contacted (commits)"""
+        domains = set(domains) & self._claimed
+        if not domains or self._claim_time is None:
+            return
+
+        previous = {domain: self._entries.get(domain) for domain in domains}
+        created = [domain for domain, entry in previous.items() if entry is None]
+        restored = [
+            {'b_domain': domain, 'b_previous': entry[0]}
+            for domain, entry in previous.items() if entry is not None
+        ]
+
+        if created:
+            self.db.execute(
+                delete(cooldown_table).where(
+                    cooldown_table.c.domain.in_(created),
+                    cooldown_table.c.last_contacted == self._claim_time,
+                    cooldown_table.c.contact_count == 0
+                )
+            )
+        if restored:
+            self.db.execute(
+                update(cooldown_table).where(
+                    cooldown_table.c.domain == bindparam('b_domain'),
+                    cooldown_table.c.last_contacted == self._claim_time
+                ).values(last_contacted=bindparam('b_previous')),
+                restored
+            )
+        self.db.commit()
+        self._claimed -= domains
@@ -0,0 +1,143 @@
+"""
+Per-domain email pattern statistics
+Learned from emails whose address is known to be real: found on the website
+(regex / structured discovery) or accepted by an SMTP probe. Once a domain
+has a dominant pattern, inference emits that single candidate instead of
+all four, so each person costs one validation / SMTP probe instead of four
+"""
+
+import os
+import threading
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy import or_
+from sqlalchemy.orm import Session
+
+from database import Company, Email, Person, EmailDiscoveryStatus
+
+PATTERN_MIN_SAMPLES = int(os.getenv("EMAIL_PATTERN_MIN_SAMPLES", "3"))
+PATTERN_MIN_SHARE = float(os.getenv("EMAIL_PATTERN_MIN_SHARE", "0.6"))
+
+# ALLOWED PATTERNS ONLY, in the legacy emission order
+PATTERNS = ('first', 'first.last', 'f.last', 'flast')
+
+# Discovery methods that saw the address itself (not generated from the name)
+OBSERVED_METHODS = ('regex', 'structured')
+
+
+def local_parts(first: str, last: str) -> Dict[str, str]:
+    """pattern -> local part for a (lowercase) first and last name"""
+    return {
+        'first': first,
+        'first.last': f"{first}.{last}",
+        'f.last': f"{first[0]}.{last}",
+        'flast': f"{first[0]}{last}"
+    }
+
+
+def name_parts(full_name: str) -> Optional[tuple]:
+    """(first, last) used for inference, or None for single-word names"""
+    parts = full_name.lower().split()
+    if len(parts) < 2:
+        return None
+    return parts[0], parts[-1]
+
+
+def classify_email(email: str, full_name: str) -> Optional[str]:
+    """
+    Pattern of `email` for this person, or None if it matches none or is
+    ambiguous (e.g. one-letter first names make first.last == f.last)
+    """
+    names = name_parts(full_name or '')
+    if not names or '@' not in email:
+        return None
+
+    local = email.lower().split('@', 1)[0]
+    matches = [pattern for pattern, candidate in local_parts(*names).items() if candidate == local]
+    return matches[0] if len(matches) == 1 else None
+
+
+class EmailPatternLearner:
+    """
+    domain -> {pattern: count}
+    Loaded lazily per domain with one query over the emails of the
+    companies owning it, then updated in memory as the scan finds more
+    addresses
+    """
+
+    def __init__(
+        self,
+        db: Optional[Session] = None,
+        min_samples: int = PATTERN_MIN_SAMPLES,
+        min_share: float = PATTERN_MIN_SHARE
+    ):
+        self.db = db
+        self.min_samples = min_samples
+        self.min_share = min_share
+        self._counts: Dict[str, Dict[str, int]] = {}
+        self._lock = threading.Lock()
+
+    def load(self, domains: Iterable[str]):
+        """Build statistics for domains not loaded yet (one query)"""
+        with self._lock:
+            requested = {d for d in set(domains) if d and d.lower() not in self._counts}
+            wanted = {d.lower() for d in requested}
+            if not wanted:
+                return
+            for domain in wanted:
+                self._counts[domain] = {}
+
+        if self.db is None:
+            return
+
+        # Bounded by the companies owning these domains (indexed company_id);
+        # a suffix LIKE on email_address would scan the whole table
+        company_ids = self.db.query(Company.id).filter(Company.domain.in_(requested | wanted))
+        rows = self.db.query(Email.email_address, Person.full_name).join(
+            Person, Email.person_id == Person.id
+        ).filter(
+            Email.company_id.in_(company_ids.scalar_subquery()),
+            Email.discovery_status != EmailDiscoveryStatus.REJECTED_DOMAIN,
+            or_(Email.discovery_method.in_(OBSERVED_METHODS), Email.smtp_valid.is_(True))
+        ).all()
+
+        for email_address, full_name in rows:
+            domain = email_address.rsplit('@', 1)[-1].lower()
+            if domain in wanted:
+                self.record(domain, email_address, full_name)
+
+    def record(self, domain: str, email: str, full_name: str):
+        """Count a known-real address"""
+        pattern = classify_email(email, full_name)
+        if pattern is None:
+            return
+        # Stored statistics first: load() skips domains already counted
+        self.load([domain])
+        with self._lock:
+            counts = self._counts.setdefault(domain.lower(), {})
+            counts[pattern] = counts.get(pattern, 0) + 1
+
+    def counts(self, domain: str) -> Dict[str, int]:
+        self.load([domain])
+        with self._lock:
+            return dict(self._counts.get(domain.lower(), {}))
+
+    def dominant(self, domain: str) -> Optional[str]:
+        """Pattern used by at least min_share of min_samples known addresses"""
+        counts = self.counts(domain)
+        total = sum(counts.values())
+        if total < self.min_samples:
+            return None
+        pattern, count = max(counts.items(), key=lambda item: item[1])
+        return pattern if count / total >= self.min_share else None
+
+    def ranked_patterns(self, domain: str) -> List[str]:
+        """
+        Patterns to emit for domain: only the dominant one once known,
+        otherwise all, most frequent first (legacy order breaks ties)
+        """
+        dominant = self.dominant(domain)
+        if dominant:
+            return [dominant]
+        counts = self.counts(domain)
+        return sorted(PATTERNS, key=lambda pattern: -counts.get(pattern, 0))
@@ -8,15 +8,43 @@ from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from typing import List, Dict, Optional
 from datetime import datetime, timedelta
-from sqlalchemy.orm import Session
+from sqlalchemy import and_, case, exists, func, select, update
+from sqlalchemy.orm import Session, joinedload
 from database import (
     Email, SendLog, Campaign, DomainCooldown, SendBatch,
     EmailStatus, SendStatus, CampaignStatus
 )
-import time
+from domain_cooldowns import DomainCooldownIndex, DEFAULT_COOLDOWN_DAYS
+from template_renderer import CampaignRenderer, compile_template, template_values
+from send_pipeline import (
+    SMTPConnectionPool, SendPacer, SendPipeline,
+    SMTP_POOL_SIZE, SMTP_MAX_PER_SECOND
+)
 import os
 
 
+def email_domain_expression(column, dialect_name: str):
+    """SQL expression for the part of an email address after '@'"""
+    if dialect_name == 'postgresql':
+        return func.split_part(column, '@', 2)
+    if dialect_name in ('mysql', 'mariadb'):
+        return func.substring_index(column, '@', -1)
+    return func.substr(column, func.instr(column, '@') + 1)
+
+
+def increment_campaign_counters(db: Session, campaign_id: int, **deltas: int):
+    """
+    Atomic total_* += delta on the campaign row (caller commits)
+    Concurrent batches of one campaign never lose each other's counts
+    """
+    values = {
+        f'total_{name}': func.coalesce(getattr(Campaign, f'total_{name}'), 0) + delta
+        for name, delta in deltas.items() if delta
+    }
+    if values:
+        db.execute(update(Campaign).where(Campaign.id == campaign_id).values(**values))
+
+
 class EmailSender:
     """Handles email sending with SMTP"""
     
@@ -31,37 +59,68 @@ class EmailSender:
         self.smtp_port = smtp_port or int(os.getenv("SMTP_PORT", "587"))
         self.smtp_user = smtp_user or os.getenv("SMTP_USER")
         self.smtp_password = smtp_password or os.getenv("SMTP_PASSWORD")
+        self.use_tls = os.getenv("SMTP_USE_TLS", "true").lower() == "true"
         
-    def send_email(
+    def build_message(
         self,
         to_email: str,
         subject: str,
         body: str,
         from_email: str,
         from_name: str = None
+    ) -> MIMEMultipart:
+        """Build the MIME message (plain text or HTML body)"""
+        msg = MIMEMultipart('alternative')
+        msg['Subject'] = subject
+        msg['From'] = f"{from_name} <{from_email}>" if from_name else from_email
+        msg['To'] = to_email
+        
+        # Add body (support both plain text and HTML)
+        if '<html>' in body.lower() or '<body>' in body.lower():
+            msg.attach(MIMEText(body, 'html'))
+        else:
+            msg.attach(MIMEText(body, 'plain'))
+        
+        return msg
+    
+    def create_pool(self, size: int = SMTP_POOL_SIZE) -> SMTPConnectionPool:
+        """Pool of authenticated connections to this sender's SMTP server"""
+        return SMTPConnectionPool(
+            self.smtp_server,
+            self.smtp_port,
+            user=self.smtp_user,
+            password=self.smtp_password,
+            size=size,
+            use_tls=self.use_tls
+        )
+    
+    def send_email(
+        self,
+        to_email: str,
+        subject: str,
+        body: str,
+        from_email: str,
+        from_name: str = None,
+        pool: Optional[SMTPConnectionPool] = None
     ) -> Dict[str, any]:
         """
         Send a single email via SMTP
+        With a pool the message goes out on a reused, already logged-in connection
         Returns dict with success status and error message if any
         """
         try:
-            # Create message
-            msg = MIMEMultipart('alternative')
-            msg['Subject'] = subject
-            msg['From'] = f"{from_name} <{from_email}>" if from_name else from_email
-            msg['To'] = to_email
+            msg = self.build_message(to_email, subject, body, from_email, from_name)
             
-            # Add body (support both plain text and HTML)
-            if '<html>' in body.lower() or '<body>' in body.lower():
-                msg.attach(MIMEText(body, 'html'))
+            if pool is not None:
+                pool.send_message(msg)
             else:
-                msg.attach(MIMEText(body, 'plain'))
-            
-            # Connect to SMTP server
-            with smtplib.SMTP(self.smtp_server, self.smtp_port) as server:
-                server.starttls()
-                server.login(self.smtp_user, self.smtp_password)
-                server.send_message(msg)
+                # Connect to SMTP server
+                with smtplib.SMTP(self.smtp_server, self.smtp_port) as server:
+                    if self.use_tls:
+                        server.starttls()
+                    if self.smtp_user:
+                        server.login(self.smtp_user, self.smtp_password)
+                    server.send_message(msg)
             
             return {
                 'success': True,
@@ -150,7 +209,11 @@ class CampaignManager:
         return False
     
     def get_campaign_stats(self, campaign_id: int) -> Dict:
-        """Get campaign statistics"""
+        """
+        Get campaign statistics
+        Totals are counters kept on the campaign row by send_campaign_batch
+        (one primary key read, however many SendLog rows exist)
+        """
         campaign = self.db.query(Campaign).filter(Campaign.id == campaign_id).first()
         if not campaign:
             return None
@@ -166,6 +229,38 @@ class CampaignManager:
             'last_run_at': campaign.last_run_at,
             'next_run_at': campaign.next_run_at
         }
+    
+    def rebuild_campaign_counters(self, campaign_id: Optional[int] = None) -> int:
+        """
+        Recompute sent/failed/bounced counters from SendLog (one grouped
+        query) - for repairing counters after a crash or manual edits.
+        Returns the number of campaigns updated
+        """
+        query = self.db.query(
+            SendLog.campaign_id,
+            func.sum(case((SendLog.status == SendStatus.SENT, 1), else_=0)),
+            func.sum(case((SendLog.status == SendStatus.FAILED, 1), else_=0)),
+            func.sum(case((SendLog.status == SendStatus.BOUNCED, 1), else_=0))
+        )
+        if campaign_id is not None:
+            query = query.filter(SendLog.campaign_id == campaign_id)
+        totals = {
+            row[0]: (int(row[1] or 0), int(row[2] or 0), int(row[3] or 0))
+            for row in query.group_by(SendLog.campaign_id)
+        }
+        
+        campaigns = self.db.query(Campaign.id)
+        if campaign_id is not None:
+            campaigns = campaigns.filter(Campaign.id == campaign_id)
+        campaign_ids = [row[0] for row in campaigns]
+        
+        for cid in campaign_ids:
+            sent, failed, bounced = totals.get(cid, (0, 0, 0))
+            self.db.execute(update(Campaign).where(Campaign.id == cid).values(
+                total_sent=sent, total_failed=failed, total_bounced=bounced
+            ))
+        self.db.commit()
+        return len(campaign_ids)
 
 
 class EmailCampaignSender:
@@ -192,103 +287,123 @@ class EmailCampaignSender:
         return datetime.utcnow() > cooldown_until
     
     def update_domain_cooldown(self, domain: str):
-        """Update domain cooldown timestamp"""
-        cooldown = self.db.query(DomainCooldown).filter(
-            DomainCooldown.domain == domain
-        ).first()
-        
-        if cooldown:
-            cooldown.last_contacted = datetime.utcnow()
-            cooldown.contact_count += 1
-        else:
-            cooldown = DomainCooldown(
-                domain=domain,
-                last_contacted=datetime.utcnow(),
-                contact_count=1
-            )
-            self.db.add(cooldown)
-        
+        """Update domain cooldown timestamp (single upsert)"""
+        cooldowns = DomainCooldownIndex(self.db)
+        cooldowns.record_contact(domain)
+        cooldowns.flush()
         self.db.commit()
     
     def get_eligible_emails(
         self,
         campaign_id: int,
-        limit: int = 100
+        limit: int = 100,
+        cooldown_days: int = 7,
+        scan_factor: int = 10
     ) -> List[Email]:
         """
         Get emails eligible for sending
         - Status = 'queued'
         - Not sent in this campaign before
         - Domain not in cooldown
+        - One email per domain (lowest id first)
         - Respects daily limit
+        
+        Single statement: SendLog anti-join, DomainCooldown outer join and
+        ROW_NUMBER() per domain over the first limit * scan_factor candidates
         """
-        # Get emails in queued status
-        queued_emails = self.db.query(Email).filter(
-            Email.status == EmailStatus.QUEUED,
-            Email.is_validated == True
-        ).limit(limit * 2).all()
+        domain = email_domain_expression(Email.email_address, self.db.get_bind().dialect.name)
+        cutoff = datetime.utcnow() - timedelta(days=cooldown_days)
         
-        eligible = []
-        domains_contacted = set()
+        already_sent = exists().where(
+            SendLog.email_id == Email.id,
+            SendLog.campaign_id == campaign_id
+        )
         
-        for email in queued_emails:
-            if len(eligible) >= limit:
-                break
-            
-            # Check if already sent in this campaign
-            already_sent = self.db.query(SendLog).filter(
-                SendLog.email_id == email.id,
-                SendLog.campaign_id == campaign_id
-            ).first()
-            
-            if already_sent:
-                continue
-            
-            # Check domain cooldown
-            domain = email.email_address.split('@')[1]
-            
-            # Skip if we already contacted this domain in this batch
-            if domain in domains_contacted:
-                continue
-            
-            if not self.check_domain_cooldown(domain):
-                continue
-            
-            eligible.append(email)
-            domains_contacted.add(domain)
+        candidates = self.db.query(
+            Email.id.label('id'),
+            domain.label('domain')
+        ).outerjoin(
+            DomainCooldown,
+            and_(
+                DomainCooldown.domain == domain,
+                DomainCooldown.last_contacted >= cutoff
+            )
+        ).filter(
+            Email.status == EmailStatus.QUEUED,
+            Email.is_validated == True,
+            ~already_sent,
+            DomainCooldown.id.is_(None)
+        ).order_by(Email.id).limit(limit * scan_factor).subquery()
         
-        return eligible[:limit]
+        ranked = select(
+            candidates.c.id,
+            func.row_number().over(
+                partition_by=candidates.c.domain,
+                order_by=candidates.c.id
+            ).label('domain_rank')
+        ).subquery()
+        
+        # Person and company come in the same statement (used for rendering)
+        return self.db.query(Email).options(
+            joinedload(Email.person),
+            joinedload(Email.company)
+        ).join(
+            ranked, Email.id == ranked.c.id
+        ).filter(
+            ranked.c.domain_rank == 1
+        ).order_by(Email.id).limit(limit).all()
     
     def _personalize_email(self, template: str, email_record: Email) -> str:
         """
-        Simple email personalization with variable substitution
-        Supports: {{name}}, {{company}}, {{role}}
+        Email personalization with variable substitution (compiled template)
+        Supports: {{name}}, {{full_name}}, {{company}}, {{role}}
         """
-        personalized = template
-        
-        # Get person data
-        if email_record.person:
-            # Extract first name from full name
-            first_name = email_record.person.full_name.split()[0]
-            personalized = personalized.replace('{{name}}', first_name)
-            personalized = personalized.replace('{{full_name}}', email_record.person.full_name)
-            
-            if email_record.person.role:
-                personalized = personalized.replace('{{role}}', email_record.person.role)
-        
-        if email_record.company:
-            personalized = personalized.replace('{{company}}', email_record.company.name)
-        
-        return personalized
+        person = email_record.person
+        company = email_record.company
+        return compile_template(template).render(template_values(
+            full_name=person.full_name if person else None,
+            role=person.role if person else None,
+            company_name=company.name if company else None
+        ))
+    
+    def _recipient_rows(self, emails: List[Email]) -> List[Dict]:
+        """
+        Plain recipient rows (address + template values) for the send workers
+        Expects person/company eager-loaded (see get_eligible_emails)
+        """
+        rows = []
+        for email in emails:
+            person, company = email.person, email.company
+            rows.append({
+                'email_id': email.id,
+                'email_address': email.email_address,
+                'domain': email.email_address.split('@')[1],
+                'full_name': person.full_name if person else None,
+                'role': person.role if person else None,
+                'company_name': company.name if company else None
+            })
+        return rows
     
     def send_campaign_batch(
         self,
         campaign_id: int,
         daily_limit: int = 100,
-        delay_seconds: float = 2.0
+        delay_seconds: float = 2.0,
+        pool_size: int = SMTP_POOL_SIZE,
+        max_per_second: float = SMTP_MAX_PER_SECOND,
+        flush_every: int = 50,
+        cooldown_days: int = DEFAULT_COOLDOWN_DAYS
     ) -> Dict[str, any]:
         """
         Send a batch of emails for a campaign with progress tracking
+        
+        Subject and body are compiled once and rendered ahead by a producer
+        (CampaignRenderer.render_batch), sent by pool_size workers over reused
+        SMTP connections and paced by max_per_second overall and delay_seconds
+        between messages to the same recipient domain.
+        Recipient domains are claimed up front (DomainCooldownIndex); domains
+        claimed by a concurrent sender are skipped.
+        SendLog rows, cooldowns and progress are written every flush_every results.
         Returns stats: sent, failed, skipped
         """
         campaign = self.db.query(Campaign).filter(
@@ -311,11 +426,20 @@ class EmailCampaignSender:
         self.db.refresh(send_batch)
         
         # Get eligible emails
-        eligible_emails = self.get_eligible_emails(campaign_id, daily_limit)
+        eligible_emails = self.get_eligible_emails(campaign_id, daily_limit, cooldown_days)
+        recipients = self._recipient_rows(eligible_emails)
         
-        send_batch.total_emails = len(eligible_emails)
+        # Reserve recipient domains (another sender may have taken some)
+        cooldowns = DomainCooldownIndex(self.db, cooldown_days)
+        claimed = cooldowns.claim(r['domain'] for r in recipients)
+        skipped = len(recipients)
+        recipients = [r for r in recipients if r['domain'] in claimed]
+        skipped -= len(recipients)
+        
+        send_batch.total_emails = len(recipients)
         send_batch.status = 'running'
         send_batch.started_at = datetime.utcnow()
+        increment_campaign_counters(self.db, campaign_id, queued=len(recipients))
         self.db.commit()
         
         stats = {
@@ -323,39 +447,66 @@ class EmailCampaignSender:
             'sent': 0,
             'failed': 0,
             'bounced': 0,
-            'total': len(eligible_emails)
+            'skipped': skipped,
+            'total': len(recipients)
         }
         
-        for idx, email_record in enumerate(eligible_emails):
-            # Update batch progress
-            send_batch.current_email_index = idx
-            send_batch.progress_percentage = int((idx / len(eligible_emails)) * 100)
-            self.db.commit()
+        renderer = CampaignRenderer(campaign.subject, campaign.body)
+        campaign_subject = campaign.subject
+        from_email, from_name = campaign.from_email, campaign.from_name
+        batch_id = send_batch.id
+        
+        pending_logs = []
+        pending_sent = []
+        contacted_domains = set()
+        processed = 0
+        counted = {'sent': 0, 'failed': 0, 'bounced': 0}  # already added to the campaign
+        
+        def flush():
+            if pending_logs:
+                self.db.bulk_insert_mappings(SendLog, pending_logs)
+            if pending_sent:
+                self.db.bulk_update_mappings(Email, pending_sent)
+            cooldowns.flush()
             
-            # Personalize email body
-            personalized_body = self._personalize_email(
-                campaign.body,
-                email_record
+            # Campaign totals move with the logs, in the same transaction
+            increment_campaign_counters(
+                self.db, campaign_id, **{k: stats[k] - counted[k] for k in counted}
             )
+            counted.update({k: stats[k] for k in counted})
             
-            # Send email
-            result = self.sender.send_email(
-                to_email=email_record.email_address,
-                subject=campaign.subject,
-                body=personalized_body,
-                from_email=campaign.from_email,
-                from_name=campaign.from_name
+            send_batch.current_email_index = processed
+            send_batch.progress_percentage = int((processed / len(recipients)) * 100) if recipients else 100
+            send_batch.sent_count = stats['sent']
+            send_batch.failed_count = stats['failed'] + stats['bounced']
+            self.db.commit()
+            
+            pending_logs.clear()
+            pending_sent.clear()
+        
+        pool = self.sender.create_pool(pool_size)
+        
+        def send(message: Dict) -> Dict:
+            return self.sender.send_email(
+                to_email=message['recipient']['email_address'],
+                subject=message['subject'],
+                body=message['body'],
+                from_email=from_email,
+                from_name=from_name,
+                pool=pool
             )
+        
+        def on_result(message: Dict, result: Dict):
+            nonlocal processed
+            recipient = message['recipient']
             
             # Determine status
             if result['success']:
                 send_status = SendStatus.SENT
                 stats['sent'] += 1
-                # Update domain cooldown
-                domain = email_record.email_address.split('@')[1]
-                self.update_domain_cooldown(domain)
-                # Update email last_sent_at
-                email_record.last_sent_at = datetime.utcnow()
+                cooldowns.record_contact(recipient['domain'], result['sent_at'])
+                contacted_domains.add(recipient['domain'])
+                pending_sent.append({'id': recipient['email_id'], 'last_sent_at': result['sent_at']})
             elif result.get('status') == SendStatus.BOUNCED:
                 send_status = SendStatus.BOUNCED
                 stats['bounced'] += 1
@@ -364,20 +515,37 @@ class EmailCampaignSender:
                 stats['failed'] += 1
             
             # Log the send attempt
-            send_log = SendLog(
-                email_id=email_record.id,
-                campaign_id=campaign_id,
-                batch_id=send_batch.id,
-                sent_at=result['sent_at'] or datetime.utcnow(),
-                status=send_status,
-                error_message=result['error'],
-                subject_sent=campaign.subject,
-                body_preview=personalized_body[:500]
-            )
-            self.db.add(send_log)
+            pending_logs.append({
+                'email_id': recipient['email_id'],
+                'campaign_id': campaign_id,
+                'batch_id': batch_id,
+                'sent_at': result['sent_at'] or datetime.utcnow(),
+                'status': send_status,
+                'error_message': result['error'],
+                'subject_sent': message.get('subject', campaign_subject),
+                'body_preview': message.get('body', '')[:500]
+            })
             
-            # Rate limiting delay
-            time.sleep(delay_seconds)
+            processed += 1
+            if len(pending_logs) >= flush_every:
+                flush()
+        
+        pipeline = SendPipeline(
+            workers=pool_size,
+            pacer=SendPacer(max_per_second=max_per_second, domain_interval=delay_seconds)
+        )
+        try:
+            pipeline.run(renderer.render_batch(recipients), send, on_result)
+            flush()
+        except Exception:
+            # The session needs a rollback before the claims can be released
+            self.db.rollback()
+            self._fail_batch(batch_id)
+            raise
+        finally:
+            pool.close()
+            # Domains that were not contacted go back to their previous cooldown
+            cooldowns.release(claimed - contacted_domains)
         
         # Update send batch
         send_batch.status = 'completed'
@@ -386,31 +554,42 @@ class EmailCampaignSender:
         send_batch.failed_count = stats['failed'] + stats['bounced']
         send_batch.progress_percentage = 100
         
-        # Update campaign stats
-        campaign.total_sent += stats['sent']
-        campaign.total_failed += stats['failed']
-        campaign.total_bounced += stats['bounced']
+        # Campaign totals were incremented at each flush
         campaign.last_run_at = datetime.utcnow()
         
         self.db.commit()
         
         return stats
     
-    def finalize_send_run(self):
+    def _fail_batch(self, batch_id: int):
+        """Mark a send batch failed (best effort, on an aborted run)"""
+        try:
+            self.db.execute(
+                update(SendBatch)
+                .where(SendBatch.id == batch_id)
+                .values(status='failed', completed_at=datetime.utcnow())
+                .execution_options(synchronize_session=False)
+            )
+            self.db.commit()
+        except Exception as e:
+            self.db.rollback()
+            print(f"Could not mark send batch {batch_id} failed: {e}")
+    
+    def finalize_send_run(self) -> int:
         """
         Reset queued emails back to draft after send run
         This allows emails to be re-queued for future sends
+        One UPDATE (no rows loaded); returns the number of emails reset
         """
-        queued_emails = self.db.query(Email).filter(
-            Email.status == EmailStatus.QUEUED
-        ).all()
-        
-        for email in queued_emails:
-            email.status = EmailStatus.DRAFT
-        
+        result = self.db.execute(
+            update(Email)
+            .where(Email.status == EmailStatus.QUEUED)
+            .values(status=EmailStatus.DRAFT, updated_at=datetime.utcnow())
+            .execution_options(synchronize_session=False)
+        )
         self.db.commit()
         
-        return len(queued_emails)
+        return result.rowcount
     
     def get_batch_status(self, batch_id: int) -> Optional[Dict]:
         """Get send batch status and progress"""
@@ -5,11 +5,16 @@ Includes SMTP verification and disposable email detection
 """
 
 import re
-import dns.resolver
 import smtplib
 import socket
-from typing import Tuple, Optional, Dict
+from typing import Tuple, Optional, Dict, List, Sequence
 from email.utils import parseaddr
+from functools import lru_cache
+
+import numpy as np
+
+from mx_cache import mx_cache
+from smtp_verifier import SMTPVerifier
 
 # Blocked email prefixes (hard stop)
 BLOCKED_PREFIXES = [
@@ -140,19 +145,15 @@ def is_human_like(email: str) -> bool:
 
 def check_mx_record(domain: str) -> Tuple[bool, Optional[str]]:
     """
-    Check if domain has valid MX records
+    Check if domain has valid MX records (cached, see mx_cache)
     Returns (has_mx, mx_host)
     """
-    try:
-        mx_records = dns.resolver.resolve(domain, 'MX')
-        if len(mx_records) > 0:
-            mx_host = str(mx_records[0].exchange).rstrip('.')
-            return True, mx_host
-        return False, None
-    except (dns.resolver.NXDOMAIN, dns.resolver.NoAnswer, dns.resolver.NoNameservers):
-        return False, None
-    except Exception:
-        return True, None
+    return mx_cache.resolve(domain)
+
+
+def get_mx_cache_stats() -> Dict:
+    """MX cache hit/miss counters"""
+    return mx_cache.stats()
 
 
 def verify_smtp(email: str, timeout: int = 10) -> Tuple[bool, str]:
@@ -189,6 +190,14 @@ def verify_smtp(email: str, timeout: int = 10) -> Tuple[bool, str]:
         return True, f"SMTP verification unavailable: {str(e)}"
 
 
+def verify_smtp_batch(emails: List[str], timeout: int = 10) -> Dict[str, Tuple[bool, str]]:
+    """
+    Verify many emails via SMTP, reusing one session per MX host
+    Returns {email: (is_valid, message)} with verify_smtp() messages
+    """
+    return SMTPVerifier(timeout=timeout).verify_many_sync(emails)
+
+
 def calculate_confidence_score(
     email: str,
     domain_match: bool,
@@ -266,10 +275,12 @@ def validate_email_full(
     discovery_method: str = "regex",
     page_credibility: float = 1.0,
     check_mx: bool = True,
-    check_smtp: bool = False
+    check_smtp: bool = False,
+    smtp_result: Optional[Tuple[bool, str]] = None
 ) -> Dict[str, any]:
     """
     Complete email validation pipeline with company domain enforcement
+    smtp_result: precomputed (is_valid, message) from verify_smtp_batch
     Returns dict with validation results
     """
     result = {
@@ -330,7 +341,7 @@ def validate_email_full(
     
     # SMTP verification (optional)
     if check_smtp:
-        smtp_valid, smtp_message = verify_smtp(email)
+        smtp_valid, smtp_message = smtp_result if smtp_result is not None else verify_smtp(email)
         result['smtp_valid'] = smtp_valid
         
         if not smtp_valid and "unavailable" not in smtp_message:
@@ -394,6 +405,16 @@ def is_allowed_role(role: str) -> bool:
     return role_normalized in DECISION_MAKER_ROLES
 
 
+# lowercase -> canonical role (exact matches)
+DECISION_MAKER_ROLE_INDEX = {role.lower(): role for role in DECISION_MAKER_ROLES}
+# Partial matches are tried longest role first, so "Co-Founder & CEO" gets
+# the most specific role and the answer no longer depends on set order
+DECISION_MAKER_ROLE_ORDER = tuple(
+    (role.lower(), role) for role in sorted(DECISION_MAKER_ROLES, key=lambda r: (-len(r), r))
+)
+
+
+@lru_cache(maxsize=4096)
 def normalize_role(role: str) -> Optional[str]:
     """
     Normalize role to match DECISION_MAKER_ROLES
@@ -405,18 +426,214 @@ def normalize_role(role: str) -> Optional[str]:
     role_lower = role.lower().strip()
     
     # Try exact match first
-    for decision_role in DECISION_MAKER_ROLES:
-        if role_lower == decision_role.lower():
-            return decision_role
+    exact = DECISION_MAKER_ROLE_INDEX.get(role_lower)
+    if exact:
+        return exact
     
     # Try partial match
-    for decision_role in DECISION_MAKER_ROLES:
-        if decision_role.lower() in role_lower or role_lower in decision_role.lower():
+    for decision_lower, decision_role in DECISION_MAKER_ROLE_ORDER:
+        if decision_lower in role_lower or role_lower in decision_lower:
             return decision_role
     
     return None
 
 
+# Precompiled rule sets for batch validation
+EMAIL_FORMAT_REGEX = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+BLOCKED_PREFIX_TUPLE = tuple(BLOCKED_PREFIXES)
+BLOCKED_DOMAIN_SET = frozenset(BLOCKED_DOMAINS)
+BLOCKED_DOMAIN_SUFFIXES = tuple(d for d in BLOCKED_DOMAINS if d.startswith("."))
+DISPOSABLE_REGEX = re.compile('|'.join(re.escape(d) for d in DISPOSABLE_DOMAINS))
+
+DISCOVERY_METHOD_WEIGHTS = {"regex": 0.15, "structured": 0.13}
+
+
+def _empty_validation() -> Dict[str, any]:
+    return {
+        'is_valid': False,
+        'quality_score': 0,
+        'confidence_score': 0.0,
+        'confidence_level': 'low',
+        'verification_status': 'invalid',
+        'mx_valid': False,
+        'smtp_valid': False,
+        'is_disposable': False,
+        'is_role_email': False,
+        'domain_match': False,
+        'reason': '',
+        'mx_host': None
+    }
+
+
+def calculate_confidence_scores(
+    emails: Sequence[str],
+    domain_matches: Sequence[bool],
+    role_confidences: Sequence[float],
+    discovery_methods: Sequence[str],
+    page_credibilities: Sequence[float],
+    mx_valids: Sequence[bool]
+) -> Tuple[List[float], List[str]]:
+    """
+    calculate_confidence_score() over a whole batch with NumPy
+    Same weights, caps and rounding; returns (scores, levels)
+    """
+    if not emails:
+        return [], []
+
+    local_parts = [email.split("@")[0] for email in emails]
+    has_dot = np.array(["." in local for local in local_parts])
+    single_long = np.array([len(local.split()) == 1 and len(local) > 3 for local in local_parts])
+    short = np.array([len(local) <= 10 for local in local_parts])
+
+    methods = np.array(discovery_methods, dtype=object)
+    inferred = methods == "inferred"
+    pattern_weight = np.array([DISCOVERY_METHOD_WEIGHTS.get(m, 0.0) for m in discovery_methods])
+    pattern_weight = np.where(
+        inferred,
+        np.where(has_dot, 0.12, np.where(single_long, 0.08, 0.10)),
+        pattern_weight
+    )
+
+    # Same accumulation order as the scalar version (identical float results)
+    score = np.zeros(len(emails))
+    score += np.where(np.asarray(domain_matches, dtype=bool), 0.40, 0.0)
+    score += np.asarray(role_confidences, dtype=float) * 0.20
+    score += pattern_weight
+    score += np.asarray(page_credibilities, dtype=float) * 0.15
+    score += np.where(np.asarray(mx_valids, dtype=bool), 0.10, 0.0)
+
+    single_name = ~has_dot & short
+    score = np.where(inferred & single_name, np.minimum(score, 0.70), score)
+    score = np.where(inferred & ~single_name, np.minimum(score, 0.85), score)
+
+    levels = np.where(score >= 0.80, "high", np.where(score >= 0.60, "medium", "low"))
+
+    # Python round() to match calculate_confidence_score exactly
+    return [round(value, 2) for value in score.tolist()], levels.tolist()
+
+
+class BatchEmailValidator:
+    """
+    Columnar version of validate_email_full for large uploads
+    Output per email is identical; format/prefix checks use precompiled
+    rules, domain-level checks and MX lookups run once per unique domain,
+    SMTP probes are pooled and scores are computed in one NumPy pass
+    """
+
+    def __init__(self, company_domain: str, check_mx: bool = True, check_smtp: bool = False):
+        self.company_domain = company_domain
+        self.normalized_company_domain = (
+            company_domain.lower().replace("www.", "") if company_domain else None
+        )
+        self.check_mx = check_mx
+        self.check_smtp = check_smtp
+        self._domain_checks: Dict[str, Tuple[bool, bool, bool]] = {}
+
+    def _check_domain(self, domain: str) -> Tuple[bool, bool, bool]:
+        """(domain_match, blocked, disposable) for a lowercased domain"""
+        checks = self._domain_checks.get(domain)
+        if checks is None:
+            company = self.normalized_company_domain
+            domain_match = bool(company) and (domain == company or domain.endswith(f".{company}"))
+            blocked = domain in BLOCKED_DOMAIN_SET or domain.endswith(BLOCKED_DOMAIN_SUFFIXES)
+            disposable = DISPOSABLE_REGEX.search(domain) is not None
+            checks = self._domain_checks[domain] = (domain_match, blocked, disposable)
+        return checks
+
+    def validate(self, email_datas: List[Dict]) -> List[Dict[str, any]]:
+        """Validate [{email, role_confidence, discovery_method, page_credibility}]"""
+        results = []
+        survivors = []  # (index, email, domain)
+
+        for index, email_data in enumerate(email_datas):
+            email = email_data.get('email')
+            result = _empty_validation()
+            results.append(result)
+
+            if not email or not EMAIL_FORMAT_REGEX.match(email.lower()):
+                result['reason'] = "Invalid email format"
+                continue
+
+            local_part, domain = email.split("@")
+            if local_part.lower().startswith(BLOCKED_PREFIX_TUPLE):
+                result['is_role_email'] = True
+                result['reason'] = "Blocked prefix (inbox/role email)"
+                continue
+
+            domain = domain.lower()
+            domain_match, blocked, disposable = self._check_domain(domain)
+            result['domain_match'] = domain_match
+
+            if not domain_match:
+                result['reason'] = f"Email domain does not match company domain ({self.company_domain})"
+                continue
+            if blocked:
+                result['reason'] = "Blocked domain (personal email provider)"
+                continue
+            if disposable:
+                result['is_disposable'] = True
+                result['reason'] = "Disposable email domain"
+                continue
+
+            survivors.append((index, email, domain))
+
+        # MX record check, once per domain
+        if self.check_mx:
+            mx_by_domain = {domain: check_mx_record(domain) for domain in {d for _, _, d in survivors}}
+            remaining = []
+            for index, email, domain in survivors:
+                mx_valid, mx_host = mx_by_domain[domain]
+                results[index]['mx_valid'] = mx_valid
+                results[index]['mx_host'] = mx_host
+                if not mx_valid:
+                    results[index]['reason'] = "No MX records found"
+                    results[index]['verification_status'] = 'invalid'
+                    continue
+                remaining.append((index, email, domain))
+            survivors = remaining
+
+        # SMTP verification (optional), one session per MX host
+        smtp_results = {}
+        if self.check_smtp and survivors:
+            smtp_results = verify_smtp_batch([email for _, email, _ in survivors])
+
+        scores, levels = calculate_confidence_scores(
+            [email for _, email, _ in survivors],
+            [True] * len(survivors),
+            [email_datas[index].get('role_confidence', 1.0) for index, _, _ in survivors],
+            [email_datas[index].get('discovery_method', 'regex') for index, _, _ in survivors],
+            [email_datas[index].get('page_credibility', 1.0) for index, _, _ in survivors],
+            [results[index]['mx_valid'] for index, _, _ in survivors]
+        )
+
+        for (index, email, _), confidence_score, confidence_level in zip(survivors, scores, levels):
+            result = results[index]
+            result['confidence_score'] = confidence_score
+            result['confidence_level'] = confidence_level
+            result['quality_score'] = int(confidence_score * 100)
+
+            if self.check_smtp:
+                smtp_valid, smtp_message = smtp_results[email]
+                result['smtp_valid'] = smtp_valid
+                if not smtp_valid and "unavailable" not in smtp_message:
+                    result['reason'] = smtp_message
+                    result['verification_status'] = 'risky'
+                    result['is_valid'] = True
+                    continue
+
+            # HARD GATE: Quality score must be >= 70
+            if result['quality_score'] < 70:
+                result['reason'] = f"Quality score too low ({result['quality_score']})"
+                result['verification_status'] = 'invalid'
+                continue
+
+            result['is_valid'] = True
+            result['verification_status'] = 'valid'
+            result['reason'] = "Valid email"
+
+        return results
+
+
 def batch_validate_emails(
     emails: list,
     company_domain: str,
@@ -424,7 +641,7 @@ def batch_validate_emails(
     check_smtp: bool = False
 ) -> Dict[str, list]:
     """
-    Validate multiple emails at once
+    Validate multiple emails at once (see BatchEmailValidator)
     Returns dict with categorized results
     """
     results = {
@@ -433,21 +650,12 @@ def batch_validate_emails(
         'risky': []
     }
     
-    for email_data in emails:
-        email = email_data.get('email')
-        
-        validation = validate_email_full(
-            email,
-            company_domain,
-            role_confidence=email_data.get('role_confidence', 1.0),
-            discovery_method=email_data.get('discovery_method', 'regex'),
-            page_credibility=email_data.get('page_credibility', 1.0),
-            check_mx=check_mx,
-            check_smtp=check_smtp
-        )
-        
+    validator = BatchEmailValidator(company_domain, check_mx=check_mx, check_smtp=check_smtp)
+    validations = validator.validate(emails)
+    
+    for email_data, validation in zip(emails, validations):
         email_result = {
-            'email': email,
+            'email': email_data.get('email'),
             'validation': validation
         }
         
@@ -459,4 +667,4 @@ def batch_validate_emails(
         else:
             results['invalid'].append(email_result)
     
-    return results
\ No newline at end of file
+    return results
@@ -0,0 +1,119 @@
+"""
+Local fake SMTP server for verification/sending benchmarks
+Accepts RCPT TO for known mailboxes (or everything with accept_all),
+optionally adds a per-reply latency to mimic a remote MX
+Counts connections and commands so callers can compare strategies
+"""
+
+import asyncio
+import threading
+from typing import Iterable, Optional
+
+
+class FakeSMTPServer:
+    """Tiny asyncio SMTP responder (HELO/EHLO, MAIL, RCPT, RSET, NOOP, DATA, QUIT)"""
+
+    def __init__(
+        self,
+        host: str = '127.0.0.1',
+        port: int = 0,
+        mailboxes: Optional[Iterable[str]] = None,
+        accept_all: bool = False,
+        latency: float = 0.0
+    ):
+        self.host = host
+        self.port = port
+        self.mailboxes = {m.lower() for m in (mailboxes or [])}
+        self.accept_all = accept_all
+        self.latency = latency
+        self.stats = {'connections': 0, 'rcpt': 0, 'messages': 0}
+
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+
+    async def _reply(self, writer: asyncio.StreamWriter, line: str):
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        writer.write(f"{line}\r\n".encode())
+        await writer.drain()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.stats['connections'] += 1
+        try:
+            await self._reply(writer, "220 fake-smtp ready")
+            while True:
+                raw = await reader.readline()
+                if not raw:
+                    break
+                line = raw.decode('utf-8', 'replace').strip()
+                verb = line.split(' ', 1)[0].upper()
+
+                if verb == 'EHLO':
+                    await self._reply(writer, "250-fake-smtp\r\n250 8BITMIME")
+                elif verb in ('HELO', 'MAIL', 'RSET', 'NOOP'):
+                    await self._reply(writer, "250 OK")
+                elif verb == 'RCPT':
+                    self.stats['rcpt'] += 1
+                    address = line[line.find('<') + 1:line.rfind('>')].lower()
+                    if self.accept_all or address in self.mailboxes:
+                        await self._reply(writer, "250 OK")
+                    else:
+                        await self._reply(writer, "550 No such user")
+                elif verb == 'DATA':
+                    await self._reply(writer, "354 End data with <CR><LF>.<CR><LF>")
+                    while True:
+                        body_line = await reader.readline()
+                        if not body_line or body_line in (b".\r\n", b".\n"):
+                            break
+                    self.stats['messages'] += 1
+                    await self._reply(writer, "250 Queued")
+                elif verb == 'QUIT':
+                    await self._reply(writer, "221 Bye")
+                    break
+                else:
+                    await self._reply(writer, "502 Command not implemented")
+        except (ConnectionResetError, BrokenPipeError):
+            pass
+        finally:
+            writer.close()
+
+    async def start(self):
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        if self._server:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    # Background-thread mode for sync callers (benchmarks, smtplib clients)
+
+    def start_in_thread(self) -> 'FakeSMTPServer':
+        ready = threading.Event()
+
+        def run():
+            self._loop = asyncio.new_event_loop()
+            self._loop.run_until_complete(self.start())
+            ready.set()
+            self._loop.run_forever()
+            self._loop.run_until_complete(self.stop())
+            self._loop.close()
+
+        self._thread = threading.Thread(target=run, daemon=True)
+        self._thread.start()
+        ready.wait()
+        return self
+
+    def stop_thread(self):
+        if self._loop and self._thread:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self) -> 'FakeSMTPServer':
+        return self.start_in_thread()
+
+    def __exit__(self, *exc):
+        self.stop_thread()
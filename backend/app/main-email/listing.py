@@ -0,0 +1,106 @@
+"""
+Keyset-paginated listings for the email service
+Pages are ordered by (created_at, id) and continued from an opaque cursor,
+so every page is an index range scan instead of an OFFSET walk. Rows are
+selected as plain columns (no ORM objects, no per-row count queries) and
+streamed out as a JSON array; the next cursor goes in the X-Next-Cursor header
+"""
+
+import base64
+import json
+import os
+from datetime import datetime
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from sqlalchemy import select, tuple_
+from sqlalchemy.orm import Session
+
+from database import SessionLocal
+
+LISTING_MAX_LIMIT = int(os.getenv("LISTING_MAX_LIMIT", "100000"))
+LISTING_STREAM_BATCH = int(os.getenv("LISTING_STREAM_BATCH", "500"))
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(created_at: datetime, row_id: int) -> str:
+    """Opaque cursor for the (created_at, id) of the last row of a page"""
+    raw = f"{created_at.isoformat()}|{row_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """Inverse of encode_cursor; raises ValueError on a malformed cursor"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created, row_id = base64.urlsafe_b64decode(padded.encode()).decode().split("|")
+        return datetime.fromisoformat(created), int(row_id)
+    except Exception as e:
+        raise ValueError(f"Invalid cursor: {cursor!r}") from e
+
+
+def keyset_conditions(created_col, id_col, cursor: Optional[str]) -> List:
+    """WHERE clause continuing after the cursor (empty for the first page)"""
+    if not cursor:
+        return []
+    created_at, row_id = decode_cursor(cursor)
+    return [tuple_(created_col, id_col) > tuple_(created_at, row_id)]
+
+
+def next_cursor(
+    db: Session,
+    created_col,
+    id_col,
+    conditions: List,
+    limit: int,
+    skip: int = 0
+) -> Optional[str]:
+    """
+    Cursor after the last row of this page, or None when it is the last page.
+    Reads only the two index keys around the page boundary
+    """
+    if limit <= 0:
+        return None
+    rows = db.execute(
+        select(created_col, id_col)
+        .where(*conditions)
+        .order_by(created_col, id_col)
+        .offset(skip + limit - 1)
+        .limit(2)
+    ).all()
+    if len(rows) < 2:
+        return None
+    return encode_cursor(*rows[0])
+
+
+def clamp_limit(limit: int) -> int:
+    return max(0, min(limit, LISTING_MAX_LIMIT))
+
+
+def _json_default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def stream_json_array(
+    statement,
+    serialize: Callable[[object], Dict],
+    batch_size: int = LISTING_STREAM_BATCH
+) -> Iterator[str]:
+    """
+    Yield a JSON array one row at a time. Runs on its own session with a
+    server-side cursor, so an export never holds more than batch_size rows
+    """
+    db = SessionLocal()
+    try:
+        result = db.execute(statement.execution_options(yield_per=batch_size))
+        yield "["
+        first = True
+        for row in result:
+            chunk = json.dumps(serialize(row), default=_json_default)
+            yield chunk if first else "," + chunk
+            first = False
+        yield "]"
+    finally:
+        db.close()
@@ -0,0 +1,296 @@
+"""
+Cached MX resolution layer for email validation
+Positive/negative/SERVFAIL TTLs, in-flight request coalescing, optional persisted table
+A batch of emails at the same domain costs one DNS lookup
+"""
+
+import asyncio
+import os
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, Optional, Tuple
+
+import dns.asyncresolver
+import dns.resolver
+
+MX_POSITIVE_TTL = int(os.getenv("MX_CACHE_POSITIVE_TTL", "86400"))
+MX_NEGATIVE_TTL = int(os.getenv("MX_CACHE_NEGATIVE_TTL", "3600"))
+MX_SERVFAIL_TTL = int(os.getenv("MX_CACHE_SERVFAIL_TTL", "300"))
+MX_CACHE_PERSIST = os.getenv("MX_CACHE_PERSIST", "false").lower() == "true"
+MX_CACHE_MAX_ENTRIES = int(os.getenv("MX_CACHE_MAX_ENTRIES", "10000"))
+
+# Answers that mean "this domain has no mail exchanger" (safe to cache)
+NEGATIVE_ERRORS = (dns.resolver.NXDOMAIN, dns.resolver.NoAnswer)
+# SERVFAIL / no nameserver reachable: also "no MX", but may clear up soon,
+# so it is cached for MX_SERVFAIL_TTL only
+SERVFAIL_ERRORS = (dns.resolver.NoNameservers,)
+
+MXResult = Tuple[bool, Optional[str]]
+
+
+def _result_from_answer(mx_records) -> MXResult:
+    if len(mx_records) > 0:
+        return True, str(mx_records[0].exchange).rstrip('.')
+    return False, None
+
+
+class MXResolverCache:
+    """
+    MX lookups with an in-process TTL cache, least recently used domains
+    evicted past max_entries (expired entries are dropped on every store)
+    Transient resolver errors are NOT cached and keep the legacy
+    (True, None) "assume deliverable" answer
+    """
+
+    def __init__(
+        self,
+        positive_ttl: int = MX_POSITIVE_TTL,
+        negative_ttl: int = MX_NEGATIVE_TTL,
+        persist: bool = MX_CACHE_PERSIST,
+        servfail_ttl: int = MX_SERVFAIL_TTL,
+        max_entries: int = MX_CACHE_MAX_ENTRIES
+    ):
+        self.positive_ttl = positive_ttl
+        self.negative_ttl = negative_ttl
+        self.servfail_ttl = servfail_ttl
+        self.persist = persist
+        self.max_entries = max(1, max_entries)
+
+        self._cache: "OrderedDict[str, Tuple[MXResult, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._inflight: Dict[str, Tuple[threading.Event, list]] = {}
+        self._async_inflight: Dict[str, asyncio.Future] = {}
+
+        self._stats = {
+            'hits': 0,
+            'misses': 0,
+            'coalesced': 0,
+            'resolver_calls': 0,
+            'persisted_hits': 0,
+            'errors': 0,
+            'evicted': 0
+        }
+
+    # ------------------------------------------------------------------
+    # Cache storage
+    # ------------------------------------------------------------------
+
+    def _get_cached(self, domain: str) -> Optional[MXResult]:
+        """Caller holds self._lock"""
+        entry = self._cache.get(domain)
+        if entry is None:
+            return None
+        if entry[1] <= time.monotonic():
+            del self._cache[domain]
+            return None
+        self._cache.move_to_end(domain)
+        return entry[0]
+
+    def _ttl_for(self, result: MXResult) -> int:
+        return self.positive_ttl if result[0] else self.negative_ttl
+
+    def _set_cached(self, domain: str, result: MXResult, ttl: Optional[int] = None):
+        """Caller holds self._lock"""
+        now = time.monotonic()
+        self._cache[domain] = (result, now + (ttl or self._ttl_for(result)))
+        self._cache.move_to_end(domain)
+        for stale in [d for d, (_, expires_at) in self._cache.items() if expires_at <= now]:
+            del self._cache[stale]
+            self._stats['evicted'] += 1
+        while len(self._cache) > self.max_entries:
+            self._cache.popitem(last=False)
+            self._stats['evicted'] += 1
+
+    def _count(self, stat: str):
+        with self._lock:
+            self._stats[stat] += 1
+
+    def _load_persisted(self, domain: str) -> Optional[MXResult]:
+        from database import SessionLocal, MXRecord
+
+        db = SessionLocal()
+        try:
+            record = db.query(MXRecord).filter(MXRecord.domain == domain).first()
+            if record and record.expires_at > datetime.utcnow():
+                return record.has_mx, record.mx_host
+            return None
+        finally:
+            db.close()
+
+    def _save_persisted(self, domain: str, result: MXResult, ttl: int):
+        from database import SessionLocal, MXRecord
+
+        db = SessionLocal()
+        try:
+            record = db.query(MXRecord).filter(MXRecord.domain == domain).first()
+            if not record:
+                record = MXRecord(domain=domain)
+                db.add(record)
+            record.has_mx, record.mx_host = result
+            record.expires_at = datetime.utcnow() + timedelta(seconds=ttl)
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            print(f"[MX CACHE] Could not persist {domain}: {e}")
+        finally:
+            db.close()
+
+    def _lookup_stored(self, domain: str) -> Optional[MXResult]:
+        """Memory first, then the persisted table"""
+        with self._lock:
+            cached = self._get_cached(domain)
+            if cached is not None:
+                self._stats['hits'] += 1
+                return cached
+
+        if self.persist:
+            persisted = self._load_persisted(domain)
+            if persisted is not None:
+                with self._lock:
+                    self._stats['hits'] += 1
+                    self._stats['persisted_hits'] += 1
+                    self._set_cached(domain, persisted)
+                return persisted
+
+        return None
+
+    def _store(self, domain: str, result: MXResult, ttl: Optional[int]):
+        if not ttl:
+            return
+        with self._lock:
+            self._set_cached(domain, result, ttl)
+        if self.persist:
+            self._save_persisted(domain, result, ttl)
+
+    # ------------------------------------------------------------------
+    # Resolution
+    # ------------------------------------------------------------------
+
+    def _resolve_uncached(self, domain: str) -> Tuple[MXResult, Optional[int]]:
+        """Returns (result, cache TTL); TTL None means don't cache"""
+        self._count('resolver_calls')
+        try:
+            result = _result_from_answer(dns.resolver.resolve(domain, 'MX'))
+            return result, self._ttl_for(result)
+        except NEGATIVE_ERRORS:
+            return (False, None), self.negative_ttl
+        except SERVFAIL_ERRORS:
+            return (False, None), self.servfail_ttl
+        except Exception:
+            self._count('errors')
+            return (True, None), None
+
+    async def _resolve_uncached_async(self, domain: str) -> Tuple[MXResult, Optional[int]]:
+        self._count('resolver_calls')
+        try:
+            result = _result_from_answer(await dns.asyncresolver.resolve(domain, 'MX'))
+            return result, self._ttl_for(result)
+        except NEGATIVE_ERRORS:
+            return (False, None), self.negative_ttl
+        except SERVFAIL_ERRORS:
+            return (False, None), self.servfail_ttl
+        except Exception:
+            self._count('errors')
+            return (True, None), None
+
+    def resolve(self, domain: str) -> MXResult:
+        """
+        Blocking lookup, safe to call from many threads
+        Concurrent lookups of the same domain share one DNS query
+        """
+        domain = domain.lower().strip()
+
+        stored = self._lookup_stored(domain)
+        if stored is not None:
+            return stored
+
+        with self._lock:
+            inflight = self._inflight.get(domain)
+            leader = inflight is None
+            if leader:
+                inflight = (threading.Event(), [])
+                self._inflight[domain] = inflight
+                self._stats['misses'] += 1
+            else:
+                self._stats['coalesced'] += 1
+
+        event, slot = inflight
+        if not leader:
+            event.wait()
+            return slot[0] if slot else self.resolve(domain)
+
+        try:
+            result, ttl = self._resolve_uncached(domain)
+            self._store(domain, result, ttl)
+            slot.append(result)
+            return result
+        finally:
+            with self._lock:
+                self._inflight.pop(domain, None)
+            event.set()
+
+    async def resolve_async(self, domain: str) -> MXResult:
+        """Non-blocking lookup with per-domain coalescing on the running loop"""
+        domain = domain.lower().strip()
+
+        stored = self._lookup_stored(domain)
+        if stored is not None:
+            return stored
+
+        loop = asyncio.get_running_loop()
+        future = self._async_inflight.get(domain)
+        if future is not None and future.get_loop() is loop and not future.done():
+            self._count('coalesced')
+            return await asyncio.shield(future)
+
+        self._count('misses')
+        future = loop.create_future()
+        self._async_inflight[domain] = future
+        try:
+            result, ttl = await self._resolve_uncached_async(domain)
+            self._store(domain, result, ttl)
+            future.set_result(result)
+            return result
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()  # mark retrieved
+            raise
+        finally:
+            if self._async_inflight.get(domain) is future:
+                self._async_inflight.pop(domain, None)
+
+    async def resolve_many(self, domains: Iterable[str]) -> Dict[str, MXResult]:
+        """Resolve a set of domains concurrently (one query per unique domain)"""
+        unique = sorted({d.lower().strip() for d in domains if d})
+        results = await asyncio.gather(*(self.resolve_async(d) for d in unique))
+        return dict(zip(unique, results))
+
+    # ------------------------------------------------------------------
+    # Introspection
+    # ------------------------------------------------------------------
+
+    def stats(self) -> Dict:
+        with self._lock:
+            stats = dict(self._stats)
+            stats['cached_domains'] = len(self._cache)
+        lookups = stats['hits'] + stats['misses'] + stats['coalesced']
+        stats['hit_rate'] = round((stats['hits'] + stats['coalesced']) / lookups, 4) if lookups else 0.0
+        stats['positive_ttl'] = self.positive_ttl
+        stats['negative_ttl'] = self.negative_ttl
+        stats['servfail_ttl'] = self.servfail_ttl
+        stats['max_entries'] = self.max_entries
+        stats['persist'] = self.persist
+        return stats
+
+    def clear(self):
+        with self._lock:
+            self._cache.clear()
+
+
+# Shared process-wide cache used by email_validator.check_mx_record
+mx_cache = MXResolverCache()
@@ -0,0 +1,273 @@
+"""
+On-disk HTTP page cache for website scans
+Pages are stored per URL with their ETag / Last-Modified validators.
+Within a scan's freshness window a cached page is served without a request;
+after it the page is revalidated with a conditional GET and a 304 reuses the
+cached body. Total size is bounded, least recently used pages go first.
+Shared by worker processes (SQLite file in PAGE_CACHE_DIR)
+"""
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from typing import Dict, Optional
+
+PAGE_CACHE_ENABLED = os.getenv("PAGE_CACHE_ENABLED", "true").lower() == "true"
+PAGE_CACHE_DIR = os.getenv("PAGE_CACHE_DIR", ".page_cache")
+PAGE_CACHE_MAX_MB = int(os.getenv("PAGE_CACHE_MAX_MB", "256"))
+# Default freshness window: pages validated less than this ago are not re-requested
+PAGE_CACHE_MAX_AGE = int(os.getenv("PAGE_CACHE_MAX_AGE", "86400"))
+
+# Eviction stops once the cache is back under this share of max_bytes
+EVICT_LOW_WATER = 0.9
+
+
+class CachedPage:
+    __slots__ = ('url', 'body', 'etag', 'last_modified', 'validated_at')
+
+    def __init__(self, url: str, body: str, etag: Optional[str], last_modified: Optional[str], validated_at: float):
+        self.url = url
+        self.body = body
+        self.etag = etag
+        self.last_modified = last_modified
+        self.validated_at = validated_at
+
+    def conditional_headers(self) -> Dict[str, str]:
+        """If-None-Match / If-Modified-Since for revalidation"""
+        headers = {}
+        if self.etag:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified:
+            headers['If-Modified-Since'] = self.last_modified
+        return headers
+
+
+class FreshnessPolicy:
+    """
+    Per-scan cache policy
+    max_age     seconds a validated page is reused without any request
+                (0 = revalidate every page)
+    use_cache   False ignores cached pages (full re-download, cache refreshed)
+    """
+
+    def __init__(self, max_age: float = PAGE_CACHE_MAX_AGE, use_cache: bool = True):
+        self.max_age = max(0.0, max_age)
+        self.use_cache = use_cache
+
+    def is_fresh(self, page: CachedPage, now: Optional[float] = None) -> bool:
+        now = now if now is not None else time.time()
+        return now - page.validated_at < self.max_age
+
+
+class PageCache:
+    """
+    URL -> CachedPage, zlib-compressed bodies in a SQLite file
+    Any I/O error disables the cache for the process (scans fall back to
+    plain GETs)
+    """
+
+    def __init__(
+        self,
+        directory: str = PAGE_CACHE_DIR,
+        max_bytes: int = PAGE_CACHE_MAX_MB * 1024 * 1024,
+        enabled: bool = PAGE_CACHE_ENABLED
+    ):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.enabled = enabled
+
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._size = 0
+        self.stats = {
+            'fresh_hits': 0,
+            'revalidated': 0,
+            'misses': 0,
+            'stored': 0,
+            'evicted': 0
+        }
+
+    # ------------------------------------------------------------------
+    # Storage
+    # ------------------------------------------------------------------
+
+    def _connection(self) -> Optional[sqlite3.Connection]:
+        if self._conn is None and self.enabled:
+            try:
+                os.makedirs(self.directory, exist_ok=True)
+                conn = sqlite3.connect(
+                    os.path.join(self.directory, "pages.db"),
+                    timeout=10,
+                    check_same_thread=False,
+                    isolation_level=None
+                )
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute("""
+                    CREATE TABLE IF NOT EXISTS pages (
+                        key TEXT PRIMARY KEY,
+                        url TEXT NOT NULL,
+                        body BLOB NOT NULL,
+                        etag TEXT,
+                        last_modified TEXT,
+                        validated_at REAL NOT NULL,
+                        last_used REAL NOT NULL,
+                        size INTEGER NOT NULL
+                    )
+                """)
+                conn.execute("CREATE INDEX IF NOT EXISTS ix_pages_last_used ON pages (last_used)")
+                self._size = conn.execute("SELECT COALESCE(SUM(size), 0) FROM pages").fetchone()[0]
+                self._conn = conn
+            except (OSError, sqlite3.Error) as e:
+                print(f"[PAGE CACHE] Disabled: {e}")
+                self.enabled = False
+        return self._conn
+
+    def _disable(self, error: Exception):
+        print(f"[PAGE CACHE] Disabled: {error}")
+        self.enabled = False
+
+    @staticmethod
+    def _key(url: str) -> str:
+        return hashlib.sha256(url.encode('utf-8')).hexdigest()
+
+    def get(self, url: str) -> Optional[CachedPage]:
+        with self._lock:
+            conn = self._connection()
+            if conn is None:
+                return None
+            try:
+                key = self._key(url)
+                row = conn.execute(
+                    "SELECT body, etag, last_modified, validated_at FROM pages WHERE key = ?", (key,)
+                ).fetchone()
+                if row is None:
+                    return None
+                conn.execute("UPDATE pages SET last_used = ? WHERE key = ?", (time.time(), key))
+            except sqlite3.Error as e:
+                self._disable(e)
+                return None
+
+        body, etag, last_modified, validated_at = row
+        return CachedPage(url, zlib.decompress(body).decode('utf-8'), etag, last_modified, validated_at)
+
+    def put(self, url: str, body: str, etag: Optional[str] = None, last_modified: Optional[str] = None):
+        compressed = zlib.compress(body.encode('utf-8'))
+        size = len(compressed)
+        # A single page may not take over the cache
+        if size > self.max_bytes // 10:
+            return
+
+        with self._lock:
+            conn = self._connection()
+            if conn is None:
+                return
+            try:
+                key = self._key(url)
+                now = time.time()
+                previous = conn.execute("SELECT size FROM pages WHERE key = ?", (key,)).fetchone()
+                conn.execute(
+                    "INSERT OR REPLACE INTO pages "
+                    "(key, url, body, etag, last_modified, validated_at, last_used, size) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (key, url, compressed, etag, last_modified, now, now, size)
+                )
+                self._size += size - (previous[0] if previous else 0)
+                self.stats['stored'] += 1
+                if self._size > self.max_bytes:
+                    self._evict(conn)
+            except sqlite3.Error as e:
+                self._disable(e)
+
+    def touch(self, url: str):
+        """Page revalidated (304): restart its freshness window"""
+        with self._lock:
+            conn = self._connection()
+            if conn is None:
+                return
+            try:
+                now = time.time()
+                conn.execute(
+                    "UPDATE pages SET validated_at = ?, last_used = ? WHERE key = ?",
+                    (now, now, self._key(url))
+                )
+            except sqlite3.Error as e:
+                self._disable(e)
+
+    def _evict(self, conn: sqlite3.Connection):
+        """Drop least recently used pages down to the low-water mark (lock held)"""
+        # Other processes write to the same file; start from the real total
+        self._size = conn.execute("SELECT COALESCE(SUM(size), 0) FROM pages").fetchone()[0]
+        target = int(self.max_bytes * EVICT_LOW_WATER)
+        if self._size <= target:
+            return
+
+        freed, keys = 0, []
+        for key, size in conn.execute("SELECT key, size FROM pages ORDER BY last_used"):
+            keys.append((key,))
+            freed += size
+            if self._size - freed <= target:
+                break
+        conn.executemany("DELETE FROM pages WHERE key = ?", keys)
+        self._size -= freed
+        self.stats['evicted'] += len(keys)
+
+    # ------------------------------------------------------------------
+    # Fetch helpers (work with httpx and requests responses)
+    # ------------------------------------------------------------------
+
+    def lookup(self, url: str, policy: Optional[FreshnessPolicy] = None):
+        """
+        Returns (fresh_body, cached_page)
+        fresh_body is set when the page can be used without a request;
+        otherwise send cached_page.conditional_headers() with the GET
+        """
+        policy = policy or FreshnessPolicy()
+        if not self.enabled or not policy.use_cache:
+            return None, None
+
+        page = self.get(url)
+        if page is None:
+            return None, None
+        if policy.is_fresh(page):
+            with self._lock:
+                self.stats['fresh_hits'] += 1
+            return page.body, page
+        return None, page
+
+    def resolve(self, url: str, cached: Optional[CachedPage], response) -> str:
+        """
+        Body for the response to a (conditional) GET
+        304 reuses the cached body, 2xx is stored; raises on HTTP errors
+        """
+        if response.status_code == 304 and cached is not None:
+            self.touch(url)
+            with self._lock:
+                self.stats['revalidated'] += 1
+            return cached.body
+
+        response.raise_for_status()
+        body = response.text
+        with self._lock:
+            self.stats['misses'] += 1
+        if self.enabled and body:
+            self.put(url, body, response.headers.get('etag'), response.headers.get('last-modified'))
+        return body
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            stats = dict(self.stats)
+            stats['size_bytes'] = self._size
+            return stats
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+# Process-wide cache used by the scraper
+page_cache = PageCache()
@@ -0,0 +1,126 @@
+"""
+Parsed page model shared by PeopleDiscovery and EmailDiscovery
+Each fetched page is parsed ONCE; text, links, mailto links and
+class-indexed elements are cached on the object
+"""
+
+import re
+from typing import Dict, List, Optional, Pattern, Sequence, Tuple, Union
+
+from bs4 import BeautifulSoup
+
+from text_extractor import PageTextIndex
+
+try:
+    import lxml  # noqa: F401
+    HTML_PARSER = 'lxml'
+except ImportError:
+    HTML_PARSER = 'html.parser'
+
+
+class ParsedPage:
+    """Single parse of an HTML page with cached views for discovery strategies"""
+
+    def __init__(self, html: str, url: str = '', parser: str = HTML_PARSER):
+        self.html = html
+        self.url = url
+        self.soup = BeautifulSoup(html, parser)
+
+        self._text: Optional[str] = None
+        self._text_lower: Optional[str] = None
+        self._text_index: Optional[PageTextIndex] = None
+        self._links: Optional[List[str]] = None
+        self._mailto_links: Optional[List[Tuple[str, str]]] = None
+        self._class_index: Optional[Dict[str, List[Tuple[int, object]]]] = None
+        self._class_matches: Dict[Tuple, List] = {}
+        self._tag_matches: Dict[Tuple, List] = {}
+
+    @classmethod
+    def ensure(cls, page: Union['ParsedPage', str], url: str = '') -> 'ParsedPage':
+        """Accept either raw HTML or an already parsed page"""
+        if isinstance(page, ParsedPage):
+            return page
+        return cls(page, url)
+
+    @property
+    def text(self) -> str:
+        """Full page text (soup.get_text())"""
+        if self._text is None:
+            self._text = self.soup.get_text()
+        return self._text
+
+    @property
+    def text_lower(self) -> str:
+        if self._text_lower is None:
+            self._text_lower = self.text.lower()
+        return self._text_lower
+
+    @property
+    def text_index(self) -> PageTextIndex:
+        """Email spans / role mentions / name positions of the page text"""
+        if self._text_index is None:
+            self._text_index = PageTextIndex(self.text, self.text_lower)
+        return self._text_index
+
+    @property
+    def links(self) -> List[str]:
+        """Raw href values of all <a href> elements, in document order"""
+        if self._links is None:
+            self._links = [a['href'] for a in self.soup.find_all('a', href=True)]
+        return self._links
+
+    @property
+    def mailto_links(self) -> List[Tuple[str, str]]:
+        """
+        (email, lowercased parent text) for every mailto: link
+        Email keeps its original case; callers normalize
+        """
+        if self._mailto_links is None:
+            self._mailto_links = []
+            for link in self.soup.find_all('a', href=re.compile(r'^mailto:', re.I)):
+                email = link['href'].replace('mailto:', '').strip()
+                parent_text = link.parent.get_text() if link.parent else ""
+                self._mailto_links.append((email, parent_text.lower()))
+        return self._mailto_links
+
+    def _build_class_index(self) -> Dict[str, List[Tuple[int, object]]]:
+        """class token -> [(document position, element)]"""
+        index: Dict[str, List[Tuple[int, object]]] = {}
+        for position, element in enumerate(self.soup.find_all(class_=True)):
+            classes = element.get('class') or []
+            if isinstance(classes, str):
+                classes = classes.split()
+            for token in set(classes):
+                index.setdefault(token, []).append((position, element))
+        return index
+
+    def find_by_class(self, tags: Sequence[str], class_pattern: Pattern) -> List:
+        """
+        Equivalent of soup.find_all(tags, class_=class_pattern) served from
+        the class index. Results are in document order without duplicates
+        """
+        key = (tuple(tags), class_pattern.pattern, class_pattern.flags)
+        if key in self._class_matches:
+            return self._class_matches[key]
+
+        if self._class_index is None:
+            self._class_index = self._build_class_index()
+
+        matched = {}
+        for token, elements in self._class_index.items():
+            if not class_pattern.search(token):
+                continue
+            for position, element in elements:
+                if element.name in tags:
+                    matched[position] = element
+
+        result = [matched[position] for position in sorted(matched)]
+        self._class_matches[key] = result
+        return result
+
+    def find_all(self, tags: Sequence[str]) -> List:
+        """Cached soup.find_all(tags)"""
+        key = tuple(tags)
+        if key not in self._tag_matches:
+            self._tag_matches[key] = self.soup.find_all(list(tags))
+        return self._tag_matches[key]
@@ -0,0 +1,250 @@
+"""
+Bulk persistence stage of a full scan
+- people are de-duplicated in memory against one prefetch and inserted
+  with a single flush (multi-row INSERT); the caller commits
+- the rest of the scan works from SavedPerson snapshots taken right after
+  that flush, so a later commit expiring the Person rows doesn't cost one
+  refresh SELECT per person
+- emails are de-duplicated against one prefetch of their addresses and
+  written with one INSERT ... ON CONFLICT DO NOTHING on email_address
+- the new email IDs are verified as one batch: BatchEmailValidator (MX
+  once per domain, NumPy scoring) and one bulk UPDATE
+Emails are committed unverified first (DISCOVERED / PENDING, not listed as
+drafts until verified), so a retried scan picks up rows whose
+verification never ran
+"""
+
+from datetime import datetime
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+
+from sqlalchemy import insert, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from database import (
+    Person, Email, EmailStatus, EmailDiscoveryStatus, VerificationStatus
+)
+from email_validator import BatchEmailValidator
+
+email_table = Email.__table__
+
+
+class SavedPerson(NamedTuple):
+    """Columns of a saved Person read by email discovery and save_emails"""
+    id: int
+    full_name: str
+    source_page: Optional[str]
+
+
+def normalize_name(name: str) -> str:
+    """Normalize person name for deduplication"""
+    return ' '.join(name.lower().strip().split())
+
+
+def _dialect_insert(db: Session):
+    """INSERT construct with ON CONFLICT support when the dialect has it"""
+    dialect = db.get_bind().dialect.name
+    if dialect == 'postgresql':
+        return postgresql.insert(email_table)
+    if dialect == 'sqlite':
+        return sqlite.insert(email_table)
+    return None
+
+
+class ScanPersistence:
+    """
+    Writes one scan's results for a company
+
+    save_people(people)               -> [(SavedPerson, person_data)] (flushes only)
+    save_emails([(SavedPerson, data)]) -> email IDs awaiting verification (commits)
+    verify_emails(ids, ...)      -> rejection / validation counts (commits)
+    """
+
+    def __init__(self, db: Session, company_id: int, scan_job_id: Optional[int] = None):
+        self.db = db
+        self.company_id = company_id
+        self.scan_job_id = scan_job_id
+
+    def save_people(self, people: List[Dict]) -> List[Tuple[SavedPerson, Dict]]:
+        """
+        Persist discovered people (already filtered by role)
+        Returns [(SavedPerson, person_data)] including people that already
+        existed; repeats of the same (name, role) within `people` are dropped.
+        New rows are flushed, not committed
+        """
+        if not people:
+            return []
+
+        keyed = [((normalize_name(data['name']), data['role']), data) for data in people]
+        existing = {
+            (person.normalized_name, person.role): person
+            for person in self.db.query(Person).filter(
+                Person.company_id == self.company_id,
+                Person.normalized_name.in_({name for (name, _), _ in keyed})
+            )
+        }
+
+        saved_people = []
+        new_people = []
+        emitted = set()
+        for key, data in keyed:
+            if key in emitted:
+                continue
+            emitted.add(key)
+            person = existing.get(key)
+            if person is None:
+                person = existing[key] = Person(
+                    company_id=self.company_id,
+                    full_name=data['name'],
+                    normalized_name=key[0],
+                    role=data['role'],
+                    role_confidence=data['confidence'],
+                    source_page=data['source_page']
+                )
+                new_people.append(person)
+            saved_people.append((person, data))
+
+        if new_people:
+            self.db.add_all(new_people)
+            self.db.flush()
+
+        # Read while the rows are loaded; the next commit expires them
+        return [
+            (SavedPerson(person.id, person.full_name, person.source_page), data)
+            for person, data in saved_people
+        ]
+
+    def save_emails(self, discovered: List[Tuple[SavedPerson, Dict]]) -> List[int]:
+        """
+        Insert discovered emails not stored yet (first occurrence wins)
+        Returns IDs to verify: the rows inserted here plus this company's
+        rows left unverified by an interrupted scan
+        """
+        if not discovered:
+            return []
+
+        addresses = {data['email'] for _, data in discovered}
+        known = self.db.query(
+            Email.id, Email.email_address, Email.company_id, Email.is_validated, Email.discovery_status
+        ).filter(Email.email_address.in_(addresses)).all()
+
+        known_addresses = {row.email_address for row in known}
+        pending_ids = [
+            row.id for row in known
+            if row.company_id == self.company_id
+            and not row.is_validated
+            and row.discovery_status == EmailDiscoveryStatus.DISCOVERED
+        ]
+
+        rows = []
+        for person, data in discovered:
+            if data['email'] in known_addresses:
+                continue
+            known_addresses.add(data['email'])
+            rows.append({
+                'email_address': data['email'],
+                'person_id': person.id,
+                'company_id': self.company_id,
+                'scan_job_id': self.scan_job_id,
+                'status': EmailStatus.DRAFT,
+                'discovery_status': EmailDiscoveryStatus.DISCOVERED,
+                'verification_status': VerificationStatus.PENDING,
+                'source_type': data['source_type'],
+                'source_url': data['source_url'],
+                'discovery_method': data['discovery_method'],
+                'is_validated': False
+            })
+
+        if rows:
+            stmt = _dialect_insert(self.db)
+            if stmt is not None:
+                self.db.execute(stmt.on_conflict_do_nothing(index_elements=['email_address']), rows)
+            else:
+                self.db.execute(insert(email_table).prefix_with('IGNORE'), rows)
+
+            # Addresses taken by a concurrent scan keep that scan's job id
+            pending_ids.extend(
+                email_id for (email_id,) in self.db.query(Email.id).filter(
+                    Email.email_address.in_([row['email_address'] for row in rows]),
+                    Email.scan_job_id == self.scan_job_id
+                )
+            )
+        self.db.commit()
+
+        return sorted(set(pending_ids))
+
+    def verify_emails(
+        self,
+        email_ids: List[int],
+        company_domain: str,
+        page_credibility: Callable[[str], float],
+        check_mx: bool = True
+    ) -> Dict[str, int]:
+        """
+        MANDATORY VALIDATION of a batch of stored emails
+        Valid emails become drafts; rejected ones are kept (backend only)
+        with status DELETED
+        """
+        stats = {'validated': 0, 'rejected_domain': 0, 'rejected_quality': 0}
+        if not email_ids:
+            return stats
+
+        rows = self.db.query(
+            Email.id, Email.email_address, Email.discovery_method, Email.source_url, Person.role_confidence
+        ).outerjoin(Person, Email.person_id == Person.id).filter(
+            Email.id.in_(email_ids)
+        ).order_by(Email.id).all()
+
+        validator = BatchEmailValidator(company_domain, check_mx=check_mx, check_smtp=False)
+        validations = validator.validate([
+            {
+                'email': row.email_address,
+                'role_confidence': row.role_confidence if row.role_confidence is not None else 1.0,
+                'discovery_method': row.discovery_method,
+                'page_credibility': page_credibility(row.source_url)
+            }
+            for row in rows
+        ])
+
+        verified_at = datetime.utcnow()
+        updates = []
+        for row, validation in zip(rows, validations):
+            values = {
+                'id': row.id,
+                'quality_score': validation['quality_score'],
+                'confidence_score': validation['confidence_score'],
+                'confidence_level': validation['confidence_level'],
+                'is_validated': True,
+                'mx_valid': validation['mx_valid'],
+                'is_role_email': validation['is_role_email'],
+                'is_disposable': validation['is_disposable'],
+                'verified_at': verified_at
+            }
+
+            if validation['is_valid']:
+                stats['validated'] += 1
+                values.update(
+                    status=EmailStatus.DRAFT,
+                    discovery_status=EmailDiscoveryStatus.VALIDATED,
+                    verification_status=VerificationStatus.VALID
+                )
+            else:
+                if not validation['domain_match']:
+                    discovery_status = EmailDiscoveryStatus.REJECTED_DOMAIN
+                    stats['rejected_domain'] += 1
+                else:
+                    discovery_status = EmailDiscoveryStatus.REJECTED_QUALITY
+                    stats['rejected_quality'] += 1
+                values.update(
+                    status=EmailStatus.DELETED,
+                    discovery_status=discovery_status,
+                    verification_status=VerificationStatus.INVALID,
+                    verification_error=validation['reason']
+                )
+            updates.append(values)
+
+        # ORM bulk UPDATE by primary key (executemany)
+        self.db.execute(update(Email), updates)
+        self.db.commit()
+
+        return stats
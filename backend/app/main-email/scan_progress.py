@@ -0,0 +1,99 @@
+"""
+Throttled scan progress sink
+Progress updates are coalesced in memory and written to scan_jobs at most
+once per flush interval, or immediately when the scan changes phase.
+The live snapshot is served to the status endpoint without a DB read
+"""
+
+import os
+import threading
+import time
+from typing import Dict, Optional
+
+SCAN_PROGRESS_FLUSH_MS = int(os.getenv("SCAN_PROGRESS_FLUSH_MS", "1000"))
+
+# Fields returned by ScanJobManager.get_scan_status
+STATUS_FIELDS = (
+    'id', 'status', 'progress_percentage', 'current_step',
+    'people_found', 'emails_discovered', 'emails_validated',
+    'emails_rejected_role', 'emails_rejected_domain', 'emails_rejected_quality',
+    'error_message', 'started_at', 'completed_at'
+)
+
+
+class ScanProgressSink:
+    """In-memory progress per scan job with throttled write-back"""
+
+    def __init__(self, flush_interval_ms: int = SCAN_PROGRESS_FLUSH_MS):
+        self.flush_interval = flush_interval_ms / 1000.0
+        self._lock = threading.Lock()
+        self._snapshots: Dict[int, Dict] = {}
+        self._state: Dict[int, Dict] = {}  # phase, last flush time, dirty values
+        self.stats = {'updates': 0, 'flushes': 0}
+
+    def start(self, scan_job) -> None:
+        """Track a running scan (snapshot taken from the ScanJob row)"""
+        with self._lock:
+            self._snapshots[scan_job.id] = {field: getattr(scan_job, field) for field in STATUS_FIELDS}
+            self._state[scan_job.id] = {'phase': None, 'flushed_at': 0.0, 'dirty': None}
+
+    def update(
+        self,
+        scan_job_id: int,
+        progress: int,
+        current_step: str,
+        phase: Optional[str] = None
+    ) -> Optional[Dict]:
+        """
+        Record progress; returns the values to write now, or None when the
+        write is deferred (same phase, flushed less than an interval ago)
+        """
+        values = {'progress_percentage': progress, 'current_step': current_step}
+        now = time.monotonic()
+
+        with self._lock:
+            self.stats['updates'] += 1
+            snapshot = self._snapshots.get(scan_job_id)
+            if snapshot is not None:
+                snapshot.update(values)
+
+            state = self._state.setdefault(scan_job_id, {'phase': None, 'flushed_at': 0.0, 'dirty': None})
+            phase_changed = phase is not None and phase != state['phase']
+            if phase is not None:
+                state['phase'] = phase
+
+            if phase_changed or now - state['flushed_at'] >= self.flush_interval:
+                state['flushed_at'] = now
+                state['dirty'] = None
+                self.stats['flushes'] += 1
+                return values
+
+            state['dirty'] = values
+            return None
+
+    def take_pending(self, scan_job_id: int) -> Optional[Dict]:
+        """Deferred values not yet written (cleared)"""
+        with self._lock:
+            state = self._state.get(scan_job_id)
+            if not state or not state['dirty']:
+                return None
+            values, state['dirty'] = state['dirty'], None
+            state['flushed_at'] = time.monotonic()
+            self.stats['flushes'] += 1
+            return values
+
+    def finish(self, scan_job_id: int) -> None:
+        """Stop tracking; the scan_jobs row is authoritative again"""
+        with self._lock:
+            self._snapshots.pop(scan_job_id, None)
+            self._state.pop(scan_job_id, None)
+
+    def get(self, scan_job_id: int) -> Optional[Dict]:
+        """Live status of a scan running in this process, else None"""
+        with self._lock:
+            snapshot = self._snapshots.get(scan_job_id)
+            return dict(snapshot) if snapshot is not None else None
+
+
+# Process-wide sink used by ScanJobManager
+scan_progress = ScanProgressSink()
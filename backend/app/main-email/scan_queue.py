@@ -0,0 +1,362 @@
+"""
+Durable scan job queue backed by the scan_jobs table
+- enqueue_scan() inserts a PENDING ScanJob with its options
+- workers claim the oldest available job with SELECT ... FOR UPDATE SKIP LOCKED
+  (plain SELECT + compare-and-set UPDATE on SQLite)
+- a heartbeat thread per worker process keeps claimed jobs alive; jobs whose
+  heartbeat went stale (worker crashed or was killed) are requeued
+- failed scans are retried with backoff until max_attempts
+Throughput scales by starting more worker processes (scan_worker.py)
+"""
+
+import os
+import socket
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+
+from sqlalchemy import func, or_
+from sqlalchemy.orm import Session
+
+from database import SessionLocal, ScanJob, ScanStatus
+from scraper import EmailScraper
+from scan_progress import scan_progress
+
+SCAN_MAX_ATTEMPTS = int(os.getenv("SCAN_MAX_ATTEMPTS", "3"))
+SCAN_RETRY_DELAY_SECONDS = int(os.getenv("SCAN_RETRY_DELAY_SECONDS", "30"))
+SCAN_HEARTBEAT_SECONDS = int(os.getenv("SCAN_HEARTBEAT_SECONDS", "15"))
+SCAN_STALE_SECONDS = int(os.getenv("SCAN_STALE_SECONDS", "120"))
+SCAN_POLL_SECONDS = float(os.getenv("SCAN_POLL_SECONDS", "2"))
+SCAN_WORKER_CONCURRENCY = int(os.getenv("SCAN_WORKER_CONCURRENCY", "4"))
+# Scans run by a worker inside the API process (0 = dedicated workers only)
+SCAN_EMBEDDED_WORKERS = int(os.getenv("SCAN_EMBEDDED_WORKERS", "2"))
+
+# Dialects that support FOR UPDATE SKIP LOCKED
+SKIP_LOCKED_DIALECTS = ('postgresql', 'mysql', 'mariadb', 'oracle')
+CLAIM_RETRIES = 5
+
+
+def enqueue_scan(
+    db: Session,
+    company_id: int,
+    scan_website: bool = True,
+    scan_linkedin: bool = False,
+    max_pages: int = 5,
+    verify_emails: bool = True,
+    page_max_age: Optional[int] = None,
+    max_attempts: int = SCAN_MAX_ATTEMPTS
+) -> ScanJob:
+    """Queue a full scan; any worker may pick it up"""
+    scan_job = ScanJob(
+        company_id=company_id,
+        status=ScanStatus.PENDING,
+        scan_website=scan_website,
+        scan_linkedin=scan_linkedin,
+        max_pages=max_pages,
+        verify_emails=verify_emails,
+        page_max_age=page_max_age,
+        attempts=0,
+        max_attempts=max_attempts,
+        progress_percentage=0
+    )
+    db.add(scan_job)
+    db.commit()
+    db.refresh(scan_job)
+    return scan_job
+
+
+def claim_next_scan(db: Session, worker_id: str) -> Optional[int]:
+    """
+    Claim the oldest available PENDING job for worker_id (commits)
+    Returns its id, or None when the queue is empty
+    """
+    skip_locked = db.get_bind().dialect.name in SKIP_LOCKED_DIALECTS
+
+    # Without row locks another worker may win the race; try the next row
+    for _ in range(CLAIM_RETRIES):
+        now = datetime.utcnow()
+        query = db.query(ScanJob.id).filter(
+            ScanJob.status == ScanStatus.PENDING,
+            or_(ScanJob.available_at.is_(None), ScanJob.available_at <= now)
+        ).order_by(ScanJob.created_at, ScanJob.id).limit(1)
+        if skip_locked:
+            query = query.with_for_update(skip_locked=True)
+
+        row = query.first()
+        if row is None:
+            db.rollback()
+            return None
+
+        # Compare-and-set: only one worker moves the row out of PENDING
+        claimed = db.query(ScanJob).filter(
+            ScanJob.id == row.id,
+            ScanJob.status == ScanStatus.PENDING
+        ).update({
+            'status': ScanStatus.RUNNING,
+            'locked_by': worker_id,
+            'heartbeat_at': now,
+            'started_at': now,
+            'completed_at': None,
+            'attempts': func.coalesce(ScanJob.attempts, 0) + 1
+        }, synchronize_session=False)
+        db.commit()
+        if claimed:
+            return row.id
+
+    return None
+
+
+def heartbeat(db: Session, worker_id: str) -> int:
+    """Refresh heartbeat_at of every job held by worker_id (one UPDATE, commits)"""
+    touched = db.query(ScanJob).filter(
+        ScanJob.locked_by == worker_id,
+        ScanJob.status == ScanStatus.RUNNING
+    ).update({'heartbeat_at': datetime.utcnow()}, synchronize_session=False)
+    db.commit()
+    return touched
+
+
+def requeue_stale_scans(db: Session, stale_seconds: int = SCAN_STALE_SECONDS) -> Dict[str, int]:
+    """
+    Recover jobs whose worker stopped heartbeating (commits)
+    Requeued while attempts remain, failed otherwise
+    Jobs marked RUNNING outside the queue (no locked_by) are left alone
+    """
+    now = datetime.utcnow()
+    stale = (
+        ScanJob.status == ScanStatus.RUNNING,
+        ScanJob.locked_by.isnot(None),
+        ScanJob.heartbeat_at < now - timedelta(seconds=stale_seconds)
+    )
+    attempts_left = func.coalesce(ScanJob.attempts, 0) < func.coalesce(ScanJob.max_attempts, SCAN_MAX_ATTEMPTS)
+
+    requeued = db.query(ScanJob).filter(*stale, attempts_left).update({
+        'status': ScanStatus.PENDING,
+        'locked_by': None,
+        'available_at': now,
+        'error_message': "Worker lost (heartbeat timeout), requeued"
+    }, synchronize_session=False)
+
+    failed = db.query(ScanJob).filter(*stale).update({
+        'status': ScanStatus.FAILED,
+        'locked_by': None,
+        'completed_at': now,
+        'error_message': "Worker lost (heartbeat timeout), no attempts left"
+    }, synchronize_session=False)
+
+    db.commit()
+    return {'requeued': requeued, 'failed': failed}
+
+
+def release_scan(
+    db: Session,
+    scan_job_id: int,
+    worker_id: str,
+    succeeded: bool,
+    error: Optional[str] = None,
+    retry: bool = True
+) -> str:
+    """
+    Hand a finished job back to the queue (commits)
+    Failed jobs go back to PENDING with exponential backoff while attempts
+    remain (unless retry=False). Returns completed, retrying, failed or lost
+    """
+    scan_job = db.query(ScanJob).filter(
+        ScanJob.id == scan_job_id,
+        ScanJob.locked_by == worker_id
+    ).first()
+    if scan_job is None:
+        # Lock lost (requeued as stale); the new owner decides
+        db.rollback()
+        return 'lost'
+
+    scan_job.locked_by = None
+    state = 'completed'
+
+    if succeeded:
+        scan_job.error_message = None
+    else:
+        attempts = scan_job.attempts or 0
+        if error:
+            scan_job.error_message = error
+        if retry and attempts < (scan_job.max_attempts or SCAN_MAX_ATTEMPTS):
+            scan_job.status = ScanStatus.PENDING
+            scan_job.completed_at = None
+            scan_job.available_at = datetime.utcnow() + timedelta(
+                seconds=SCAN_RETRY_DELAY_SECONDS * 2 ** (attempts - 1)
+            )
+            state = 'retrying'
+        else:
+            scan_job.status = ScanStatus.FAILED
+            scan_job.completed_at = scan_job.completed_at or datetime.utcnow()
+            state = 'failed'
+
+    db.commit()
+    return state
+
+
+class ScanWorker:
+    """
+    Runs up to `concurrency` queued scans at once, each in its own thread
+    with its own session. One worker per process; start more processes
+    (or machines) to scale out
+    """
+
+    def __init__(
+        self,
+        worker_id: Optional[str] = None,
+        concurrency: int = SCAN_WORKER_CONCURRENCY,
+        poll_interval: float = SCAN_POLL_SECONDS,
+        heartbeat_interval: float = SCAN_HEARTBEAT_SECONDS,
+        stale_seconds: int = SCAN_STALE_SECONDS
+    ):
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self.concurrency = max(1, concurrency)
+        self.poll_interval = poll_interval
+        self.heartbeat_interval = heartbeat_interval
+        self.stale_seconds = stale_seconds
+
+        self._stop = threading.Event()
+        self._heartbeat_stop = threading.Event()
+        self._slots = threading.BoundedSemaphore(self.concurrency)
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self.stats = {'claimed': 0, 'completed': 0, 'retried': 0, 'failed': 0, 'requeued_stale': 0}
+
+    def _count(self, key: str, n: int = 1):
+        with self._lock:
+            self.stats[key] += n
+
+    def _heartbeat_loop(self):
+        while not self._heartbeat_stop.wait(self.heartbeat_interval):
+            db = SessionLocal()
+            try:
+                heartbeat(db, self.worker_id)
+            except Exception as e:
+                print(f"[SCAN QUEUE] Heartbeat failed: {e}")
+            finally:
+                db.close()
+
+    def _reap(self):
+        db = SessionLocal()
+        try:
+            result = requeue_stale_scans(db, self.stale_seconds)
+            if result['requeued'] or result['failed']:
+                print(f"[SCAN QUEUE] Stale scans: {result}")
+            self._count('requeued_stale', result['requeued'])
+        except Exception as e:
+            print(f"[SCAN QUEUE] Stale scan check failed: {e}")
+        finally:
+            db.close()
+
+    def _claim(self) -> Optional[int]:
+        db = SessionLocal()
+        try:
+            return claim_next_scan(db, self.worker_id)
+        except Exception as e:
+            print(f"[SCAN QUEUE] Claim failed: {e}")
+            return None
+        finally:
+            db.close()
+
+    def run_job(self, scan_job_id: int):
+        """Run one claimed scan and release it"""
+        db = SessionLocal()
+        try:
+            succeeded, error, retry = False, None, True
+            try:
+                scan_job = db.query(ScanJob).filter(ScanJob.id == scan_job_id).first()
+                result = EmailScraper(db).run_full_scan(
+                    company_id=scan_job.company_id,
+                    scan_website=scan_job.scan_website,
+                    scan_linkedin=scan_job.scan_linkedin,
+                    max_pages=scan_job.max_pages,
+                    verify_emails=scan_job.verify_emails if scan_job.verify_emails is not None else True,
+                    scan_job_id=scan_job_id,
+                    page_max_age=scan_job.page_max_age
+                )
+                succeeded = result.get('status') == 'completed'
+                error = result.get('error')
+                # Returned before the scan started (e.g. company deleted): retrying won't help
+                retry = 'status' in result
+            except Exception as e:
+                db.rollback()
+                error = str(e)
+                scan_progress.finish(scan_job_id)
+                print(f"[SCAN QUEUE] Scan {scan_job_id} crashed: {e}")
+
+            state = release_scan(db, scan_job_id, self.worker_id, succeeded, error, retry)
+            if state == 'retrying':
+                self._count('retried')
+            elif state in ('completed', 'failed'):
+                self._count(state)
+        except Exception as e:
+            print(f"[SCAN QUEUE] Could not release scan {scan_job_id}: {e}")
+        finally:
+            db.close()
+            self._slots.release()
+
+    def run(self, drain: bool = False):
+        """
+        Claim and run scans until stop() is called
+        drain=True returns once the queue is empty and running scans finished
+        """
+        self._heartbeat_stop.clear()
+        heartbeat_thread = threading.Thread(target=self._heartbeat_loop, daemon=True)
+        heartbeat_thread.start()
+        next_reap = 0.0
+
+        with ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="scan") as executor:
+            while not self._stop.is_set():
+                now = time.monotonic()
+                if now >= next_reap:
+                    self._reap()
+                    next_reap = now + max(1.0, self.stale_seconds / 2)
+
+                # Wait for a free slot before claiming
+                if not self._slots.acquire(timeout=self.poll_interval):
+                    continue
+
+                scan_job_id = self._claim()
+                if scan_job_id is None:
+                    self._slots.release()
+                    if drain and self._idle():
+                        break
+                    self._stop.wait(self.poll_interval)
+                    continue
+
+                self._count('claimed')
+                executor.submit(self.run_job, scan_job_id)
+
+        # Scans still running kept heartbeating until the executor drained
+        self._heartbeat_stop.set()
+        heartbeat_thread.join()
+
+    def _idle(self) -> bool:
+        """No scan running in this worker"""
+        acquired = 0
+        try:
+            while acquired < self.concurrency and self._slots.acquire(blocking=False):
+                acquired += 1
+            return acquired == self.concurrency
+        finally:
+            for _ in range(acquired):
+                self._slots.release()
+
+    def start_in_thread(self) -> threading.Thread:
+        """Run in a daemon thread (embedded worker in the API process)"""
+        self._thread = threading.Thread(target=self.run, name="scan-worker", daemon=True)
+        self._thread.start()
+        return self._thread
+
+    def stop(self, timeout: Optional[float] = None):
+        """
+        Stop claiming; running scans finish in the background
+        Scans cut off by process exit are requeued once their heartbeat is stale
+        """
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
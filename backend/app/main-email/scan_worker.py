@@ -0,0 +1,46 @@
+"""
+Standalone scan worker
+Claims queued scans from scan_jobs and runs up to N of them concurrently.
+Start as many processes (on as many machines) as needed; they coordinate
+through the database only
+
+Usage: python scan_worker.py [--concurrency N] [--worker-id ID] [--drain]
+Set SCAN_EMBEDDED_WORKERS=0 on the API when dedicated workers run scans
+"""
+import argparse
+import signal
+
+from database import init_db
+from scan_queue import ScanWorker, SCAN_WORKER_CONCURRENCY, SCAN_POLL_SECONDS
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run queued company scans")
+    parser.add_argument("--concurrency", type=int, default=SCAN_WORKER_CONCURRENCY,
+                        help="scans run at once by this process")
+    parser.add_argument("--worker-id", default=None,
+                        help="lock owner name (default: host:pid:random)")
+    parser.add_argument("--poll", type=float, default=SCAN_POLL_SECONDS,
+                        help="seconds between polls when the queue is empty")
+    parser.add_argument("--drain", action="store_true",
+                        help="exit once the queue is empty")
+    args = parser.parse_args()
+
+    init_db()
+    worker = ScanWorker(worker_id=args.worker_id, concurrency=args.concurrency, poll_interval=args.poll)
+
+    # Stop claiming on SIGINT/SIGTERM; scans already running finish first
+    def shutdown(signum, frame):
+        print(f"[SCAN WORKER] Signal {signum}: finishing running scans")
+        worker.stop()
+
+    signal.signal(signal.SIGINT, shutdown)
+    signal.signal(signal.SIGTERM, shutdown)
+
+    print(f"[SCAN WORKER] {worker.worker_id} started (concurrency={worker.concurrency})")
+    worker.run(drain=args.drain)
+    print(f"[SCAN WORKER] {worker.worker_id} stopped: {worker.stats}")
+
+
+if __name__ == "__main__":
+    main()
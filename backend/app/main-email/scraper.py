@@ -6,25 +6,30 @@ NO MOCK DATA. NO FALLBACKS. NO GENERATED EMAILS.
 """
 
 import re
+import asyncio
 import requests
-from bs4 import BeautifulSoup
-from typing import List, Dict, Optional, Set
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Dict, Optional, Set, Tuple, Union
 from urllib.parse import urljoin, urlparse
 import time
 from datetime import datetime
 from sqlalchemy.orm import Session
 
 from email_validator import (
-    validate_email_full, 
     is_allowed_role,
     normalize_role,
     is_blocked_prefix,
     DECISION_MAKER_ROLES
 )
-from database import (
-    Company, Person, Email, ScanJob, ScanStatus,
-    EmailStatus, EmailDiscoveryStatus, VerificationStatus
-)
+from database import SessionLocal, Company, Person, Email, ScanJob, ScanStatus
+from crawler import AsyncCrawler
+from site_index import site_index_cache
+from page_cache import FreshnessPolicy, PageCache, page_cache
+from scan_progress import scan_progress
+from scan_persistence import SavedPerson, ScanPersistence, normalize_name
+from page_document import ParsedPage
+from email_patterns import EmailPatternLearner, PATTERNS, local_parts, name_parts
+from text_extractor import role_matcher
 
 DEV_MODE = True
 
@@ -41,35 +46,27 @@ BLOCKED_PATHS = [
     '/pricing', '/blog', '/news', '/press'
 ]
 
-# Role detection patterns (must match DECISION_MAKER_ROLES)
-ROLE_PATTERNS = [
-    r'\b(founder|co-?founder)\b',
-    r'\b(ceo|chief executive officer)\b',
-    r'\b(cto|chief technology officer)\b',
-    r'\b(cfo|chief financial officer)\b',
-    r'\b(coo|chief operating officer)\b',
-    r'\b(chief product officer|cpo)\b',
-    r'\b(head\s+of\s+engineering)\b',
-    r'\b(vp\s+engineering|vp\s+of\s+engineering|vice\s+president\s+engineering)\b',
-    r'\b(engineering\s+manager)\b',
-    r'\b(staff\s+engineer)\b',
-    r'\b(principal\s+engineer)\b',
-    r'\b(founding\s+engineer)\b',
-    r'\b(platform\s+lead)\b',
-    r'\b(infrastructure\s+lead)\b',
-    r'\b(head\s+of\s+product)\b',
-    r'\b(vp\s+product|vp\s+of\s+product)\b',
-    r'\b(growth\s+lead|head\s+of\s+growth)\b',
-    r'\b(vp\s+sales|vp\s+of\s+sales|head\s+of\s+sales)\b',
-    r'\b(agency\s+owner)\b',
-    r'\b(partner)\b',
-    r'\b(hr\s+lead|head\s+of\s+hr|head\s+of\s+people)\b'
-]
+# Crawl priority: path keywords of pages that tend to list people
+PEOPLE_PATH_KEYWORDS = {
+    'team': 1.0, 'leadership': 1.0, 'founders': 1.0, 'people': 0.9,
+    'management': 0.9, 'executives': 0.9, 'about': 0.8, 'who-we-are': 0.8,
+    'our-story': 0.6, 'company': 0.5, 'staff': 0.5, 'board': 0.4, 'partners': 0.3
+}
+
+# ...and of pages that rarely do
+LOW_YIELD_PATH_KEYWORDS = {
+    'careers': 0.5, 'jobs': 0.5, 'product': 0.3, 'features': 0.3,
+    'docs': 0.5, 'tag': 0.6, 'category': 0.6, 'page': 0.3,
+    'events': 0.3, 'case-studies': 0.3, 'customers': 0.3
+}
 
+PATH_SEGMENT_SPLIT = re.compile(r'[/_.]+')
+
+# Class patterns used by the people discovery strategies
+TEAM_CARD_CLASS = re.compile(r'team|member|person|profile', re.I)
+AUTHOR_CLASS = re.compile(r'author|byline|written', re.I)
+ROLE_CLASS = re.compile(r'role|title|position', re.I)
 
-def normalize_name(name: str) -> str:
-    """Normalize person name for deduplication"""
-    return ' '.join(name.lower().strip().split())
 
 
 def calculate_page_credibility(url: str) -> float:
@@ -98,6 +95,62 @@ def calculate_page_credibility(url: str) -> float:
     return 0.50
 
 
+def is_scannable_url(url: str) -> bool:
+    """Check if URL should be scraped"""
+    path = urlparse(url).path.lower()
+    return not any(blocked in path for blocked in BLOCKED_PATHS)
+
+
+def score_people_url(url: str) -> Optional[float]:
+    """
+    Crawl priority of a URL: how likely the page lists people
+    Page credibility plus path keyword weights, minus low-yield keywords and
+    depth. None for URLs that must not be scanned
+    """
+    if not is_scannable_url(url):
+        return None
+
+    path = urlparse(url).path.lower()
+    segments = [segment for segment in PATH_SEGMENT_SPLIT.split(path) if segment]
+    # Whole segments ("who-we-are") and their words ("about-us" -> "about")
+    segments += [word for segment in segments if '-' in segment for word in segment.split('-')]
+    score = calculate_page_credibility(url)
+    score += max((PEOPLE_PATH_KEYWORDS.get(segment, 0.0) for segment in segments), default=0.0)
+    score -= max((LOW_YIELD_PATH_KEYWORDS.get(segment, 0.0) for segment in segments), default=0.0)
+    # Deep pages (articles, product pages) are usually not team pages
+    score -= 0.1 * max(0, path.rstrip('/').count('/') - 1)
+    return score
+
+
+_worker_people_discovery = None
+
+
+def extract_page(html: str, page_url: str, company_domain: str) -> Tuple[List[Dict], List[str]]:
+    """
+    Parse a page once and return (people, same-host links to follow)
+    Pure function of its arguments so it can run in a worker process
+    """
+    return extract_parsed_page(ParsedPage(html, page_url), page_url, company_domain)
+
+
+def extract_parsed_page(page: ParsedPage, page_url: str, company_domain: str) -> Tuple[List[Dict], List[str]]:
+    """extract_page() for a page the caller keeps using"""
+    global _worker_people_discovery
+    if _worker_people_discovery is None:
+        _worker_people_discovery = PeopleDiscovery()
+    
+    people = _worker_people_discovery.extract_people(page, page_url, company_domain)
+    
+    host = urlparse(page_url).netloc
+    links = []
+    for href in page.links:
+        full_url = urljoin(page_url, href)
+        if urlparse(full_url).netloc == host and is_scannable_url(full_url):
+            links.append(full_url)
+    
+    return people, links
+
+
 class ScanJobManager:
     """Manages scan jobs with progress tracking"""
     
@@ -124,13 +177,34 @@ class ScanJobManager:
         self.db.refresh(scan_job)
         return scan_job
     
-    def update_scan_progress(self, scan_job_id: int, progress: int, current_step: str):
-        """Update scan job progress"""
-        scan_job = self.db.query(ScanJob).filter(ScanJob.id == scan_job_id).first()
-        if scan_job:
-            scan_job.progress_percentage = progress
-            scan_job.current_step = current_step
-            self.db.commit()
+    def _write_progress(self, scan_job_id: int, values: Dict):
+        """Single UPDATE, no read"""
+        self.db.query(ScanJob).filter(ScanJob.id == scan_job_id).update(
+            values, synchronize_session=False
+        )
+        self.db.commit()
+    
+    def update_scan_progress(
+        self,
+        scan_job_id: int,
+        progress: int,
+        current_step: str,
+        phase: Optional[str] = None
+    ):
+        """
+        Update scan job progress
+        Live value is kept in memory (scan_progress); the row is written at
+        most every SCAN_PROGRESS_FLUSH_MS, or right away when phase changes
+        """
+        values = scan_progress.update(scan_job_id, progress, current_step, phase)
+        if values:
+            self._write_progress(scan_job_id, values)
+    
+    def flush_scan_progress(self, scan_job_id: int):
+        """Write a deferred progress update, if any"""
+        values = scan_progress.take_pending(scan_job_id)
+        if values:
+            self._write_progress(scan_job_id, values)
     
     def start_scan_job(self, scan_job_id: int):
         """Mark scan job as running"""
@@ -139,6 +213,7 @@ class ScanJobManager:
             scan_job.status = ScanStatus.RUNNING
             scan_job.started_at = datetime.utcnow()
             self.db.commit()
+            scan_progress.start(scan_job)
     
     def complete_scan_job(
         self,
@@ -163,18 +238,33 @@ class ScanJobManager:
             scan_job.emails_rejected_quality = emails_rejected_quality
             scan_job.progress_percentage = 100
             self.db.commit()
+        scan_progress.finish(scan_job_id)
     
     def fail_scan_job(self, scan_job_id: int, error_message: str):
         """Mark scan job as failed"""
-        scan_job = self.db.query(ScanJob).filter(ScanJob.id == scan_job_id).first()
-        if scan_job:
-            scan_job.status = ScanStatus.FAILED
-            scan_job.error_message = error_message
-            scan_job.completed_at = datetime.utcnow()
-            self.db.commit()
+        try:
+            pending = scan_progress.take_pending(scan_job_id) or {}
+            scan_job = self.db.query(ScanJob).filter(ScanJob.id == scan_job_id).first()
+            if scan_job:
+                for field, value in pending.items():
+                    setattr(scan_job, field, value)
+                scan_job.status = ScanStatus.FAILED
+                scan_job.error_message = error_message
+                scan_job.completed_at = datetime.utcnow()
+                self.db.commit()
+        finally:
+            # Even if the row can't be written, stop serving a stale live status
+            scan_progress.finish(scan_job_id)
     
     def get_scan_status(self, scan_job_id: int) -> Dict:
-        """Get scan job status and progress"""
+        """
+        Get scan job status and progress
+        Scans running in this process are served from memory
+        """
+        live = scan_progress.get(scan_job_id)
+        if live is not None:
+            return live
+        
         scan_job = self.db.query(ScanJob).filter(ScanJob.id == scan_job_id).first()
         if not scan_job:
             return None
@@ -203,30 +293,35 @@ class PeopleDiscovery:
         self.session = requests.Session()
         self.session.headers.update(HEADERS)
     
-    def extract_people(self, html: str, page_url: str, company_domain: str) -> List[Dict]:
+    def extract_people(
+        self,
+        html: Union[str, ParsedPage],
+        page_url: str,
+        company_domain: str
+    ) -> List[Dict]:
         """
-        Extract people with names and roles from HTML
+        Extract people with names and roles from HTML or a ParsedPage
         Returns: [{'name': str, 'role': str, 'confidence': float, 'source_page': str}]
         """
-        soup = BeautifulSoup(html, 'html.parser')
+        page = ParsedPage.ensure(html, page_url)
         people = []
         
         # Strategy 1: Team cards
-        team_cards = soup.find_all(['div', 'article'], class_=re.compile(r'team|member|person|profile', re.I))
+        team_cards = page.find_by_class(['div', 'article'], TEAM_CARD_CLASS)
         for card in team_cards:
             person = self._extract_from_team_card(card, page_url)
             if person:
                 people.append(person)
         
         # Strategy 2: Blog authors
-        author_sections = soup.find_all(['div', 'span', 'p'], class_=re.compile(r'author|byline|written', re.I))
+        author_sections = page.find_by_class(['div', 'span', 'p'], AUTHOR_CLASS)
         for section in author_sections:
             person = self._extract_from_author_section(section, page_url)
             if person:
                 people.append(person)
         
         # Strategy 3: Heading + role pattern
-        headings = soup.find_all(['h1', 'h2', 'h3', 'h4', 'strong', 'b'])
+        headings = page.find_all(['h1', 'h2', 'h3', 'h4', 'strong', 'b'])
         for heading in headings:
             person = self._extract_from_heading(heading, page_url)
             if person:
@@ -258,7 +353,7 @@ class PeopleDiscovery:
         if name_elem:
             name = name_elem.get_text(strip=True)
         
-        role_elem = element.find(['p', 'span', 'div'], class_=re.compile(r'role|title|position', re.I))
+        role_elem = element.find(['p', 'span', 'div'], class_=ROLE_CLASS)
         if role_elem:
             role = role_elem.get_text(strip=True)
         else:
@@ -315,15 +410,8 @@ class PeopleDiscovery:
         return None
     
     def _extract_role_from_text(self, text: str) -> Optional[str]:
-        """Extract role from text using patterns"""
-        for pattern in ROLE_PATTERNS:
-            match = re.search(pattern, text, re.IGNORECASE)
-            if match:
-                role = match.group(0)
-                normalized = normalize_role(role)
-                if normalized and is_allowed_role(normalized):
-                    return normalized
-        return None
+        """Extract role from text (one automaton pass over text_extractor.ROLE_PHRASES)"""
+        return role_matcher.first_role(text)
     
     def _is_valid_name(self, name: str) -> bool:
         """Check if name looks valid"""
@@ -337,26 +425,29 @@ class PeopleDiscovery:
 class EmailDiscovery:
     """Discovers emails for people"""
     
-    def __init__(self):
+    def __init__(self, pattern_learner: Optional[EmailPatternLearner] = None):
         self.session = requests.Session()
         self.session.headers.update(HEADERS)
+        self.pattern_learner = pattern_learner
     
     def discover_email(
         self,
-        person: Person,
+        person: Union[Person, SavedPerson],
         company_domain: str,
-        html: str = None
+        html: Union[str, ParsedPage, None] = None
     ) -> List[Dict]:
         """
         Discover emails for a person
+        html may be raw HTML or a ParsedPage shared with other people on the page
         Returns list of discovered emails with metadata
         NO MOCK DATA. Returns empty list if nothing found.
         """
         discovered = []
+        page = ParsedPage.ensure(html, person.source_page) if html else None
         
         # Strategy 1: Direct discovery in HTML
-        if html:
-            direct_email = self._find_email_near_name(html, person.full_name, company_domain)
+        if page:
+            direct_email = self._find_email_near_name(page, person.full_name, company_domain)
             if direct_email:
                 discovered.append({
                     'email': direct_email,
@@ -366,8 +457,8 @@ class EmailDiscovery:
                 })
         
         # Strategy 2: Structured extraction (if in table/list)
-        if html:
-            structured_email = self._extract_structured_email(html, person.full_name, company_domain)
+        if page:
+            structured_email = self._extract_structured_email(page, person.full_name, company_domain)
             if structured_email and structured_email not in [d['email'] for d in discovered]:
                 discovered.append({
                     'email': structured_email,
@@ -376,6 +467,11 @@ class EmailDiscovery:
                     'discovery_method': 'structured'
                 })
         
+        # Addresses seen on the page teach the domain's pattern
+        if self.pattern_learner is not None:
+            for email_data in discovered:
+                self.pattern_learner.record(company_domain, email_data['email'], person.full_name)
+        
         # Strategy 3: Pattern inference (ONLY if no direct discovery)
         if not discovered:
             inferred = self._infer_email_from_name(person.full_name, company_domain, person.source_page)
@@ -390,19 +486,32 @@ class EmailDiscovery:
         # NO MOCK DATA: Return empty if nothing found
         return valid_discovered if valid_discovered else []
     
-    def _find_email_near_name(self, html: str, name: str, domain: str) -> Optional[str]:
-        """Find email address near person's name in HTML"""
-        soup = BeautifulSoup(html, 'html.parser')
-        text = soup.get_text()
+    def learn_from_page(self, page: ParsedPage, names: List[str], company_domain: str):
+        """
+        Teach the pattern learner from the addresses on a crawled page
+        An address counts for a name only if it is one of that name's
+        patterns, so nearby colleagues' addresses are never misattributed
+        """
+        if self.pattern_learner is None or not names:
+            return
+        suffix = '@' + company_domain.lower()
+        emails = {hit.email.lower() for hit in page.text_index.emails}
+        emails.update(email.lower() for email, _ in page.mailto_links)
+        emails = [email for email in emails if email.endswith(suffix) and not is_blocked_prefix(email)]
+        for name in names:
+            for email in emails:
+                self.pattern_learner.record(company_domain, email, name)
+    
+    def _find_email_near_name(self, page: ParsedPage, name: str, domain: str) -> Optional[str]:
+        """Find email address near person's name in page text"""
+        index = page.text_index
         
-        name_index = text.lower().find(name.lower())
+        name_index = index.find_name(name)
         if name_index == -1:
             return None
         
-        context = text[max(0, name_index-500):name_index+500]
-        
-        email_pattern = r'\b[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}\b'
-        emails = re.findall(email_pattern, context)
+        # Email spans within 500 chars of the name (indexed once per page)
+        emails = index.emails_near(name_index)
         
         for email in emails:
             email_lower = email.lower()
@@ -411,19 +520,14 @@ class EmailDiscovery:
         
         return None
     
-    def _extract_structured_email(self, html: str, name: str, domain: str) -> Optional[str]:
+    def _extract_structured_email(self, page: ParsedPage, name: str, domain: str) -> Optional[str]:
         """Extract email from structured data (tables, lists)"""
-        soup = BeautifulSoup(html, 'html.parser')
+        name_lower = name.lower()
         
         # Look for email in mailto links
-        mailto_links = soup.find_all('a', href=re.compile(r'^mailto:', re.I))
-        
-        for link in mailto_links:
+        for email, parent_text in page.mailto_links:
             # Check if link is near the person's name
-            parent_text = link.parent.get_text() if link.parent else ""
-            
-            if name.lower() in parent_text.lower():
-                email = link['href'].replace('mailto:', '').strip()
+            if name_lower in parent_text:
                 if domain.lower() in email.lower() and not is_blocked_prefix(email):
                     return email.lower()
         
@@ -433,43 +537,27 @@ class EmailDiscovery:
         """
         Infer possible email patterns from name
         ONLY ALLOWED PATTERNS
+        Domains with a known dominant pattern get that single candidate
         """
-        parts = name.lower().split()
-        if len(parts) < 2:
+        names = name_parts(name)
+        if not names:
             return []
         
-        first = parts[0]
-        last = parts[-1]
+        candidates = local_parts(*names)
+        if self.pattern_learner is not None:
+            patterns = self.pattern_learner.ranked_patterns(domain)
+        else:
+            patterns = PATTERNS
         
-        # ALLOWED PATTERNS ONLY
-        patterns = [
-            {
-                'email': f"{first}@{domain}",
-                'source_type': 'website',
-                'source_url': source_url,
-                'discovery_method': 'inferred'
-            },
-            {
-                'email': f"{first}.{last}@{domain}",
-                'source_type': 'website',
-                'source_url': source_url,
-                'discovery_method': 'inferred'
-            },
+        return [
             {
-                'email': f"{first[0]}.{last}@{domain}",
-                'source_type': 'website',
-                'source_url': source_url,
-                'discovery_method': 'inferred'
-            },
-            {
-                'email': f"{first[0]}{last}@{domain}",
+                'email': f"{candidates[pattern]}@{domain}",
                 'source_type': 'website',
                 'source_url': source_url,
                 'discovery_method': 'inferred'
             }
+            for pattern in patterns
         ]
-        
-        return patterns
     
     def _is_valid_email_pattern(self, email: str) -> bool:
         """Check if email matches allowed patterns"""
@@ -491,26 +579,43 @@ class EmailDiscovery:
 class EmailScraper:
     """Main scraper orchestrating the full pipeline"""
     
-    def __init__(self, db: Session, rate_limit: float = 0.5):
+    def __init__(
+        self,
+        db: Session,
+        rate_limit: float = 0.5,
+        concurrency: int = 5,
+        max_duration: float = 30.0,
+        cache: Optional[PageCache] = page_cache
+    ):
         self.db = db
-        self.rate_limit = rate_limit
+        self.rate_limit = rate_limit  # per-host politeness interval
+        self.concurrency = concurrency
+        self.max_duration = max_duration
+        self.page_cache = cache
         self.session = requests.Session()
         self.session.headers.update(HEADERS)
         self.scan_manager = ScanJobManager(db)
         self.people_discovery = PeopleDiscovery()
-        self.email_discovery = EmailDiscovery()
+        self.email_discovery = EmailDiscovery(EmailPatternLearner(db))
     
     def _is_valid_url(self, url: str) -> bool:
         """Check if URL should be scraped"""
-        parsed = urlparse(url)
-        path = parsed.path.lower()
-        return not any(blocked in path for blocked in BLOCKED_PATHS)
+        return is_scannable_url(url)
     
-    def _fetch_page(self, url: str) -> Optional[str]:
-        """Fetch page content with rate limiting"""
+    def _fetch_page(self, url: str, freshness: Optional[FreshnessPolicy] = None) -> Optional[str]:
+        """Fetch page content with rate limiting (conditional GET when cached)"""
         try:
+            cached = None
+            if self.page_cache is not None:
+                body, cached = self.page_cache.lookup(url, freshness)
+                if body is not None:
+                    return body
+            
             time.sleep(self.rate_limit)
-            response = self.session.get(url, timeout=10)
+            headers = cached.conditional_headers() if cached is not None else None
+            response = self.session.get(url, timeout=10, headers=headers)
+            if self.page_cache is not None:
+                return self.page_cache.resolve(url, cached, response)
             response.raise_for_status()
             return response.text
         except Exception as e:
@@ -522,74 +627,136 @@ class EmailScraper:
         url: str,
         company_id: int,
         scan_job_id: int,
-        max_pages: int = 5
+        max_pages: int = 5,
+        freshness: Optional[FreshnessPolicy] = None,
+        pages: Optional[Dict[str, ParsedPage]] = None
     ) -> List[Dict]:
         """Scrape people from website"""
         if not self._is_valid_url(url):
             return []
         
+        return asyncio.run(
+            self.scrape_website_async(url, company_id, scan_job_id, max_pages, freshness, pages)
+        )
+    
+    async def scrape_website_async(
+        self,
+        url: str,
+        company_id: int,
+        scan_job_id: int,
+        max_pages: int = 5,
+        freshness: Optional[FreshnessPolicy] = None,
+        pages: Optional[Dict[str, ParsedPage]] = None
+    ) -> List[Dict]:
+        """
+        Scrape people from website with the async crawl engine
+        Up to `concurrency` pages are fetched at once; cached pages are
+        reused or revalidated according to `freshness`
+        pages, if given, receives {url: ParsedPage} of every page crawled
+        """
+        if not self._is_valid_url(url):
+            return []
+        
         domain = urlparse(url).netloc
         people_found = []
-        visited_urls = set()
-        to_visit = [url]
         
-        self.scan_manager.update_scan_progress(scan_job_id, 10, f"Starting website scan: {url}")
+        self.scan_manager.update_scan_progress(
+            scan_job_id, 10, f"Starting website scan: {url}", phase="crawl"
+        )
         
-        page_count = 0
-        START_TIME = time.time()
-        MAX_DURATION = 6  # seconds
-
-        while to_visit and page_count < max_pages:
-            if time.time() - START_TIME > MAX_DURATION:
-                print("[SCAN] Max scan duration reached, stopping crawl")
-                break
-
-            current_url = to_visit.pop(0)
-            
-            if current_url in visited_urls:
-                continue
-            
-            visited_urls.add(current_url)
-            page_count += 1
-            
-            progress = 10 + int((page_count / max_pages) * 40)
+        def on_fetch_start(current_url: str, page_number: int):
+            progress = 10 + int((page_number / max_pages) * 40)
             self.scan_manager.update_scan_progress(
                 scan_job_id,
                 progress,
-                f"Scanning page {page_count}/{max_pages}: {current_url}"
+                f"Scanning page {page_number}/{max_pages}: {current_url}"
             )
+        
+        def on_page(current_url: str, html: str) -> List[str]:
+            page = ParsedPage(html, current_url)
+            page_people, links = extract_parsed_page(page, current_url, domain)
+            people_found.extend(page_people)
+            if pages is not None:
+                pages[current_url] = page
+            return links
+        
+        crawler = AsyncCrawler(
+            headers=HEADERS,
+            concurrency=self.concurrency,
+            rate_limit=self.rate_limit,
+            max_duration=self.max_duration,
+            page_cache=self.page_cache,
+            freshness=freshness,
+            url_scorer=score_people_url,
+            site_index=site_index_cache
+        )
+        await crawler.crawl(url, max_pages, on_page, on_fetch_start)
+        self.scan_manager.flush_scan_progress(scan_job_id)
+        
+        return people_found
+    
+    def _save_people(self, company_id: int, people: List[Dict]) -> List[Tuple[SavedPerson, Dict]]:
+        """
+        Persist and commit discovered people (already filtered by role)
+        Returns [(SavedPerson, person_data)] including people that already existed
+        """
+        saved = ScanPersistence(self.db, company_id).save_people(people)
+        self.db.commit()
+        return saved
+    
+    async def scan_companies_people_async(
+        self,
+        company_ids: List[int],
+        max_pages: int = 5,
+        max_workers: Optional[int] = None,
+        company_concurrency: int = 4
+    ) -> Dict[int, int]:
+        """
+        Bulk people discovery for many companies
+        Pages are crawled concurrently here, parsed and extracted in a
+        process pool, and each page's people are saved as soon as they arrive
+        Returns {company_id: people_saved}
+        """
+        companies = self.db.query(Company).filter(Company.id.in_(company_ids)).all()
+        people_saved = {company.id: 0 for company in companies}
+        semaphore = asyncio.Semaphore(company_concurrency)
+        loop = asyncio.get_running_loop()
+        
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
             
-            html = self._fetch_page(current_url)
-            
-            if not html:
-                continue
-            
-            soup = BeautifulSoup(html, 'html.parser')
-            
-            # Extract people from this page
-            page_people = self.people_discovery.extract_people(html, current_url, domain)
-            
-            for person_data in page_people:
-                people_found.append(person_data)
+            async def scan_company(company: Company):
+                if not company.website or not self._is_valid_url(company.website):
+                    return
+                
+                domain = urlparse(company.website).netloc
+                
+                async def on_page(current_url: str, html: str) -> List[str]:
+                    page_people, links = await loop.run_in_executor(
+                        pool, extract_page, html, current_url, domain
+                    )
+                    if page_people:
+                        saved = self._save_people(company.id, page_people)
+                        people_saved[company.id] += len(saved)
+                    return links
+                
+                crawler = AsyncCrawler(
+                    headers=HEADERS,
+                    concurrency=self.concurrency,
+                    rate_limit=self.rate_limit,
+                    max_duration=self.max_duration,
+                    page_cache=self.page_cache,
+                    url_scorer=score_people_url,
+                    site_index=site_index_cache
+                )
+                async with semaphore:
+                    try:
+                        await crawler.crawl(company.website, max_pages, on_page)
+                    except Exception as e:
+                        print(f"[BULK SCAN] {company.domain} failed: {e}")
             
-            # Find more pages
-            if page_count < max_pages:
-                for link in soup.find_all('a', href=True):
-                    href = link['href']
-                    full_url = urljoin(current_url, href)
-                    
-                    parsed_start = urlparse(url)
-                    parsed_link = urlparse(full_url)
-
-                    if (
-                        parsed_link.netloc == parsed_start.netloc
-                        and self._is_valid_url(full_url)
-                    ):
-
-                        if full_url not in visited_urls and len(to_visit) < 3:
-                            to_visit.append(full_url)
+            await asyncio.gather(*(scan_company(company) for company in companies))
         
-        return people_found
+        return people_saved
     
     def run_full_scan(
         self,
@@ -598,11 +765,14 @@ class EmailScraper:
         scan_linkedin: bool = False,
         max_pages: int = 5,
         verify_emails: bool = True,
-        scan_job_id: Optional[int] = None
+        scan_job_id: Optional[int] = None,
+        page_max_age: Optional[float] = None
     ) -> Dict:
         """
         Run complete scan job
         Pipeline: Company → People → Roles → Emails → Validation → Drafts
+        page_max_age: cached pages validated less than this many seconds ago
+        are reused as-is (default PAGE_CACHE_MAX_AGE, 0 = revalidate all)
         NO MOCK DATA. Returns empty results if nothing found.
         """
         if DEV_MODE:
@@ -635,15 +805,20 @@ class EmailScraper:
             self.scan_manager.start_scan_job(scan_job.id)
             
             all_people = []
+            crawled_pages: Dict[str, ParsedPage] = {}
             
             # PHASE 1: Discover people
             if scan_website and company.website:
-                self.scan_manager.update_scan_progress(scan_job.id, 5, "Discovering people from website")
+                self.scan_manager.update_scan_progress(
+                    scan_job.id, 5, "Discovering people from website", phase="discover"
+                )
                 website_people = self.scrape_website(
                     company.website,
                     company_id,
                     scan_job.id,
-                    max_pages
+                    max_pages,
+                    FreshnessPolicy(page_max_age) if page_max_age is not None else None,
+                    pages=crawled_pages
                 )
                 all_people.extend(website_people)
             
@@ -668,149 +843,51 @@ class EmailScraper:
                 }
             
             # PHASE 2: Save people (already filtered by role)
-            self.scan_manager.update_scan_progress(scan_job.id, 60, f"Saving {len(all_people)} decision makers")
+            self.scan_manager.update_scan_progress(
+                scan_job.id, 60, f"Saving {len(all_people)} decision makers", phase="save_people"
+            )
             
-            saved_people = []
-            for person_data in all_people:
-                # Deduplicate at person level
-                norm_name = normalize_name(person_data['name'])
-                existing = self.db.query(Person).filter(
-                    Person.company_id == company_id,
-                    Person.normalized_name == norm_name,
-                    Person.role == person_data['role']
-                ).first()
-                
-                if existing:
-                    saved_people.append((existing, person_data))
-                    continue
-                
-                person = Person(
-                    company_id=company_id,
-                    full_name=person_data['name'],
-                    normalized_name=norm_name,
-                    role=person_data['role'],
-                    role_confidence=person_data['confidence'],
-                    source_page=person_data['source_page']
-                )
-                self.db.add(person)
-                self.db.commit()
-                self.db.refresh(person)
-                
-                saved_people.append((person, person_data))
+            persistence = ScanPersistence(self.db, company_id, scan_job.id)
+            saved_people = persistence.save_people(all_people)
             
-            # PHASE 3: Discover and validate emails
-            self.scan_manager.update_scan_progress(scan_job.id, 70, "Discovering emails for decision makers")
+            # PHASE 3: Discover emails, stored unverified in one bulk insert
+            self.scan_manager.update_scan_progress(
+                scan_job.id, 70, "Discovering emails for decision makers", phase="emails"
+            )
             
-            stats = {
-                'discovered': 0,
-                'validated': 0,
-                'rejected_role': 0,
-                'rejected_domain': 0,
-                'rejected_quality': 0
-            }
+            # Addresses already on the crawled pages teach the domain's
+            # pattern before anything is inferred
+            names_by_page: Dict[str, List[str]] = {}
+            for person_data in all_people:
+                names_by_page.setdefault(person_data['source_page'], []).append(person_data['name'])
+            for url, page in crawled_pages.items():
+                self.email_discovery.learn_from_page(page, names_by_page.get(url, []), company.domain)
             
-            for person, person_data in saved_people:
-                # Discover emails
-                discovered_emails = self.email_discovery.discover_email(
+            discovered = []
+            for person, _ in saved_people:
+                # NO MOCK DATA: people without discovered emails add nothing
+                for email_data in self.email_discovery.discover_email(
                     person,
                     company.domain,
                     html=None  # infer-only unless explicit
-                )
-
-                
-                # NO MOCK DATA: Skip if no emails discovered
-                if not discovered_emails:
-                    continue
-                
-                for email_data in discovered_emails:
-                    email_address = email_data['email']
-                    
-                    # Check if exists
-                    existing_email = self.db.query(Email).filter(
-                        Email.email_address == email_address
-                    ).first()
-                    
-                    if existing_email:
-                        continue
-                    
-                    stats['discovered'] += 1
-                    
-                    # MANDATORY VALIDATION
-                    page_credibility = calculate_page_credibility(email_data['source_url'])
-                    
-                    validation = validate_email_full(
-                        email_address,
-                        company.domain,
-                        role_confidence=person.role_confidence,
-                        discovery_method=email_data['discovery_method'],
-                        page_credibility=page_credibility,
-                        check_mx=verify_emails,
-                        check_smtp=False
-                    )
-                    
-                    # Determine discovery status
-                    if not validation['is_valid']:
-                        if not validation['domain_match']:
-                            discovery_status = EmailDiscoveryStatus.REJECTED_DOMAIN
-                            stats['rejected_domain'] += 1
-                        elif validation['quality_score'] < 70:
-                            discovery_status = EmailDiscoveryStatus.REJECTED_QUALITY
-                            stats['rejected_quality'] += 1
-                        else:
-                            discovery_status = EmailDiscoveryStatus.REJECTED_QUALITY
-                            stats['rejected_quality'] += 1
-                        
-                        # Save rejected email (backend only)
-                        email = Email(
-                            email_address=email_address,
-                            person_id=person.id,
-                            company_id=company_id,
-                            scan_job_id=scan_job.id,
-                            status=EmailStatus.DELETED,
-                            discovery_status=discovery_status,
-                            verification_status=VerificationStatus.INVALID,
-                            source_type=email_data['source_type'],
-                            source_url=email_data['source_url'],
-                            discovery_method=email_data['discovery_method'],
-                            quality_score=validation['quality_score'],
-                            confidence_score=validation['confidence_score'],
-                            confidence_level=validation['confidence_level'],
-                            is_validated=True,
-                            mx_valid=validation['mx_valid'],
-                            is_role_email=validation['is_role_email'],
-                            is_disposable=validation['is_disposable'],
-                            verification_error=validation['reason'],
-                            verified_at=datetime.utcnow()
-                        )
-                        self.db.add(email)
-                        continue
-                    
-                    # SAVE VALID EMAIL AS DRAFT
-                    stats['validated'] += 1
-                    
-                    email = Email(
-                        email_address=email_address,
-                        person_id=person.id,
-                        company_id=company_id,
-                        scan_job_id=scan_job.id,
-                        status=EmailStatus.DRAFT,
-                        discovery_status=EmailDiscoveryStatus.VALIDATED,
-                        verification_status=VerificationStatus.VALID,
-                        source_type=email_data['source_type'],
-                        source_url=email_data['source_url'],
-                        discovery_method=email_data['discovery_method'],
-                        quality_score=validation['quality_score'],
-                        confidence_score=validation['confidence_score'],
-                        confidence_level=validation['confidence_level'],
-                        is_validated=True,
-                        mx_valid=validation['mx_valid'],
-                        is_role_email=validation['is_role_email'],
-                        is_disposable=validation['is_disposable'],
-                        verified_at=datetime.utcnow()
-                    )
-                    self.db.add(email)
+                ):
+                    discovered.append((person, email_data))
             
-            self.db.commit()
+            email_ids = persistence.save_emails(discovered)
+            
+            # PHASE 4: MANDATORY VALIDATION, one batch for the whole scan
+            self.scan_manager.update_scan_progress(
+                scan_job.id, 85, f"Validating {len(email_ids)} emails", phase="validate"
+            )
+            
+            stats = persistence.verify_emails(
+                email_ids,
+                company.domain,
+                calculate_page_credibility,
+                check_mx=verify_emails
+            )
+            stats['discovered'] = len(email_ids)
+            stats['rejected_role'] = 0
             
             # Update company
             company.last_scanned = datetime.utcnow()
@@ -838,6 +915,8 @@ class EmailScraper:
             }
             
         except Exception as e:
+            # A failed flush leaves the session unusable until rolled back
+            self.db.rollback()
             self.scan_manager.fail_scan_job(scan_job.id, str(e))
             return {
                 'scan_job_id': scan_job.id,
@@ -870,6 +949,25 @@ def start_scan(
     )
 
 
+def run_bulk_people_scan(
+    company_ids: List[int],
+    max_pages: int = 5,
+    max_workers: Optional[int] = None
+) -> Dict[int, int]:
+    """
+    Bulk people discovery across many companies (overnight scans)
+    Uses its own session since it outlives the request that started it
+    """
+    db = SessionLocal()
+    try:
+        scraper = EmailScraper(db)
+        return asyncio.run(
+            scraper.scan_companies_people_async(company_ids, max_pages, max_workers)
+        )
+    finally:
+        db.close()
+
+
 def get_scan_status(db: Session, scan_job_id: int) -> Optional[Dict]:
     """Get status of a scan job"""
     manager = ScanJobManager(db)
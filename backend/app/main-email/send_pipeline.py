@@ -0,0 +1,238 @@
+"""
+Concurrent SMTP send pipeline for campaigns
+- SMTPConnectionPool: authenticated connections reused across messages
+- SendPacer: provider-wide rate limit + minimum spacing per recipient domain
+- SendPipeline: producer renders messages ahead, worker threads send,
+  results are handed back to the calling thread (which owns the DB session)
+"""
+
+import os
+import queue
+import smtplib
+import socket
+import threading
+import time
+from contextlib import suppress
+from typing import Callable, Dict, Iterable, Optional
+
+SMTP_POOL_SIZE = int(os.getenv("SMTP_POOL_SIZE", "4"))
+SMTP_MAX_PER_SECOND = float(os.getenv("SMTP_MAX_PER_SECOND", "2"))
+SMTP_MESSAGES_PER_CONNECTION = int(os.getenv("SMTP_MESSAGES_PER_CONNECTION", "100"))
+
+# Errors after which a connection cannot be reused
+BROKEN_CONNECTION_ERRORS = (smtplib.SMTPServerDisconnected, ConnectionError, socket.timeout)
+
+
+class SMTPConnectionPool:
+    """
+    Bounded pool of logged-in SMTP connections
+    A connection is recycled after max_messages, and reconnected once if the
+    server dropped it while idle
+    """
+
+    def __init__(
+        self,
+        server: str,
+        port: int,
+        user: Optional[str] = None,
+        password: Optional[str] = None,
+        size: int = SMTP_POOL_SIZE,
+        use_tls: bool = True,
+        timeout: float = 30,
+        max_messages: int = SMTP_MESSAGES_PER_CONNECTION
+    ):
+        self.server = server
+        self.port = port
+        self.user = user
+        self.password = password
+        self.use_tls = use_tls
+        self.timeout = timeout
+        self.max_messages = max(1, max_messages)
+
+        self._slots = threading.BoundedSemaphore(max(1, size))
+        self._idle: "queue.LifoQueue[smtplib.SMTP]" = queue.LifoQueue()
+        self._usage: Dict[int, int] = {}
+        self._lock = threading.Lock()
+        self.stats = {'connections': 0, 'messages': 0, 'reconnects': 0}
+
+    def _connect(self) -> smtplib.SMTP:
+        smtp = smtplib.SMTP(self.server, self.port, timeout=self.timeout)
+        try:
+            if self.use_tls:
+                smtp.starttls()
+            if self.user:
+                smtp.login(self.user, self.password)
+        except Exception:
+            smtp.close()
+            raise
+        with self._lock:
+            self.stats['connections'] += 1
+            self._usage[id(smtp)] = 0
+        return smtp
+
+    def _checkout(self) -> smtplib.SMTP:
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            return self._connect()
+
+    def _checkin(self, smtp: smtplib.SMTP):
+        with self._lock:
+            self._usage[id(smtp)] = self._usage.get(id(smtp), 0) + 1
+            exhausted = self._usage[id(smtp)] >= self.max_messages
+        if exhausted:
+            self._discard(smtp)
+        else:
+            self._idle.put(smtp)
+
+    def _discard(self, smtp: Optional[smtplib.SMTP]):
+        if smtp is None:
+            return
+        with self._lock:
+            self._usage.pop(id(smtp), None)
+        with suppress(Exception):
+            smtp.quit()
+        with suppress(Exception):
+            smtp.close()
+
+    def send_message(self, msg):
+        """Send on a pooled connection; raises smtplib errors like SMTP.send_message"""
+        with self._slots:
+            smtp = self._checkout()
+            healthy = True
+            try:
+                try:
+                    smtp.send_message(msg)
+                except BROKEN_CONNECTION_ERRORS:
+                    # Dropped while idle: one fresh connection, one retry
+                    self._discard(smtp)
+                    smtp = None
+                    with self._lock:
+                        self.stats['reconnects'] += 1
+                    smtp = self._connect()
+                    smtp.send_message(msg)
+                with self._lock:
+                    self.stats['messages'] += 1
+            except BROKEN_CONNECTION_ERRORS:
+                healthy = False
+                raise
+            except smtplib.SMTPResponseException as e:
+                # 421 = service closing the channel
+                healthy = e.smtp_code != 421
+                raise
+            finally:
+                if smtp is not None:
+                    if healthy:
+                        self._checkin(smtp)
+                    else:
+                        self._discard(smtp)
+
+    def close(self):
+        while True:
+            try:
+                self._discard(self._idle.get_nowait())
+            except queue.Empty:
+                break
+
+
+class SendPacer:
+    """
+    Reserves send slots: at most max_per_second overall (provider limit)
+    and at least domain_interval seconds between messages to one domain
+    """
+
+    def __init__(self, max_per_second: float = SMTP_MAX_PER_SECOND, domain_interval: float = 0.0):
+        self.global_interval = 1.0 / max_per_second if max_per_second > 0 else 0.0
+        self.domain_interval = max(0.0, domain_interval)
+        self._lock = threading.Lock()
+        self._next_global = 0.0
+        self._next_domain: Dict[str, float] = {}
+
+    def wait(self, domain: str):
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_global, self._next_domain.get(domain, 0.0))
+            self._next_global = slot + self.global_interval
+            self._next_domain[domain] = slot + self.domain_interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+class SendPipeline:
+    """
+    producer thread: pulls rendered messages (dicts with 'domain') from an
+                     iterable, e.g. CampaignRenderer.render_batch()
+    worker threads:  pacer.wait(domain), then send(message) -> result dict
+    calling thread:  on_result(message, result) for every message, in completion order
+    Messages carrying an 'error' key are reported as failed without sending
+    """
+
+    STOP = object()
+
+    def __init__(self, workers: int = SMTP_POOL_SIZE, pacer: Optional[SendPacer] = None, queue_size: int = 100):
+        self.workers = max(1, workers)
+        self.pacer = pacer or SendPacer()
+        self.queue_size = queue_size
+
+    def run(
+        self,
+        messages: Iterable[Dict],
+        send: Callable[[Dict], Dict],
+        on_result: Callable[[Dict, Dict], None]
+    ):
+        rendered: queue.Queue = queue.Queue(maxsize=self.queue_size)
+        results: queue.Queue = queue.Queue()
+        cancelled = threading.Event()
+
+        def produce():
+            try:
+                for message in messages:
+                    if cancelled.is_set():
+                        break
+                    rendered.put(message)
+            except Exception as e:
+                print(f"[SEND] Message producer stopped: {e}")
+            finally:
+                for _ in range(self.workers):
+                    rendered.put(self.STOP)
+
+        def work():
+            try:
+                while True:
+                    message = rendered.get()
+                    if message is self.STOP:
+                        return
+                    if cancelled.is_set():
+                        continue
+                    if message.get('error'):
+                        result = {'success': False, 'error': message['error'], 'sent_at': None}
+                    else:
+                        try:
+                            self.pacer.wait(message['domain'])
+                            result = send(message)
+                        except Exception as e:
+                            result = {'success': False, 'error': str(e), 'sent_at': None}
+                    results.put((message, result))
+            finally:
+                results.put(self.STOP)
+
+        threads = [threading.Thread(target=produce, daemon=True)]
+        threads += [threading.Thread(target=work, daemon=True) for _ in range(self.workers)]
+        for thread in threads:
+            thread.start()
+
+        try:
+            running = self.workers
+            while running:
+                item = results.get()
+                if item is self.STOP:
+                    running -= 1
+                    continue
+                on_result(*item)
+        except BaseException:
+            # Stop sending messages whose results can no longer be recorded
+            cancelled.set()
+            raise
+        finally:
+            for thread in threads:
+                thread.join()
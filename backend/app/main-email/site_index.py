@@ -0,0 +1,181 @@
+"""
+robots.txt + sitemap.xml per site, fetched once per domain and cached
+Used by AsyncCrawler to skip disallowed URLs, honour Crawl-delay and seed
+the frontier with sitemap URLs (so /team or /about can be fetched first
+even when the homepage does not link to them)
+"""
+
+import gzip
+import html
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import List, Optional
+from urllib.parse import urljoin, urlparse
+from urllib.robotparser import RobotFileParser
+
+import httpx
+
+SITE_INDEX_TTL = int(os.getenv("SITE_INDEX_TTL", "86400"))
+SITEMAP_MAX_URLS = int(os.getenv("SITEMAP_MAX_URLS", "2000"))
+SITEMAP_MAX_FETCHES = int(os.getenv("SITEMAP_MAX_FETCHES", "4"))
+SITE_INDEX_MAX_HOSTS = int(os.getenv("SITE_INDEX_MAX_HOSTS", "500"))
+
+SITEMAP_LOC_REGEX = re.compile(r'<loc>\s*([^<\s]+)\s*</loc>', re.I)
+SITEMAP_INDEX_REGEX = re.compile(r'<sitemapindex[\s>]', re.I)
+
+
+class SiteIndex:
+    """What a site tells crawlers: robots rules and sitemap URLs"""
+
+    def __init__(self, robots: Optional[RobotFileParser], sitemap_urls: List[str]):
+        self.robots = robots
+        self.sitemap_urls = sitemap_urls
+        self.loaded_at = time.monotonic()
+
+    def can_fetch(self, url: str, user_agent: str = '*') -> bool:
+        if self.robots is None:
+            return True
+        return self.robots.can_fetch(user_agent, url)
+
+    def crawl_delay(self, user_agent: str = '*') -> Optional[float]:
+        if self.robots is None:
+            return None
+        delay = self.robots.crawl_delay(user_agent)
+        return float(delay) if delay is not None else None
+
+
+def _parse_robots(status_code: int, text: str) -> Optional[RobotFileParser]:
+    """
+    4xx handled like RobotFileParser.read() (401/403 disallow all, others
+    allow all); 5xx means robots.txt is unavailable -> None (no rules)
+    """
+    robots = RobotFileParser()
+    if status_code in (401, 403):
+        robots.disallow_all = True
+    elif 400 <= status_code < 500:
+        robots.allow_all = True
+    elif status_code >= 500:
+        return None
+    else:
+        robots.parse(text.splitlines())
+    return robots
+
+
+def _sitemap_text(response: httpx.Response) -> str:
+    content = response.content
+    if content[:2] == b'\x1f\x8b':  # .xml.gz served without Content-Encoding
+        content = gzip.decompress(content)
+    return content.decode('utf-8', errors='replace')
+
+
+class SiteIndexCache:
+    """
+    host -> SiteIndex with a TTL, least recently used hosts evicted past
+    max_hosts (expired entries are dropped on every store)
+    Fetch failures give an empty index (everything allowed, no sitemap)
+    and are cached too, so a broken site costs one attempt per TTL
+    """
+
+    def __init__(
+        self,
+        ttl: int = SITE_INDEX_TTL,
+        max_urls: int = SITEMAP_MAX_URLS,
+        max_fetches: int = SITEMAP_MAX_FETCHES,
+        max_hosts: int = SITE_INDEX_MAX_HOSTS
+    ):
+        self.ttl = ttl
+        self.max_urls = max_urls
+        self.max_fetches = max_fetches
+        self.max_hosts = max(1, max_hosts)
+        self._entries: "OrderedDict[str, SiteIndex]" = OrderedDict()
+        self._lock = threading.Lock()  # scan threads share the process-wide cache
+        self.stats = {'hits': 0, 'loads': 0, 'errors': 0, 'evicted': 0}
+
+    def _expired(self, entry: SiteIndex, now: float) -> bool:
+        return now - entry.loaded_at >= self.ttl
+
+    def _cached(self, host: str) -> Optional[SiteIndex]:
+        with self._lock:
+            entry = self._entries.get(host)
+            if entry is None:
+                return None
+            if self._expired(entry, time.monotonic()):
+                del self._entries[host]
+                return None
+            self._entries.move_to_end(host)
+            return entry
+
+    def _store(self, host: str, entry: SiteIndex):
+        with self._lock:
+            self._entries[host] = entry
+            self._entries.move_to_end(host)
+            now = time.monotonic()
+            for stale in [h for h, e in self._entries.items() if self._expired(e, now)]:
+                del self._entries[stale]
+                self.stats['evicted'] += 1
+            while len(self._entries) > self.max_hosts:
+                self._entries.popitem(last=False)
+                self.stats['evicted'] += 1
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    async def get(self, client: httpx.AsyncClient, url: str, politeness=None) -> SiteIndex:
+        """SiteIndex for url's host (fetched on first use)"""
+        parsed = urlparse(url)
+        host = parsed.netloc
+        cached = self._cached(host)
+        if cached is not None:
+            self.stats['hits'] += 1
+            return cached
+
+        self.stats['loads'] += 1
+        base = f"{parsed.scheme}://{host}"
+
+        async def get(target: str) -> httpx.Response:
+            if politeness is not None:
+                await politeness.acquire(host)
+            return await client.get(target)
+
+        robots = None
+        try:
+            response = await get(f"{base}/robots.txt")
+            robots = _parse_robots(response.status_code, response.text)
+        except Exception as e:
+            self.stats['errors'] += 1
+            print(f"[SITE INDEX] robots.txt unavailable for {host}: {e}")
+
+        sitemaps = robots.site_maps() if robots is not None else None
+        queue = list(sitemaps or [f"{base}/sitemap.xml"])
+        urls: List[str] = []
+        fetched = 0
+
+        while queue and fetched < self.max_fetches and len(urls) < self.max_urls:
+            sitemap_url = queue.pop(0)
+            fetched += 1
+            try:
+                response = await get(sitemap_url)
+                if response.status_code != 200:
+                    continue
+                text = _sitemap_text(response)
+            except Exception as e:
+                self.stats['errors'] += 1
+                print(f"[SITE INDEX] Sitemap unavailable {sitemap_url}: {e}")
+                continue
+
+            locations = [urljoin(sitemap_url, html.unescape(loc)) for loc in SITEMAP_LOC_REGEX.findall(text)]
+            if SITEMAP_INDEX_REGEX.search(text):
+                queue.extend(locations)
+            else:
+                urls.extend(locations[:self.max_urls - len(urls)])
+
+        entry = SiteIndex(robots, urls)
+        self._store(host, entry)
+        return entry
+
+
+# Process-wide cache used by the crawler
+site_index_cache = SiteIndexCache()
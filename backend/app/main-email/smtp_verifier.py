@@ -0,0 +1,212 @@
+"""
+Pooled, per-MX-host SMTP verification engine
+Candidates are grouped by MX host and several RCPT TO probes share one
+SMTP session, with bounded concurrency per host
+Results match verify_smtp(): {email: (is_valid, message)}
+"""
+
+import asyncio
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+
+from mx_cache import mx_cache
+
+HELO_HOST = 'verification.test'
+MAIL_FROM = 'verify@example.com'
+
+SMTPResult = Tuple[bool, str]
+
+
+class SMTPReplyError(Exception):
+    """Unexpected reply while setting up a session"""
+
+    def __init__(self, code: int, message: str):
+        super().__init__(f"{code} {message}")
+        self.code = code
+        self.message = message
+
+
+class SMTPConnectError(SMTPReplyError):
+    """Server refused the session in its greeting"""
+
+
+class AsyncSMTPSession:
+    """Minimal async SMTP client: just enough of RFC 5321 to probe recipients"""
+
+    def __init__(self, host: str, port: int = 25, timeout: float = 10):
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self.reader: Optional[asyncio.StreamReader] = None
+        self.writer: Optional[asyncio.StreamWriter] = None
+
+    async def _read_reply(self) -> Tuple[int, str]:
+        lines = []
+        while True:
+            line = await asyncio.wait_for(self.reader.readline(), self.timeout)
+            if not line:
+                raise ConnectionResetError("SMTP server disconnected")
+            line = line.decode('utf-8', 'replace').rstrip('\r\n')
+            lines.append(line[4:])
+            if len(line) < 4 or line[3] != '-':
+                return int(line[:3]), '\n'.join(lines)
+
+    async def command(self, line: str) -> Tuple[int, str]:
+        self.writer.write(f"{line}\r\n".encode())
+        await self.writer.drain()
+        return await self._read_reply()
+
+    async def connect(self):
+        self.reader, self.writer = await asyncio.wait_for(
+            asyncio.open_connection(self.host, self.port),
+            self.timeout
+        )
+        code, message = await self._read_reply()
+        if code != 220:
+            raise SMTPConnectError(code, message)
+
+    async def start(self, helo: str = HELO_HOST, mail_from: str = MAIL_FROM):
+        """Connect, HELO and MAIL FROM - ready for RCPT probes"""
+        await self.connect()
+        code, message = await self.command(f"HELO {helo}")
+        if code != 250:
+            raise SMTPReplyError(code, message)
+        code, message = await self.command(f"MAIL FROM:<{mail_from}>")
+        if code != 250:
+            raise SMTPReplyError(code, message)
+
+    async def rcpt(self, email: str) -> Tuple[int, str]:
+        return await self.command(f"RCPT TO:<{email}>")
+
+    async def close(self):
+        if not self.writer:
+            return
+        try:
+            await asyncio.wait_for(self.command("QUIT"), self.timeout)
+        except Exception:
+            pass
+        self.writer.close()
+        try:
+            await self.writer.wait_closed()
+        except Exception:
+            pass
+        self.writer = None
+
+
+class SMTPVerifier:
+    """
+    Verify many addresses with few SMTP sessions
+
+    - one MX lookup per domain (shared mx_cache)
+    - addresses grouped by MX host, up to max_rcpt_per_session per session
+    - at most per_host_concurrency sessions open against one host
+    - all hosts are probed concurrently
+    """
+
+    def __init__(
+        self,
+        port: int = 25,
+        timeout: float = 10,
+        per_host_concurrency: int = 2,
+        max_rcpt_per_session: int = 20,
+        helo: str = HELO_HOST,
+        mail_from: str = MAIL_FROM,
+        mx_resolver: Optional[Callable[[str], Awaitable[Tuple[bool, Optional[str]]]]] = None
+    ):
+        self.port = port
+        self.timeout = timeout
+        self.per_host_concurrency = max(1, per_host_concurrency)
+        self.max_rcpt_per_session = max(1, max_rcpt_per_session)
+        self.helo = helo
+        self.mail_from = mail_from
+        self.mx_resolver = mx_resolver or mx_cache.resolve_async
+        self.stats = {'sessions': 0, 'rcpt_probes': 0}
+
+    async def _probe_session(self, mx_host: str, emails: List[str]) -> Dict[str, SMTPResult]:
+        """One SMTP session, several RCPT TO probes"""
+        results: Dict[str, SMTPResult] = {}
+        session = AsyncSMTPSession(mx_host, self.port, self.timeout)
+        self.stats['sessions'] += 1
+
+        try:
+            await session.start(self.helo, self.mail_from)
+            for email in emails:
+                self.stats['rcpt_probes'] += 1
+                code, message = await session.rcpt(email)
+                if code in [250, 251]:
+                    results[email] = (True, "Valid")
+                else:
+                    results[email] = (False, f"SMTP error: {code} {message}")
+
+        except SMTPConnectError:
+            error = (False, "Cannot connect to SMTP server")
+            results.update({email: error for email in emails if email not in results})
+        except ConnectionResetError:
+            error = (False, "SMTP server disconnected")
+            results.update({email: error for email in emails if email not in results})
+        except asyncio.TimeoutError:
+            error = (False, "SMTP timeout")
+            results.update({email: error for email in emails if email not in results})
+        except Exception as e:
+            error = (True, f"SMTP verification unavailable: {str(e)}")
+            results.update({email: error for email in emails if email not in results})
+        finally:
+            await session.close()
+
+        return results
+
+    async def _verify_host(self, mx_host: str, emails: List[str]) -> Dict[str, SMTPResult]:
+        semaphore = asyncio.Semaphore(self.per_host_concurrency)
+        step = self.max_rcpt_per_session
+
+        async def run(batch: List[str]) -> Dict[str, SMTPResult]:
+            async with semaphore:
+                return await self._probe_session(mx_host, batch)
+
+        results: Dict[str, SMTPResult] = {}
+        batches = [emails[i:i + step] for i in range(0, len(emails), step)]
+        for batch_results in await asyncio.gather(*(run(batch) for batch in batches)):
+            results.update(batch_results)
+        return results
+
+    async def verify_many(self, emails: Iterable[str]) -> Dict[str, SMTPResult]:
+        """Verify addresses, returns {email: (is_valid, message)}"""
+        emails = list(dict.fromkeys(emails))
+        results: Dict[str, SMTPResult] = {}
+
+        domains = sorted({email.split('@')[1].lower() for email in emails if '@' in email})
+        mx_answers = await asyncio.gather(*(self.mx_resolver(domain) for domain in domains))
+        mx_by_domain = dict(zip(domains, mx_answers))
+
+        by_host: Dict[str, List[str]] = defaultdict(list)
+        for email in emails:
+            if '@' not in email:
+                results[email] = (False, "Invalid email format")
+                continue
+            has_mx, mx_host = mx_by_domain[email.split('@')[1].lower()]
+            if not has_mx or not mx_host:
+                results[email] = (False, "No MX records found")
+                continue
+            by_host[mx_host].append(email)
+
+        host_results = await asyncio.gather(
+            *(self._verify_host(host, group) for host, group in by_host.items())
+        )
+        for host_result in host_results:
+            results.update(host_result)
+
+        return results
+
+    def verify_many_sync(self, emails: Iterable[str]) -> Dict[str, SMTPResult]:
+        """
+        Blocking wrapper for sync callers
+        From inside a running event loop the probes run on a helper thread
+        """
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(self.verify_many(emails))
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            return executor.submit(asyncio.run, self.verify_many(emails)).result()
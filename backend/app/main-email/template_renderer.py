@@ -0,0 +1,114 @@
+"""
+Compiled campaign templates
+A template is split once into literal and {{variable}} segments; rendering a
+recipient is a single join over the segments instead of one str.replace per
+variable over the whole body
+"""
+
+import re
+from functools import lru_cache
+from typing import Dict, Iterable, Iterator, Optional
+
+PLACEHOLDER_REGEX = re.compile(r'\{\{(\w+)\}\}')
+
+
+class CompiledTemplate:
+    """
+    Template as alternating literals and placeholders
+    Placeholders without a value are kept verbatim (same as str.replace)
+    """
+
+    __slots__ = ('source', 'literals', 'fields')
+
+    def __init__(self, source: str):
+        self.source = source
+        self.literals = []
+        self.fields = []  # (variable name, raw placeholder)
+
+        position = 0
+        for match in PLACEHOLDER_REGEX.finditer(source):
+            self.literals.append(source[position:match.start()])
+            self.fields.append((match.group(1), match.group(0)))
+            position = match.end()
+        self.literals.append(source[position:])
+
+    def render(self, values: Dict[str, str]) -> str:
+        if not self.fields:
+            return self.source
+
+        parts = [self.literals[0]]
+        for (name, raw), literal in zip(self.fields, self.literals[1:]):
+            parts.append(values.get(name, raw))
+            parts.append(literal)
+        return ''.join(parts)
+
+
+@lru_cache(maxsize=256)
+def compile_template(source: str) -> CompiledTemplate:
+    """Compile once per distinct template string"""
+    return CompiledTemplate(source)
+
+
+def template_values(
+    full_name: Optional[str] = None,
+    role: Optional[str] = None,
+    company_name: Optional[str] = None
+) -> Dict[str, str]:
+    """
+    Variables available to campaign templates
+    Supports: {{name}} (first name), {{full_name}}, {{role}}, {{company}}
+    """
+    values = {}
+
+    if full_name is not None:
+        name_parts = full_name.split()
+        values['name'] = name_parts[0] if name_parts else full_name
+        values['full_name'] = full_name
+
+        if role:
+            values['role'] = role
+
+    if company_name is not None:
+        values['company'] = company_name
+
+    return values
+
+
+class CampaignRenderer:
+    """Subject and body of a campaign, compiled once for a whole send batch"""
+
+    def __init__(self, subject: str, body: str):
+        self.subject = compile_template(subject)
+        self.body = compile_template(body)
+
+    def render(self, recipient: Dict) -> Dict:
+        """
+        recipient: {email_address, domain, full_name, role, company_name, ...}
+        Returns {recipient, domain, subject, body}
+        """
+        values = template_values(
+            recipient.get('full_name'),
+            recipient.get('role'),
+            recipient.get('company_name')
+        )
+        return {
+            'recipient': recipient,
+            'domain': recipient.get('domain'),
+            'subject': self.subject.render(values),
+            'body': self.body.render(values)
+        }
+
+    def render_batch(self, recipients: Iterable[Dict]) -> Iterator[Dict]:
+        """
+        Lazily render a batch for the sender
+        A recipient that fails to render yields a message with an 'error' key
+        """
+        for recipient in recipients:
+            try:
+                yield self.render(recipient)
+            except Exception as e:
+                yield {
+                    'recipient': recipient,
+                    'domain': recipient.get('domain'),
+                    'error': f"Render failed: {str(e)}"
+                }
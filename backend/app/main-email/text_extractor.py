@@ -0,0 +1,240 @@
+"""
+Single-pass email / role extraction over page text
+- every email span of a page is found once (precompiled regex); looking up
+  the emails near a person's name is a bisect over the sorted spans
+- role mentions are found with one automaton pass over the role vocabulary
+  (Aho-Corasick via pyahocorasick when installed, otherwise one compiled
+  alternation) instead of one regex search per role pattern
+Hits carry positions in the page text so people, roles and emails can be
+matched by interval
+"""
+
+import re
+from bisect import bisect_left, bisect_right
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from email_validator import normalize_role, is_allowed_role
+
+try:
+    import ahocorasick
+except ImportError:  # optional C automaton
+    ahocorasick = None
+
+EMAIL_REGEX = re.compile(r'\b[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}\b')
+
+# Characters around a person's name searched for their email
+EMAIL_WINDOW = 500
+
+# Role vocabulary (must match DECISION_MAKER_ROLES), one group per role in
+# priority order. Phrases are lowercase with single spaces
+ROLE_PHRASES: Tuple[Tuple[str, ...], ...] = (
+    ('founder', 'co-founder', 'cofounder'),
+    ('ceo', 'chief executive officer'),
+    ('cto', 'chief technology officer'),
+    ('cfo', 'chief financial officer'),
+    ('coo', 'chief operating officer'),
+    ('chief product officer', 'cpo'),
+    ('head of engineering',),
+    ('vp engineering', 'vp of engineering', 'vice president engineering'),
+    ('engineering manager',),
+    ('staff engineer',),
+    ('principal engineer',),
+    ('founding engineer',),
+    ('platform lead',),
+    ('infrastructure lead',),
+    ('head of product',),
+    ('vp product', 'vp of product'),
+    ('growth lead', 'head of growth'),
+    ('vp sales', 'vp of sales', 'head of sales'),
+    ('agency owner',),
+    ('partner',),
+    ('hr lead', 'head of hr', 'head of people'),
+)
+
+WHITESPACE_RUN = re.compile(r'\s+')
+MULTI_WHITESPACE = re.compile(r'\s{2,}')
+
+
+class EmailHit(NamedTuple):
+    start: int
+    end: int
+    email: str
+
+
+class RoleHit(NamedTuple):
+    start: int
+    end: int
+    phrase: str
+    group: int             # index into ROLE_PHRASES (lower = higher priority)
+    role: Optional[str]    # normalized, allowed decision-maker role or None
+
+
+def _is_word_char(ch: str) -> bool:
+    return ch.isalnum() or ch == '_'
+
+
+def lower_same_length(text: str) -> str:
+    """
+    text.lower(), except that a character whose lowercase is longer (e.g.
+    'İ' -> 'i̇') keeps only its first lowercase character, so offsets in the
+    result are offsets in text
+    """
+    lowered = text.lower()
+    if len(lowered) == len(text):
+        return lowered
+    return ''.join(ch.lower()[0] for ch in text)
+
+
+class RoleMatcher:
+    """Finds every role phrase of the vocabulary in a text in one pass"""
+
+    def __init__(self, phrase_groups: Tuple[Tuple[str, ...], ...] = ROLE_PHRASES):
+        self._phrases: Dict[str, Tuple[int, Optional[str]]] = {}
+        for group, phrases in enumerate(phrase_groups):
+            for phrase in phrases:
+                role = normalize_role(phrase)
+                self._phrases[phrase] = (group, role if role and is_allowed_role(role) else None)
+
+        if ahocorasick is not None:
+            self._automaton = ahocorasick.Automaton()
+            for phrase in self._phrases:
+                self._automaton.add_word(phrase, phrase)
+            self._automaton.make_automaton()
+            self._regex = None
+        else:
+            self._automaton = None
+            # Lookahead reports a match at every start position (overlaps
+            # included); longest phrases first, any whitespace between words
+            alternation = '|'.join(
+                r'\s+'.join(re.escape(word) for word in phrase.split(' '))
+                for phrase in sorted(self._phrases, key=len, reverse=True)
+            )
+            self._regex = re.compile(rf'(?=\b({alternation})\b)')
+
+    @staticmethod
+    def normalize(text: str) -> str:
+        """Lowercase (same length), whitespace runs collapsed to one space"""
+        return WHITESPACE_RUN.sub(' ', lower_same_length(text))
+
+    def find(self, text: str) -> List[RoleHit]:
+        """All role mentions in text, ordered by start position"""
+        if self._automaton is None:
+            # Scanning lowercased text is much faster than IGNORECASE
+            hits = []
+            for match in self._regex.finditer(lower_same_length(text)):
+                matched = match.group(1)
+                phrase = self.normalize(matched)
+                hits.append(RoleHit(match.start(), match.start() + len(matched), phrase, *self._phrases[phrase]))
+            return hits
+
+        normalized = self.normalize(text)
+        # Map normalized offsets back: lowercasing kept every offset, each
+        # whitespace run of length n shrank to one character
+        run_positions, shifts, shift = [], [], 0
+        for match in MULTI_WHITESPACE.finditer(text):
+            shift += match.end() - match.start() - 1
+            run_positions.append(match.end() - shift)
+            shifts.append(shift)
+
+        def original(position: int) -> int:
+            index = bisect_right(run_positions, position) - 1
+            return position + (shifts[index] if index >= 0 else 0)
+
+        hits = []
+        for end_index, phrase in self._automaton.iter(normalized):
+            start, end = end_index - len(phrase) + 1, end_index + 1
+            if start > 0 and _is_word_char(normalized[start - 1]):
+                continue
+            if end < len(normalized) and _is_word_char(normalized[end]):
+                continue
+            hits.append(RoleHit(original(start), original(end - 1) + 1, phrase, *self._phrases[phrase]))
+        hits.sort()
+        return hits
+
+    def first_role(self, text: str) -> Optional[str]:
+        """
+        Same answer as trying each role pattern in priority order: the
+        earliest mention of the highest-priority group decides (None if that
+        mention does not normalize to an allowed role, then the next group)
+        """
+        first_by_group: Dict[int, RoleHit] = {}
+        for hit in self.find(text):
+            first_by_group.setdefault(hit.group, hit)
+        for group in sorted(first_by_group):
+            role = first_by_group[group].role
+            if role:
+                return role
+        return None
+
+
+# Shared matcher (vocabulary compiled once per process)
+role_matcher = RoleMatcher()
+
+
+class PageTextIndex:
+    """
+    Position index over one page's text: email spans and role mentions,
+    each found in a single pass, plus cached name positions
+    """
+
+    def __init__(self, text: str, text_lower: Optional[str] = None, matcher: RoleMatcher = role_matcher):
+        self.text = text
+        self.text_lower = text_lower if text_lower is not None else text.lower()
+        self.matcher = matcher
+
+        self.emails: List[EmailHit] = [
+            EmailHit(match.start(), match.end(), match.group(0)) for match in EMAIL_REGEX.finditer(text)
+        ]
+        self._email_starts = [hit.start for hit in self.emails]
+        self._email_ends = [hit.end for hit in self.emails]
+
+        self._roles: Optional[List[RoleHit]] = None
+        self._name_positions: Dict[str, int] = {}
+
+    def find_name(self, name: str) -> int:
+        """First position of name (case-insensitive), -1 if absent"""
+        key = name.lower()
+        if key not in self._name_positions:
+            self._name_positions[key] = self.text_lower.find(key)
+        return self._name_positions[key]
+
+    def emails_in_window(self, start: int, end: int) -> List[str]:
+        """
+        Emails found in text[start:end], identical to running EMAIL_REGEX on
+        that slice: whole spans come from the index, a span cut by the end of
+        the window is re-matched on its clipped part
+        """
+        start = max(0, start)
+        end = min(len(self.text), end)
+        if start >= end:
+            return []
+
+        # Spans ending after `start` and starting before `end`
+        first = bisect_right(self._email_ends, start)
+        last = bisect_left(self._email_starts, end)
+        if first < last and self.emails[first].start < start:
+            # A span cut by the window start can re-match differently; rare
+            return EMAIL_REGEX.findall(self.text[start:end])
+
+        emails = []
+        for hit in self.emails[first:last]:
+            if hit.end <= end:
+                emails.append(hit.email)
+            else:
+                emails.extend(EMAIL_REGEX.findall(self.text[hit.start:end]))
+        return emails
+
+    def emails_near(self, position: int, radius: int = EMAIL_WINDOW) -> List[str]:
+        return self.emails_in_window(position - radius, position + radius)
+
+    @property
+    def roles(self) -> List[RoleHit]:
+        """Role mentions with positions in the page text"""
+        if self._roles is None:
+            self._roles = self.matcher.find(self.text)
+        return self._roles
+
+    def roles_in_window(self, start: int, end: int) -> List[RoleHit]:
+        roles = self.roles
+        starts = [hit.start for hit in roles]
+        return roles[bisect_left(starts, max(0, start)):bisect_left(starts, end)]
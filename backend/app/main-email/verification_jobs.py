@@ -0,0 +1,270 @@
+"""
+Bulk email verification job runner
+Runs an EmailVerificationJob with its own session:
+- companies and people prefetched (no per-email queries)
+- each chunk validated concurrently in a thread pool
+- one bulk UPDATE + job counters per chunk, in a single commit
+- live progress served from memory
+- current_email_index marks the next unverified email, so an interrupted
+  job resumes where its last committed chunk ended
+"""
+
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from database import (
+    SessionLocal, Company, Person, Email, EmailVerificationJob,
+    EmailStatus, EmailDiscoveryStatus, VerificationStatus
+)
+from email_validator import validate_email_full, verify_smtp_batch
+
+VERIFY_CHUNK_SIZE = int(os.getenv("VERIFY_CHUNK_SIZE", "100"))
+VERIFY_WORKERS = int(os.getenv("VERIFY_WORKERS", "8"))
+VERIFY_RESUME_ON_STARTUP = os.getenv("VERIFY_RESUME_ON_STARTUP", "false").lower() == "true"
+
+
+class JobProgressRegistry:
+    """In-memory progress of jobs running in this process"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._jobs: Dict[int, Dict] = {}
+
+    def start(self, job: EmailVerificationJob) -> bool:
+        """Register a job; False if it is already running here"""
+        with self._lock:
+            current = self._jobs.get(job.id)
+            if current and current['status'] == 'running':
+                return False
+            self._jobs[job.id] = {
+                'status': 'running',
+                'total_emails': job.total_emails or 0,
+                'verified_count': job.verified_count or 0,
+                'valid_count': job.valid_count or 0,
+                'invalid_count': job.invalid_count or 0,
+                'risky_count': job.risky_count or 0
+            }
+            return True
+
+    def record(self, job_id: int, outcome: str):
+        """Count one verified email (outcome: valid/invalid/risky)"""
+        with self._lock:
+            progress = self._jobs[job_id]
+            progress['verified_count'] += 1
+            progress[f'{outcome}_count'] += 1
+
+    def finish(self, job_id: int):
+        """Stop tracking; once a job ends its row is authoritative"""
+        with self._lock:
+            self._jobs.pop(job_id, None)
+
+    def get(self, job_id: int) -> Optional[Dict]:
+        with self._lock:
+            progress = self._jobs.get(job_id)
+            if not progress:
+                return None
+            progress = dict(progress)
+        total = progress['total_emails']
+        progress['progress_percentage'] = (
+            min(100, int(progress['verified_count'] / total * 100)) if total else 0
+        )
+        return progress
+
+
+job_progress = JobProgressRegistry()
+
+
+def _outcome(validation: Dict) -> str:
+    if not validation['is_valid']:
+        return 'invalid'
+    if validation['verification_status'] == VerificationStatus.VALID:
+        return 'valid'
+    return 'risky'
+
+
+class EmailVerificationJobRunner:
+    """Verifies the emails of one EmailVerificationJob"""
+
+    def __init__(
+        self,
+        job_id: int,
+        chunk_size: int = VERIFY_CHUNK_SIZE,
+        max_workers: int = VERIFY_WORKERS
+    ):
+        self.job_id = job_id
+        self.chunk_size = max(1, chunk_size)
+        self.max_workers = max(1, max_workers)
+
+    def _prefetch_company_domains(self, db, email_ids: List[int]) -> Dict[int, str]:
+        """company_id -> domain for every email of the job, one query"""
+        rows = db.query(Company.id, Company.domain).filter(
+            Company.id.in_(
+                db.query(Email.company_id).filter(Email.id.in_(email_ids))
+            )
+        ).all()
+        return {company_id: domain for company_id, domain in rows}
+
+    def _load_chunk(self, db, chunk_ids: List[int]) -> List:
+        """Email fields needed for validation, with the person's role confidence"""
+        rows = db.query(
+            Email.id,
+            Email.email_address,
+            Email.company_id,
+            Email.discovery_method,
+            Person.id,
+            Person.role_confidence
+        ).outerjoin(Person, Email.person_id == Person.id).filter(
+            Email.id.in_(chunk_ids),
+            Email.discovery_status == EmailDiscoveryStatus.VALIDATED
+        ).all()
+
+        # Keep the job's email order
+        by_id = {row[0]: row for row in rows}
+        return [by_id[email_id] for email_id in chunk_ids if email_id in by_id]
+
+    def _validate_chunk(
+        self,
+        job: EmailVerificationJob,
+        rows: List,
+        company_domains: Dict[int, str],
+        executor: ThreadPoolExecutor
+    ) -> List[Dict]:
+        smtp_results = {}
+        if job.check_smtp and rows:
+            smtp_results = verify_smtp_batch([row[1] for row in rows])
+
+        def validate(row):
+            _, email_address, company_id, discovery_method, person_id, role_confidence = row
+            validation = validate_email_full(
+                email_address,
+                company_domains.get(company_id),
+                role_confidence=(
+                    role_confidence if person_id is not None and role_confidence is not None else 1.0
+                ),
+                discovery_method=discovery_method,
+                check_mx=job.check_mx,
+                check_smtp=job.check_smtp,
+                smtp_result=smtp_results.get(email_address)
+            )
+            job_progress.record(job.id, _outcome(validation))
+            return validation
+
+        return list(executor.map(validate, rows))
+
+    def _write_chunk(self, db, job: EmailVerificationJob, rows: List, validations: List[Dict], next_index: int):
+        """Bulk update emails and job counters in one commit"""
+        now = datetime.utcnow()
+        mappings = []
+
+        for row, validation in zip(rows, validations):
+            mapping = {
+                'id': row[0],
+                'quality_score': validation['quality_score'],
+                'confidence_score': validation['confidence_score'],
+                'confidence_level': validation['confidence_level'],
+                'is_validated': True,
+                'mx_valid': validation['mx_valid'],
+                'is_disposable': validation['is_disposable'],
+                'is_role_email': validation['is_role_email'],
+                'verification_status': VerificationStatus(validation['verification_status']),
+                'verified_at': now
+            }
+            if job.check_smtp:
+                mapping['smtp_valid'] = validation['smtp_valid']
+
+            outcome = _outcome(validation)
+            if outcome == 'invalid':
+                mapping['status'] = EmailStatus.DELETED
+                mapping['discovery_status'] = EmailDiscoveryStatus.REJECTED_QUALITY
+            setattr(job, f'{outcome}_count', (getattr(job, f'{outcome}_count') or 0) + 1)
+            mappings.append(mapping)
+
+        if mappings:
+            db.bulk_update_mappings(Email, mappings)
+
+        job.verified_count = (job.verified_count or 0) + len(mappings)
+        job.current_email_index = next_index
+        job.progress_percentage = int(next_index / job.total_emails * 100) if job.total_emails else 100
+        db.commit()
+
+    def run(self):
+        db = SessionLocal()
+        job = None
+        tracked = False
+        try:
+            job = db.query(EmailVerificationJob).filter(EmailVerificationJob.id == self.job_id).first()
+            if not job or job.status == 'completed':
+                return
+            if not job_progress.start(job):
+                print(f"[VERIFY] Job {self.job_id} is already running")
+                return
+            tracked = True
+
+            email_ids = json.loads(job.email_ids or "[]")
+            start_index = job.current_email_index or 0
+            if start_index:
+                print(f"[VERIFY] Resuming job {job.id} at email {start_index}/{len(email_ids)}")
+
+            job.status = 'running'
+            job.started_at = job.started_at or datetime.utcnow()
+            db.commit()
+
+            company_domains = self._prefetch_company_domains(db, email_ids[start_index:])
+
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                for chunk_start in range(start_index, len(email_ids), self.chunk_size):
+                    chunk_end = min(chunk_start + self.chunk_size, len(email_ids))
+                    rows = self._load_chunk(db, email_ids[chunk_start:chunk_end])
+                    validations = self._validate_chunk(job, rows, company_domains, executor)
+                    self._write_chunk(db, job, rows, validations, chunk_end)
+
+            job.status = 'completed'
+            job.completed_at = datetime.utcnow()
+            job.progress_percentage = 100
+            db.commit()
+
+        except Exception as e:
+            # Committed chunks stay; the job can be resumed from current_email_index
+            db.rollback()
+            print(f"[VERIFY] Job {self.job_id} failed: {e}")
+            if job is not None:
+                job.status = 'failed'
+                db.commit()
+        finally:
+            if tracked:
+                job_progress.finish(self.job_id)
+            db.close()
+
+
+def run_verification_job(job_id: int, chunk_size: int = VERIFY_CHUNK_SIZE, max_workers: int = VERIFY_WORKERS):
+    """Entry point for BackgroundTasks and resume threads"""
+    EmailVerificationJobRunner(job_id, chunk_size=chunk_size, max_workers=max_workers).run()
+
+
+def get_verification_job_progress(job_id: int) -> Optional[Dict]:
+    """Live progress for a job running in this process (None if not tracked)"""
+    return job_progress.get(job_id)
+
+
+def resume_interrupted_jobs() -> List[int]:
+    """
+    Restart jobs left 'running' or 'pending' by a previous process
+    Only safe when a single API process owns verification jobs
+    """
+    db = SessionLocal()
+    try:
+        job_ids = [
+            job_id for (job_id,) in db.query(EmailVerificationJob.id).filter(
+                EmailVerificationJob.status.in_(['running', 'pending'])
+            ).all()
+        ]
+    finally:
+        db.close()
+
+    for job_id in job_ids:
+        threading.Thread(target=run_verification_job, args=(job_id,), daemon=True).start()
+    return job_ids
@@ -0,0 +1,17 @@
+from datetime import datetime
+
+from sqlalchemy import Column, DateTime, Integer, LargeBinary, String
+
+from app.db.database import Base
+
+
+class EmbeddingCacheEntry(Base):
+    """One embedding per (model, sha256(text)); the vector is packed float32."""
+
+    __tablename__ = "embedding_cache"
+
+    model = Column(String(255), primary_key=True)
+    content_hash = Column(String(64), primary_key=True)
+    dim = Column(Integer, nullable=False)
+    embedding = Column(LargeBinary, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow)
@@ -1,6 +1,7 @@
 from fastapi import APIRouter, Query
 from typing import Optional
 from app.observability.service import get_logs, get_logs_by_platform
+from app.services.embedding_cache import embedding_cache
 
 router = APIRouter(prefix="/logs", tags=["Observability"])
 
@@ -25,6 +26,14 @@ def platform_logs(
     return get_logs_by_platform(platform, limit, status)
 
 
+@router.get("/embedding-cache")
+def embedding_cache_stats():
+    """
+    Embedding cache lookups, memory/table hits, misses and hit rate since startup.
+    """
+    return embedding_cache.stats()
+
+
 @router.get("/health")
 def observability_health():
     """
@@ -0,0 +1,107 @@
+"""
+Benchmark the in-process brand index against pgvector
+numpy float32 / int8: one mat-vec + argpartition over a memory-mapped matrix
+pgvector: ORDER BY embedding <=> q LIMIT k on a partial HNSW index (only with BENCH_DATABASE_URL)
+Also reports int8 recall@k against exact float32 results
+
+Writes to a scratch directory (never RAG_LOCAL_INDEX_DIR)
+Usage: python -m app.scripts.bench_brand_index [chunks] [dim] [queries]
+"""
+import os
+import statistics
+import sys
+import tempfile
+import time
+import uuid
+
+import numpy as np
+
+from app.services.brand_vector_index import BrandVectorIndex
+
+K = 10
+
+
+def timed(run, queries):
+    timings, results = [], []
+    for q in queries:
+        start = time.perf_counter()
+        results.append(run(q))
+        timings.append((time.perf_counter() - start) * 1000)
+    timings.sort()
+    return statistics.median(timings), timings[int(len(timings) * 0.95) - 1], results
+
+
+def pgvector_leg(url: str, vectors, queries):
+    from sqlalchemy import create_engine, text
+
+    def vec(v) -> str:
+        return "[" + ",".join(f"{x:.6f}" for x in v) + "]"
+
+    engine = create_engine(url)
+    brand = str(uuid.uuid4())
+    dim = vectors.shape[1]
+    with engine.begin() as conn:
+        conn.execute(text("CREATE EXTENSION IF NOT EXISTS vector"))
+        conn.execute(text("DROP TABLE IF EXISTS bench_brand_index"))
+        conn.execute(text(f"CREATE TABLE bench_brand_index (id BIGINT PRIMARY KEY, brand_id UUID, content TEXT, embedding vector({dim}))"))
+        for start in range(0, len(vectors), 5000):
+            conn.execute(text(
+                "INSERT INTO bench_brand_index VALUES (:id, :brand, :content, CAST(:embedding AS vector))"
+            ), [{"id": i, "brand": brand, "content": f"chunk {i}", "embedding": vec(vectors[i])}
+                for i in range(start, min(start + 5000, len(vectors)))])
+        conn.execute(text(
+            f"CREATE INDEX ON bench_brand_index USING hnsw (embedding vector_cosine_ops) WHERE brand_id = '{brand}'"
+        ))
+        conn.execute(text("ANALYZE bench_brand_index"))
+
+    with engine.connect() as conn:
+        def run(q):
+            return conn.execute(text(
+                "SELECT id, content FROM bench_brand_index WHERE brand_id = :brand "
+                "ORDER BY embedding <=> CAST(:q AS vector) LIMIT :k"
+            ), {"brand": brand, "q": vec(q), "k": K}).fetchall()
+        p50, p95, _ = timed(run, queries)
+    with engine.begin() as conn:
+        conn.execute(text("DROP TABLE bench_brand_index"))
+    return p50, p95
+
+
+def main():
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    dim = int(sys.argv[2]) if len(sys.argv) > 2 else 1024
+    count = int(sys.argv[3]) if len(sys.argv) > 3 else 200
+
+    rng = np.random.default_rng(5)
+    vectors = rng.standard_normal((total, dim)).astype(np.float32)
+    queries = rng.standard_normal((count, dim)).astype(np.float32)
+    rows = [{"id": str(i), "parent_id": None, "category": None, "title": None, "content": f"chunk {i}"}
+            for i in range(total)]
+
+    scratch = tempfile.mkdtemp()
+    exact = None
+    for dtype in ("float32", "int8"):
+        start = time.perf_counter()
+        index = BrandVectorIndex.create(os.path.join(scratch, dtype), dim, dtype)
+        index.add(rows, vectors)
+        index = BrandVectorIndex.open(index.path)  # measure the memory-mapped path
+        build = time.perf_counter() - start
+
+        p50, p95, results = timed(lambda q: index.search(q, K), queries)
+        ids = [{row["id"] for row, _ in hits} for hits in results]
+        if exact is None:
+            exact = ids
+        recall = statistics.mean(len(a & b) / K for a, b in zip(ids, exact))
+        size = os.path.getsize(index._vector_file) / 2 ** 20
+        print(f"{dtype:>8}: p50 {p50:6.2f} ms  p95 {p95:6.2f} ms  recall@{K} {recall:.3f}  "
+              f"{size:.0f} MiB  (built in {build:.1f}s)")
+
+    url = os.getenv("BENCH_DATABASE_URL")
+    if url:
+        p50, p95 = pgvector_leg(url, vectors, queries)
+        print(f"{'pgvector':>8}: p50 {p50:6.2f} ms  p95 {p95:6.2f} ms")
+    else:
+        print("pgvector: skipped (set BENCH_DATABASE_URL)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""
+Benchmark document embedding against the local fake embedding server
+Before: one blocking requests.post per chunk (old RAGService.add_document)
+After: EmbeddingClient (batches of VOYAGE_BATCH_SIZE, pooled async client, bounded concurrency)
+
+Run from backend/: python -m app.scripts.bench_embedding_client [chunks] [latency_ms]
+"""
+import asyncio
+import sys
+import time
+
+import requests
+
+from app.services.embedding_client import EmbeddingClient, VoyageBackend
+from app.services.fake_embedding_server import FakeEmbeddingServer
+
+
+def per_chunk(url: str, chunks):
+    """Previous loop: one request (and connection) per chunk"""
+    vectors = []
+    for chunk in chunks:
+        response = requests.post(url, json={"model": "bench", "input": chunk})
+        response.raise_for_status()
+        vectors.append(response.json()["data"][0]["embedding"])
+    return vectors
+
+
+async def batched(url: str, chunks):
+    client = EmbeddingClient(VoyageBackend(api_key="bench", model="bench", url=url))
+    try:
+        return await client.embed(chunks), client.stats
+    finally:
+        await client.aclose()
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    latency = (float(sys.argv[2]) if len(sys.argv) > 2 else 50) / 1000
+    chunks = [f"chunk {i}: " + "lorem ipsum dolor sit amet " * 60 for i in range(count)]
+
+    with FakeEmbeddingServer(latency=latency) as server:
+        start = time.perf_counter()
+        old = per_chunk(server.url, chunks)
+        print(f"  per-chunk: {time.perf_counter() - start:6.2f}s  {server.stats['requests']} requests")
+
+        server.stats["requests"] = 0
+        start = time.perf_counter()
+        new, stats = asyncio.run(batched(server.url, chunks))
+        print(f"    batched: {time.perf_counter() - start:6.2f}s  {server.stats['requests']} requests"
+              f"  ({stats['batches']} batches)")
+
+    print("same vectors:", old == new)
+
+
+if __name__ == "__main__":
+    main()
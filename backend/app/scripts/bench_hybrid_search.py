@@ -0,0 +1,157 @@
+"""
+Benchmark hybrid (full-text + vector) chunk retrieval on a seeded table
+Vector: ORDER BY embedding <=> q LIMIT k on a partial HNSW index, 0.7 threshold
+        (get_context_for_generation before hybrid retrieval)
+Lexical: OR tsquery over the GIN-indexed chunk tsvector, ranked by ts_rank_cd
+Hybrid: both legs on separate connections at once, fused by reciprocal rank
+
+Queries are short "<topic> content" strings whose embeddings sit near, but
+mostly under 0.7 from, their topic's chunks, as daily_content_generation
+issues them. Reports latency and how often each path returns no context.
+
+Needs Postgres with pgvector: BENCH_DATABASE_URL=postgresql://... (sync driver)
+Seeds its own bench_hybrid_documents table (never touches documents)
+Usage: python -m app.scripts.bench_hybrid_search [chunks] [dim] [queries]
+"""
+import os
+import statistics
+import sys
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+from sqlalchemy import create_engine, text
+
+TABLE = "bench_hybrid_documents"
+K = 10
+THRESHOLD = 0.7
+MIN_SIMILARITY = 0.3
+RRF_K = 60
+TOPICS = ["newsletter", "linkedin", "launch", "pricing", "hiring", "webinar", "roadmap", "security"]
+FILLER = "brand voice audience story update team product customer insight week".split()
+
+
+def vec(v) -> str:
+    return "[" + ",".join(f"{x:.6f}" for x in v) + "]"
+
+
+def noisy(rng, center, noise: float):
+    v = center + rng.standard_normal(center.shape).astype(np.float32) * noise
+    return v / np.linalg.norm(v)
+
+
+def seed(conn, brand: str, total: int, dim: int, centers, rng):
+    conn.execute(text("CREATE EXTENSION IF NOT EXISTS vector"))
+    conn.execute(text(f"DROP TABLE IF EXISTS {TABLE}"))
+    conn.execute(text(
+        f"CREATE TABLE {TABLE} (id BIGSERIAL PRIMARY KEY, brand_id UUID NOT NULL, is_chunk BOOLEAN NOT NULL, "
+        f"chunk_text TEXT, content TEXT, embedding vector({dim}))"
+    ))
+    noise = 0.75 / np.sqrt(dim)  # cosine ~0.8 to the topic centre
+    for start in range(0, total, 5000):
+        rows = []
+        for i in range(start, min(start + 5000, total)):
+            topic = i % len(TOPICS)
+            words = list(rng.choice(FILLER, 40)) + [TOPICS[topic]] * 2
+            rng.shuffle(words)
+            rows.append({"brand": brand, "chunk": " ".join(words),
+                         "embedding": vec(noisy(rng, centers[topic], noise))})
+        conn.execute(text(
+            f"INSERT INTO {TABLE} (brand_id, is_chunk, chunk_text, content, embedding) "
+            f"VALUES (:brand, true, :chunk, :chunk, CAST(:embedding AS vector))"
+        ), rows)
+    conn.execute(text(
+        f"CREATE INDEX ON {TABLE} USING hnsw (embedding vector_cosine_ops) WHERE brand_id = '{brand}'"
+    ))
+    conn.execute(text(
+        f"CREATE INDEX ON {TABLE} USING gin (to_tsvector('english'::regconfig, COALESCE(chunk_text, content))) "
+        f"WHERE is_chunk = true"
+    ))
+    conn.execute(text(f"ANALYZE {TABLE}"))
+
+
+def vector_leg(conn, brand: str, q: str, threshold: float):
+    rows = conn.execute(text(
+        f"SELECT id, embedding <=> CAST(:q AS vector) AS distance FROM {TABLE} "
+        f"WHERE brand_id = :brand AND is_chunk = true ORDER BY embedding <=> CAST(:q AS vector) LIMIT :k"
+    ), {"q": q, "brand": brand, "k": K * 2}).fetchall()
+    return [row.id for row in rows if 1 - row.distance >= threshold]
+
+
+def lexical_leg(conn, brand: str, query: str):
+    terms = " | ".join(dict.fromkeys(query.lower().split()))
+    tsvector = "to_tsvector('english'::regconfig, COALESCE(chunk_text, content))"
+    tsquery = "to_tsquery('english'::regconfig, :terms)"
+    rows = conn.execute(text(
+        f"SELECT id FROM {TABLE} WHERE brand_id = :brand AND is_chunk = true AND {tsvector} @@ {tsquery} "
+        f"ORDER BY ts_rank_cd({tsvector}, {tsquery}) DESC LIMIT :k"
+    ), {"terms": terms, "brand": brand, "k": K * 2}).fetchall()
+    return [row.id for row in rows]
+
+
+def fuse(*legs):
+    scores = {}
+    for ids in legs:
+        for rank, doc_id in enumerate(ids, start=1):
+            scores[doc_id] = scores.get(doc_id, 0.0) + 1.0 / (RRF_K + rank)
+    return sorted(scores, key=scores.get, reverse=True)[:K]
+
+
+def report(label: str, timings, empty: int, count: int):
+    timings.sort()
+    print(f"{label:>18}: p50 {statistics.median(timings):7.2f} ms  "
+          f"p95 {timings[int(len(timings) * 0.95) - 1]:7.2f} ms  no context {empty}/{count}")
+
+
+def main():
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    dim = int(sys.argv[2]) if len(sys.argv) > 2 else 384
+    count = int(sys.argv[3]) if len(sys.argv) > 3 else 100
+
+    url = os.getenv("BENCH_DATABASE_URL")
+    if not url:
+        sys.exit("Set BENCH_DATABASE_URL to a Postgres database with pgvector")
+    engine = create_engine(url, pool_size=2)
+    rng = np.random.default_rng(13)
+    centers = rng.standard_normal((len(TOPICS), dim)).astype(np.float32)
+    centers /= np.linalg.norm(centers, axis=1, keepdims=True)
+    brand = str(uuid.uuid4())
+
+    start = time.perf_counter()
+    with engine.begin() as conn:
+        seed(conn, brand, total, dim, centers, rng)
+    print(f"seeded {total} chunks (dim {dim}) in {time.perf_counter() - start:.0f}s")
+
+    queries = []
+    for i in range(count):
+        topic = i % len(TOPICS)
+        queries.append((f"{TOPICS[topic]} content", vec(noisy(rng, centers[topic], 0.85 / np.sqrt(dim)))))
+
+    with engine.connect() as vector_conn, engine.connect() as lexical_conn, ThreadPoolExecutor(2) as pool:
+        runs = {
+            "vector, 0.7 cutoff": lambda query, q: vector_leg(vector_conn, brand, q, THRESHOLD),
+            "lexical": lambda query, q: lexical_leg(lexical_conn, brand, query),
+            "hybrid, serial": lambda query, q: fuse(
+                vector_leg(vector_conn, brand, q, MIN_SIMILARITY), lexical_leg(lexical_conn, brand, query)
+            ),
+            "hybrid, concurrent": lambda query, q: fuse(*[f.result() for f in (
+                pool.submit(vector_leg, vector_conn, brand, q, MIN_SIMILARITY),
+                pool.submit(lexical_leg, lexical_conn, brand, query),
+            )]),
+        }
+        for label, run in runs.items():
+            timings, empty = [], 0
+            for query, q in queries:
+                start = time.perf_counter()
+                hits = run(query, q)
+                timings.append((time.perf_counter() - start) * 1000)
+                empty += not hits
+            report(label, timings, empty, count)
+
+    with engine.begin() as conn:
+        conn.execute(text(f"DROP TABLE {TABLE}"))
+
+
+if __name__ == "__main__":
+    main()
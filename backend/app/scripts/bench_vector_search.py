@@ -0,0 +1,116 @@
+"""
+Benchmark RAG chunk retrieval on a seeded pgvector table
+Before: WHERE 1 - (embedding <=> q) >= threshold ORDER BY similarity (exact scan),
+        then one SELECT per hit (old search_similar_documents)
+After: ORDER BY embedding <=> q LIMIT k on the brand's partial HNSW index,
+       chunk columns in the same query, threshold applied to the top-k
+
+Needs Postgres with pgvector: BENCH_DATABASE_URL=postgresql://... (sync driver)
+Seeds its own bench_rag_documents table (never touches documents)
+Usage: python -m app.scripts.bench_vector_search [chunks] [brands] [dim] [queries]
+"""
+import os
+import statistics
+import sys
+import time
+import uuid
+
+import numpy as np
+from sqlalchemy import create_engine, text
+
+TABLE = "bench_rag_documents"
+K = 10
+THRESHOLD = 0.7
+
+
+def vec(v) -> str:
+    return "[" + ",".join(f"{x:.6f}" for x in v) + "]"
+
+
+def seed(conn, total: int, brands, dim: int):
+    rng = np.random.default_rng(7)
+    conn.execute(text("CREATE EXTENSION IF NOT EXISTS vector"))
+    conn.execute(text(f"DROP TABLE IF EXISTS {TABLE}"))
+    conn.execute(text(f"""
+        CREATE TABLE {TABLE} (
+            id BIGSERIAL PRIMARY KEY, brand_id UUID NOT NULL, is_chunk BOOLEAN NOT NULL,
+            category TEXT, title TEXT, chunk_text TEXT, content TEXT, full_text TEXT,
+            embedding vector({dim})
+        )"""))
+    batch = 5000
+    for start in range(0, total, batch):
+        n = min(batch, total - start)
+        vectors = rng.standard_normal((n, dim)).astype(np.float32)
+        vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+        conn.execute(text(
+            f"INSERT INTO {TABLE} (brand_id, is_chunk, category, title, chunk_text, content, full_text, embedding) "
+            f"VALUES (:brand_id, true, :category, :title, :chunk, :chunk, :full_text, CAST(:embedding AS vector))"
+        ), [
+            {"brand_id": str(brands[(start + i) % len(brands)]), "category": f"cat{(start + i) % 5}",
+             "title": f"Chunk {start + i}", "chunk": "lorem ipsum " * 60, "full_text": "lorem ipsum " * 2000,
+             "embedding": vec(vectors[i])}
+            for i in range(n)
+        ])
+    for brand in brands:
+        conn.execute(text(
+            f"CREATE INDEX ON {TABLE} USING hnsw (embedding vector_cosine_ops) "
+            f"WITH (m = 16, ef_construction = 64) WHERE brand_id = '{brand}'"
+        ))
+    conn.execute(text(f"ANALYZE {TABLE}"))
+
+
+def legacy(conn, brand, q: str):
+    rows = conn.execute(text(f"""
+        SELECT id, 1 - (embedding <=> :q) AS similarity FROM {TABLE}
+        WHERE brand_id = :brand AND is_chunk = true AND (1 - (embedding <=> :q)) >= :threshold
+        ORDER BY similarity DESC LIMIT :k
+    """), {"q": q, "brand": str(brand), "threshold": THRESHOLD, "k": K}).fetchall()
+    return [conn.execute(text(f"SELECT * FROM {TABLE} WHERE id = :id"), {"id": row.id}).first() for row in rows]
+
+
+def single_query(conn, brand, q: str):
+    rows = conn.execute(text(f"""
+        SELECT id, title, category, chunk_text, content, embedding <=> CAST(:q AS vector) AS distance
+        FROM {TABLE} WHERE brand_id = :brand AND is_chunk = true
+        ORDER BY embedding <=> CAST(:q AS vector) LIMIT :k
+    """), {"q": q, "brand": str(brand), "k": K}).fetchall()
+    return [row for row in rows if 1 - row.distance >= THRESHOLD]
+
+
+def main():
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    brand_count = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    dim = int(sys.argv[3]) if len(sys.argv) > 3 else 384
+    queries = int(sys.argv[4]) if len(sys.argv) > 4 else 50
+
+    url = os.getenv("BENCH_DATABASE_URL")
+    if not url:
+        sys.exit("Set BENCH_DATABASE_URL to a Postgres database with pgvector")
+    engine = create_engine(url)
+    brands = [uuid.uuid4() for _ in range(brand_count)]
+
+    start = time.perf_counter()
+    with engine.begin() as conn:
+        seed(conn, total, brands, dim)
+    print(f"seeded {total} chunks / {brand_count} brands (dim {dim}) in {time.perf_counter() - start:.0f}s")
+
+    rng = np.random.default_rng(11)
+    with engine.connect() as conn:
+        for label, run in (("threshold + N+1", legacy), ("top-k on HNSW", single_query)):
+            timings = []
+            for i in range(queries):
+                q = rng.standard_normal(dim).astype(np.float32)
+                q = vec(q / np.linalg.norm(q))
+                start = time.perf_counter()
+                run(conn, brands[i % brand_count], q)
+                timings.append((time.perf_counter() - start) * 1000)
+            timings.sort()
+            print(f"{label:>16}: p50 {statistics.median(timings):8.1f} ms  "
+                  f"p95 {timings[int(len(timings) * 0.95) - 1]:8.1f} ms")
+
+    with engine.begin() as conn:
+        conn.execute(text(f"DROP TABLE {TABLE}"))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,435 @@
+# app/services/brand_vector_index.py
+"""
+In-process vector index per brand, for small brands and offline use.
+
+Each brand's chunk vectors live in one contiguous, L2-normalised matrix on
+disk (float32, or int8 with a per-row scale), memory-mapped read-only.
+Top-k is one matrix-vector product plus argpartition. Chunk text and ids
+sit beside it in rows.jsonl, so a search needs no database round trip.
+
+Layout of RAG_LOCAL_INDEX_DIR/<brand_id>/:
+  meta.json     dim, dtype, model
+  vectors.f32   n x dim float32      (dtype float32)
+  vectors.i8    n x dim int8         (dtype int8)
+  scales.f32    n float32 row scales (dtype int8)
+  rows.jsonl    {"id", "parent_id", "category", "title", "content"} per row
+  deleted.json  row positions removed since the last compaction
+
+add() appends to the files and remaps; remove() tombstones rows and
+compacts once a quarter of them are dead. API workers share the
+directory: writes hold an exclusive lock on <brand_id>.lock beside it,
+and an index reloads when another process has changed rows.jsonl or
+deleted.json (get_brand_index checks on every lookup).
+
+Chunks written or deleted without going through RAGService (seed ingest,
+raw SQL) are caught by RAGService._local_index, which compares the live
+row count with Postgres every RAG_LOCAL_INDEX_CHECK_INTERVAL seconds and
+rebuilds on a mismatch or when the embedding model changed.
+"""
+import json
+import os
+import shutil
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+import numpy as np
+
+from app.core.config import settings
+
+COMPACT_RATIO = 0.25
+INT8_BLOCK_ROWS = 8192
+
+
+@contextmanager
+def _exclusive(lock_path: str):
+    """Cross-process exclusive lock held for the duration of the block."""
+    with open(lock_path, "a+b") as f:
+        if fcntl is not None:
+            fcntl.flock(f, fcntl.LOCK_EX)
+        else:
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f, fcntl.LOCK_UN)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+class BrandVectorIndex:
+    """Memory-mapped top-k index over one brand's chunks."""
+
+    def __init__(self, path: str, dim: int, dtype: str = "float32", model: Optional[str] = None):
+        if dtype not in ("float32", "int8"):
+            raise ValueError(f"Unsupported index dtype: {dtype}")
+        self.path = path
+        self.dim = dim
+        self.dtype = dtype
+        self.model = model
+        self.rows: List[Dict] = []
+        self._deleted: Set[int] = set()
+        self._matrix = np.empty((0, dim), dtype=np.int8 if dtype == "int8" else np.float32)
+        self._scales = np.empty(0, dtype=np.float32)
+        self._categories = np.empty(0, dtype=object)
+        self._lock = threading.Lock()
+        self._signature: Optional[Tuple] = None
+        self.checked_at = float("-inf")  # last row count check against Postgres
+
+    # -------------------- Files --------------------
+    def _file(self, name: str) -> str:
+        return os.path.join(self.path, name)
+
+    @staticmethod
+    def lock_path(path: str) -> str:
+        # Beside the directory, so it survives create()'s rmtree
+        return path.rstrip(os.sep) + ".lock"
+
+    def _file_lock(self):
+        return _exclusive(self.lock_path(self.path))
+
+    def _current_signature(self) -> Optional[Tuple]:
+        """Identity of the on-disk state; None once the directory is gone."""
+        try:
+            return tuple(
+                (st.st_ino, st.st_size, st.st_mtime_ns)
+                for st in (os.stat(self._file("rows.jsonl")), os.stat(self._file("deleted.json")))
+            )
+        except FileNotFoundError:
+            return None
+
+    @property
+    def _vector_file(self) -> str:
+        return self._file("vectors.i8" if self.dtype == "int8" else "vectors.f32")
+
+    def _map(self):
+        n = len(self.rows)
+        self._categories = np.array([row.get("category") for row in self.rows], dtype=object)
+        if n == 0:
+            self._matrix = np.empty((0, self.dim), dtype=self._matrix.dtype)
+            self._scales = np.empty(0, dtype=np.float32)
+            return
+        self._matrix = np.memmap(self._vector_file, dtype=self._matrix.dtype, mode="r", shape=(n, self.dim))
+        if self.dtype == "int8":
+            self._scales = np.memmap(self._file("scales.f32"), dtype=np.float32, mode="r", shape=(n,))
+
+    @staticmethod
+    def _replace(name: str, data: bytes):
+        tmp = name + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, name)
+
+    def _write_meta(self):
+        with open(self._file("meta.json"), "w") as f:
+            json.dump({"dim": self.dim, "dtype": self.dtype, "model": self.model}, f)
+
+    def _write_deleted(self):
+        self._replace(self._file("deleted.json"), json.dumps(sorted(self._deleted)).encode())
+
+    @classmethod
+    def create(cls, path: str, dim: int, dtype: str = "float32", model: Optional[str] = None) -> "BrandVectorIndex":
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with _exclusive(cls.lock_path(path)):
+            return cls._create(path, dim, dtype, model)
+
+    @classmethod
+    def open(cls, path: str) -> Optional["BrandVectorIndex"]:
+        if not os.path.exists(os.path.join(path, "meta.json")):
+            return None
+        with _exclusive(cls.lock_path(path)):
+            return cls._open(path)
+
+    @classmethod
+    def _create(cls, path: str, dim: int, dtype: str, model: Optional[str]) -> "BrandVectorIndex":
+        """Empty index files at path (file lock held)."""
+        shutil.rmtree(path, ignore_errors=True)
+        os.makedirs(path)
+        index = cls(path, dim, dtype, model)
+        index._write_meta()
+        for name in (index._vector_file, index._file("rows.jsonl")) + ((index._file("scales.f32"),) if dtype == "int8" else ()):
+            open(name, "wb").close()
+        index._write_deleted()
+        index._signature = index._current_signature()
+        return index
+
+    @classmethod
+    def _open(cls, path: str) -> Optional["BrandVectorIndex"]:
+        """Load the index at path, None if there is none (file lock held)."""
+        try:
+            with open(os.path.join(path, "meta.json")) as f:
+                meta = json.load(f)
+        except FileNotFoundError:
+            return None
+        index = cls(path, meta["dim"], meta["dtype"], meta.get("model"))
+        index._load()
+        return index
+
+    def _load(self):
+        """Read rows and tombstones and remap (file lock held)."""
+        with open(self._file("rows.jsonl")) as f:
+            rows = [json.loads(line) for line in f if line.strip()]
+        with open(self._file("deleted.json")) as f:
+            deleted = set(json.load(f))
+        with self._lock:
+            self.rows, self._deleted = rows, deleted
+            self._map()
+            self._signature = self._current_signature()
+
+    def _sync(self) -> bool:
+        """Reload if the files changed (file lock held); False if dropped."""
+        signature = self._current_signature()
+        if signature is None:
+            return False
+        if signature != self._signature:
+            self._load()
+        return True
+
+    def refresh(self) -> bool:
+        """
+        Pick up another process's writes (one stat per file when nothing
+        changed); False once the index directory has been removed.
+        """
+        signature = self._current_signature()
+        if signature is None:
+            return False
+        if signature == self._signature:
+            return True
+        try:
+            with self._file_lock():
+                return self._sync()
+        except FileNotFoundError:
+            return False
+
+    # -------------------- Updates --------------------
+    def _encode(self, vectors) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+        matrix = np.asarray(vectors, dtype=np.float32).reshape(-1, self.dim)
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        matrix = matrix / norms
+        if self.dtype == "float32":
+            return np.ascontiguousarray(matrix), None
+        scales = np.abs(matrix).max(axis=1) / 127.0
+        scales[scales == 0] = 1.0
+        return np.round(matrix / scales[:, None]).astype(np.int8), scales.astype(np.float32)
+
+    def add(self, rows: List[Dict], vectors) -> int:
+        """Append chunks (rows as in rows.jsonl, vectors n x dim)."""
+        if not rows:
+            return 0
+        with self._file_lock():
+            # Append after whatever other processes have written
+            if not self._sync():
+                return 0
+            self._append(rows, vectors)
+        return len(rows)
+
+    def _append(self, rows: List[Dict], vectors):
+        """Write rows and vectors at the end of the files (file lock held)."""
+        matrix, scales = self._encode(vectors)
+        with self._lock:
+            with open(self._vector_file, "ab") as f:
+                f.write(matrix.tobytes())
+            if scales is not None:
+                with open(self._file("scales.f32"), "ab") as f:
+                    f.write(scales.tobytes())
+            with open(self._file("rows.jsonl"), "a") as f:
+                for row in rows:
+                    f.write(json.dumps(row) + "\n")
+            self.rows = self.rows + rows
+            self._map()
+            self._signature = self._current_signature()
+
+    def remove(self, document_ids: Iterable) -> int:
+        """Tombstone chunks whose id or parent id is in document_ids."""
+        ids = {str(i) for i in document_ids}
+        with self._file_lock():
+            if not self._sync():
+                return 0
+            with self._lock:
+                dead = {
+                    pos for pos, row in enumerate(self.rows)
+                    if pos not in self._deleted and (str(row["id"]) in ids or str(row.get("parent_id")) in ids)
+                }
+                if not dead:
+                    return 0
+                self._deleted = self._deleted | dead
+                self._write_deleted()
+                if len(self._deleted) > COMPACT_RATIO * len(self.rows):
+                    self._compact()
+                self._signature = self._current_signature()
+        return len(dead)
+
+    def _compact(self):
+        """Rewrite the files without tombstoned rows (both locks held)."""
+        keep = np.array([pos for pos in range(len(self.rows)) if pos not in self._deleted], dtype=np.int64)
+        matrix = np.array(self._matrix[keep]) if len(keep) else self._matrix[:0]
+        scales = np.array(self._scales[keep]) if self.dtype == "int8" and len(keep) else self._scales[:0]
+        rows = [self.rows[pos] for pos in keep]
+
+        # New files are renamed into place: searches still holding the old
+        # mapping keep reading the old inode instead of a truncated file
+        self._replace(self._vector_file, matrix.tobytes())
+        if self.dtype == "int8":
+            self._replace(self._file("scales.f32"), scales.tobytes())
+        self._replace(self._file("rows.jsonl"), "".join(json.dumps(row) + "\n" for row in rows).encode())
+        self.rows = rows
+        self._deleted = set()
+        self._write_deleted()
+        self._map()
+
+    # -------------------- Search --------------------
+    def check_due(self) -> bool:
+        return time.monotonic() - self.checked_at >= settings.RAG_LOCAL_INDEX_CHECK_INTERVAL
+
+    def __len__(self) -> int:
+        return len(self.rows) - len(self._deleted)
+
+    def search(self, query, k: int, category: Optional[str] = None) -> List[Tuple[Dict, float]]:
+        """Top-k (row, cosine similarity), best first."""
+        q = np.asarray(query, dtype=np.float32)
+        q = q / (np.linalg.norm(q) or 1.0)
+        with self._lock:
+            matrix, scales, rows = self._matrix, self._scales, self.rows
+            deleted, categories = list(self._deleted), self._categories
+        if not len(rows) or k <= 0:
+            return []
+
+        if self.dtype == "int8":
+            # Dequantise block by block instead of casting the whole matrix at once
+            scores = np.empty(len(matrix), dtype=np.float32)
+            for start in range(0, len(matrix), INT8_BLOCK_ROWS):
+                block = matrix[start:start + INT8_BLOCK_ROWS]
+                scores[start:start + len(block)] = block.astype(np.float32) @ q
+            scores *= scales
+        else:
+            scores = matrix @ q
+        if deleted:
+            scores[deleted] = -np.inf
+        if category:
+            scores[categories != category] = -np.inf
+
+        k = min(k, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [(rows[pos], float(scores[pos])) for pos in top if np.isfinite(scores[pos])]
+
+
+# -------------------- Registry --------------------
+_indexes: Dict[str, BrandVectorIndex] = {}
+_too_large: Dict[str, float] = {}  # brand -> when it was found over the limit
+_registry_lock = threading.Lock()
+_build_locks: Dict[str, threading.Lock] = {}
+
+
+def _build_lock(key: str) -> threading.Lock:
+    """Serialises opening, building and dropping one brand's directory."""
+    with _registry_lock:
+        return _build_locks.setdefault(key, threading.Lock())
+
+
+def brand_index_path(brand_id) -> str:
+    return os.path.join(settings.RAG_LOCAL_INDEX_DIR, str(brand_id))
+
+
+def get_brand_index(brand_id) -> Optional[BrandVectorIndex]:
+    """The brand's index if enabled and built (opened from disk on first use)."""
+    if not settings.RAG_LOCAL_INDEX:
+        return None
+    key = str(brand_id)
+    index = _indexes.get(key)
+    if index is not None and index.refresh():
+        return index
+    with _build_lock(key):
+        # Not while a build is half-written: open() would see an empty index
+        index = _indexes.get(key)
+        if index is None or not index.refresh():
+            index = BrandVectorIndex.open(brand_index_path(key))
+            if index is None:
+                _indexes.pop(key, None)
+            else:
+                _indexes[key] = index
+        return index
+
+
+def build_brand_index(brand_id, rows: List[Dict], vectors, model: Optional[str] = None) -> Optional[BrandVectorIndex]:
+    """
+    Build from all of a brand's chunks, unless another worker already has;
+    None if the brand is over RAG_LOCAL_INDEX_MAX_CHUNKS.
+    """
+    key = str(brand_id)
+    if len(rows) > settings.RAG_LOCAL_INDEX_MAX_CHUNKS:
+        mark_too_large(brand_id)
+        return None
+    vectors = np.asarray(vectors, dtype=np.float32)
+    dim = vectors.shape[1] if vectors.ndim == 2 and len(vectors) else 0
+    if not dim:
+        return None
+    path = brand_index_path(key)
+    with _build_lock(key):
+        # A concurrent first search (here or in another worker) may have built it
+        index = _indexes.get(key)
+        if index is not None and index.refresh():
+            return index
+        # Check and build under one file lock, so two workers never both build
+        os.makedirs(settings.RAG_LOCAL_INDEX_DIR, exist_ok=True)
+        with _exclusive(BrandVectorIndex.lock_path(path)):
+            index = BrandVectorIndex._open(path)
+            if index is None:
+                index = BrandVectorIndex._create(path, dim, settings.RAG_LOCAL_INDEX_DTYPE, model)
+                index._append(rows, vectors)
+                index.checked_at = time.monotonic()  # rows just read from Postgres
+        _indexes[key] = index
+        _too_large.pop(key, None)
+    return index
+
+
+def mark_too_large(brand_id):
+    _too_large[str(brand_id)] = time.monotonic()
+    drop_brand_index(brand_id)
+
+
+def is_too_large(brand_id) -> bool:
+    """Over RAG_LOCAL_INDEX_MAX_CHUNKS when last counted; recounted after the check interval."""
+    marked = _too_large.get(str(brand_id))
+    return marked is not None and time.monotonic() - marked < settings.RAG_LOCAL_INDEX_CHECK_INTERVAL
+
+
+def index_chunks(brand_id, rows: List[Dict], vectors, model: Optional[str] = None) -> bool:
+    """Incremental add after ingest; drops the index once the brand outgrows it."""
+    index = get_brand_index(brand_id)
+    if index is None or not rows:
+        return False
+    if index.model != model or np.asarray(vectors).shape[-1] != index.dim:
+        drop_brand_index(brand_id)  # embedding model changed; rebuilt on next search
+        return False
+    if len(index) + len(rows) > settings.RAG_LOCAL_INDEX_MAX_CHUNKS:
+        mark_too_large(brand_id)
+        return False
+    index.add(rows, vectors)
+    return True
+
+
+def unindex_documents(brand_id, document_ids: Iterable) -> int:
+    index = get_brand_index(brand_id)
+    return index.remove(document_ids) if index is not None else 0
+
+
+def drop_brand_index(brand_id):
+    key = str(brand_id)
+    path = brand_index_path(key)
+    with _build_lock(key):
+        _indexes.pop(key, None)
+        if os.path.isdir(path):
+            with _exclusive(BrandVectorIndex.lock_path(path)):
+                shutil.rmtree(path, ignore_errors=True)
@@ -1,4 +1,8 @@
--- Run this after documents are ingested and extension exists.
--- Requires pgvector v0.5+ and enough rows for ivfflat (lists value tuneable).
-CREATE INDEX IF NOT EXISTS documents_embedding_ivfflat ON documents USING ivfflat (embedding vector_cosine_ops) WITH (lists = 100);
+-- Superseded by alembic/versions/0005_add_brand_hnsw_indexes.py:
+-- one partial HNSW index per brand (app/services/vector_indexes.py), created
+-- for existing brands by the migration and for new brands on first ingest.
+-- Manual equivalent for one brand (pgvector v0.5+):
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_documents_embedding_hnsw_<brand_uuid_hex>
+    ON documents USING hnsw (embedding vector_cosine_ops) WITH (m = 16, ef_construction = 64)
+    WHERE brand_id = '<brand_uuid>';
 ANALYZE documents;
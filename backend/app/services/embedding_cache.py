@@ -0,0 +1,191 @@
+# app/services/embedding_cache.py
+"""
+Content-hash embedding cache shared by every ingest path and the query path.
+
+Key: (model, sha256(text)). Lookups go in-process LRU -> embedding_cache
+table -> provider; only texts missing from both tiers are embedded, each
+distinct text once per call. New vectors are written back with
+INSERT ... ON CONFLICT DO NOTHING in the caller's session (committed with
+the documents). Query-path callers pass persist=False: they read both tiers
+but only fill the LRU, so a search never writes in the caller's transaction.
+"""
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql, sqlite
+
+from app.core.config import settings
+from app.models.embedding_cache import EmbeddingCacheEntry
+
+Vector = List[float]
+
+cache_table = EmbeddingCacheEntry.__table__
+
+
+def content_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def _pack(vector: Vector) -> bytes:
+    return np.asarray(vector, dtype=np.float32).tobytes()
+
+
+def _unpack(blob: bytes) -> Vector:
+    return np.frombuffer(blob, dtype=np.float32).tolist()
+
+
+class EmbeddingCache:
+    """(model, sha256) -> vector; LRU of `capacity` entries over the side table."""
+
+    def __init__(self, capacity: Optional[int] = None):
+        self.capacity = capacity or settings.EMBEDDING_CACHE_SIZE
+        self._lru: "OrderedDict[Tuple[str, str], Vector]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"lookups": 0, "memory_hits": 0, "db_hits": 0, "misses": 0}
+
+    # -------------------- Metrics --------------------
+    def stats(self) -> Dict:
+        with self._lock:
+            stats = dict(self._stats)
+            stats["entries"] = len(self._lru)
+        lookups = stats["lookups"]
+        stats["hit_rate"] = round((stats["memory_hits"] + stats["db_hits"]) / lookups, 4) if lookups else 0.0
+        return stats
+
+    def _count(self, lookups: int, memory_hits: int, db_hits: int):
+        with self._lock:
+            self._stats["lookups"] += lookups
+            self._stats["memory_hits"] += memory_hits
+            self._stats["db_hits"] += db_hits
+            self._stats["misses"] += lookups - memory_hits - db_hits
+
+    # -------------------- Memory tier --------------------
+    def _lookup_memory(self, model: str, texts: List[str]):
+        """hash per text, vectors found in the LRU, distinct hashes still missing"""
+        hashes = [content_hash(text) for text in texts]
+        found: Dict[str, Vector] = {}
+        missing: Dict[str, str] = {}  # hash -> text, first occurrence order
+        with self._lock:
+            for text, digest in zip(texts, hashes):
+                if digest in found or digest in missing:
+                    continue
+                vector = self._lru.get((model, digest))
+                if vector is not None:
+                    self._lru.move_to_end((model, digest))
+                    found[digest] = vector
+                else:
+                    missing[digest] = text
+        return hashes, found, missing
+
+    def _remember(self, model: str, vectors: Dict[str, Vector]):
+        with self._lock:
+            for digest, vector in vectors.items():
+                self._lru[(model, digest)] = vector
+                self._lru.move_to_end((model, digest))
+            while len(self._lru) > self.capacity:
+                self._lru.popitem(last=False)
+
+    # -------------------- Table tier --------------------
+    @staticmethod
+    def _select(model: str, digests: List[str]):
+        return select(EmbeddingCacheEntry.content_hash, EmbeddingCacheEntry.embedding).where(
+            EmbeddingCacheEntry.model == model,
+            EmbeddingCacheEntry.content_hash.in_(digests),
+        )
+
+    @staticmethod
+    def _insert(db, model: str, vectors: Dict[str, Vector]):
+        dialect = db.get_bind().dialect.name
+        rows = [
+            {"model": model, "content_hash": digest, "dim": len(vector), "embedding": _pack(vector)}
+            for digest, vector in vectors.items()
+        ]
+        if dialect == "postgresql":
+            return postgresql.insert(cache_table).values(rows).on_conflict_do_nothing()
+        if dialect == "sqlite":
+            return sqlite.insert(cache_table).values(rows).on_conflict_do_nothing()
+        return cache_table.insert().prefix_with("IGNORE").values(rows)  # MySQL
+
+    def _accept_rows(self, model: str, rows, found: Dict[str, Vector], missing: Dict[str, str]) -> int:
+        loaded = {digest: _unpack(blob) for digest, blob in rows}
+        found.update(loaded)
+        for digest in loaded:
+            missing.pop(digest, None)
+        self._remember(model, loaded)
+        return len(loaded)
+
+    def _accept_computed(self, model: str, missing: Dict[str, str], vectors: List[Vector], found: Dict[str, Vector]):
+        computed = dict(zip(missing, vectors))
+        found.update(computed)
+        self._remember(model, computed)
+        return computed
+
+    # -------------------- Lookup-or-embed --------------------
+    async def embed(
+        self,
+        model: str,
+        texts: List[str],
+        compute: Callable[[List[str]], Awaitable[List[Vector]]],
+        db=None,
+        persist: bool = True,
+    ) -> List[Vector]:
+        """Async path (AsyncSession); compute embeds the texts missing from both tiers."""
+        hashes, found, missing = self._lookup_memory(model, texts)
+        lookups, memory_hits, db_hits = len(found) + len(missing), len(found), 0
+
+        if missing and db is not None:
+            rows = (await db.execute(self._select(model, list(missing)))).all()
+            db_hits = self._accept_rows(model, rows, found, missing)
+        if missing:
+            computed = self._accept_computed(model, missing, await compute(list(missing.values())), found)
+            if persist and db is not None:
+                await db.execute(self._insert(db, model, computed))
+
+        self._count(lookups, memory_hits, db_hits)
+        return [found[digest] for digest in hashes]
+
+    def embed_sync(
+        self,
+        model: str,
+        texts: List[str],
+        compute: Callable[[List[str]], List[Vector]],
+        db=None,
+        persist: bool = True,
+    ) -> List[Vector]:
+        """Same as embed() for synchronous Sessions."""
+        hashes, found, missing = self._lookup_memory(model, texts)
+        lookups, memory_hits, db_hits = len(found) + len(missing), len(found), 0
+
+        if missing and db is not None:
+            rows = db.execute(self._select(model, list(missing))).all()
+            db_hits = self._accept_rows(model, rows, found, missing)
+        if missing:
+            computed = self._accept_computed(model, missing, compute(list(missing.values())), found)
+            if persist and db is not None:
+                db.execute(self._insert(db, model, computed))
+
+        self._count(lookups, memory_hits, db_hits)
+        return [found[digest] for digest in hashes]
+
+
+# Process-wide cache used by EmbeddingClient and embed_texts_cached
+embedding_cache = EmbeddingCache()
+
+
+def embed_texts_cached(
+    texts: List[str],
+    db=None,
+    persist: bool = True,
+    model_name: Optional[str] = None,
+) -> List[Vector]:
+    """embedder.embed_texts (local SentenceTransformer) behind the shared cache."""
+    from app.services.embedder import embed_texts  # loads sentence-transformers on first use
+
+    model_name = model_name or settings.LOCAL_EMBEDDING_MODEL
+    return embedding_cache.embed_sync(
+        model_name, texts, lambda missing: embed_texts(missing, model_name), db=db, persist=persist
+    )
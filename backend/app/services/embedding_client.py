@@ -0,0 +1,204 @@
+# app/services/embedding_client.py
+"""
+Batched embedding client.
+
+Texts are split into provider-sized batches and sent over one pooled
+httpx.AsyncClient, at most `concurrency` batches in flight, with retry and
+backoff on 429/5xx. Ingest cost scales with the number of batches, not the
+number of chunks, and never blocks the event loop.
+
+Backends:
+  voyage  Voyage embeddings API (VOYAGE_EMBEDDINGS_URL, batches of 128)
+  local   SentenceTransformer via embedder.embed_texts, run in a worker thread
+
+With a cache (embedding_cache.EmbeddingCache) only texts not cached under
+backend.cache_key(input_type) reach the backend.
+"""
+import asyncio
+import random
+from typing import Dict, List, Optional
+
+import httpx
+
+from app.core.config import settings
+from app.services.embedding_cache import EmbeddingCache, embedding_cache
+
+
+class EmbeddingError(Exception):
+    """Embedding provider failed after all retries."""
+
+
+class EmbeddingBackend:
+    """One provider call per batch; subclasses implement embed_batch."""
+
+    name = "base"
+
+    def __init__(self, model: str, batch_size: int):
+        self.model = model
+        self.batch_size = batch_size
+
+    def cache_key(self, input_type: str) -> str:
+        """Cache namespace: texts embed identically under one key."""
+        return self.model
+
+    async def embed_batch(self, texts: List[str], input_type: str = "document") -> List[List[float]]:
+        raise NotImplementedError
+
+    async def aclose(self):
+        pass
+
+
+class VoyageBackend(EmbeddingBackend):
+    """Voyage /v1/embeddings over a pooled async client."""
+
+    name = "voyage"
+    RETRY_STATUS = {429, 500, 502, 503, 504}
+    MAX_BACKOFF = 30.0  # seconds, also caps Retry-After
+
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        model: Optional[str] = None,
+        url: Optional[str] = None,
+        batch_size: Optional[int] = None,
+        max_retries: Optional[int] = None,
+        timeout: float = 30.0,
+        max_connections: int = 8,
+    ):
+        super().__init__(model or settings.VOYAGE_MODEL, batch_size or settings.VOYAGE_BATCH_SIZE)
+        self.api_key = api_key or settings.VOYAGE_API_KEY
+        self.url = url or settings.VOYAGE_EMBEDDINGS_URL
+        self.max_retries = settings.EMBEDDING_MAX_RETRIES if max_retries is None else max_retries
+        self.retries = 0
+        self._client = httpx.AsyncClient(
+            timeout=timeout,
+            headers={"Authorization": f"Bearer {self.api_key}"},
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
+        )
+
+    def cache_key(self, input_type: str) -> str:
+        # Voyage embeds queries and documents differently
+        return f"{self.model}:{input_type}"
+
+    def _backoff(self, attempt: int, response: Optional[httpx.Response]) -> float:
+        retry_after = response.headers.get("retry-after") if response is not None else None
+        if retry_after:
+            try:
+                return min(self.MAX_BACKOFF, max(0.0, float(retry_after)))
+            except ValueError:
+                pass
+        return min(self.MAX_BACKOFF, 0.5 * 2 ** attempt) * (0.5 + random.random() / 2)
+
+    async def embed_batch(self, texts: List[str], input_type: str = "document") -> List[List[float]]:
+        payload = {"model": self.model, "input": texts, "input_type": input_type}
+        for attempt in range(self.max_retries + 1):
+            response = None
+            try:
+                response = await self._client.post(self.url, json=payload)
+                if response.status_code not in self.RETRY_STATUS:
+                    response.raise_for_status()
+                    data = sorted(response.json()["data"], key=lambda item: item["index"])
+                    return [item["embedding"] for item in data]
+            except httpx.TransportError:
+                pass
+            if attempt == self.max_retries:
+                break
+            self.retries += 1
+            await asyncio.sleep(self._backoff(attempt, response))
+
+        status = response.status_code if response is not None else "transport error"
+        raise EmbeddingError(f"Voyage embeddings failed after {self.max_retries + 1} attempts ({status})")
+
+    async def aclose(self):
+        await self._client.aclose()
+
+
+class LocalBackend(EmbeddingBackend):
+    """SentenceTransformer (embedder.embed_texts), off the event loop."""
+
+    name = "local"
+
+    def __init__(self, model: Optional[str] = None, batch_size: Optional[int] = None):
+        super().__init__(model or settings.LOCAL_EMBEDDING_MODEL, batch_size or settings.LOCAL_EMBEDDING_BATCH_SIZE)
+
+    async def embed_batch(self, texts: List[str], input_type: str = "document") -> List[List[float]]:
+        from app.services.embedder import embed_texts  # loads sentence-transformers on first use
+
+        return await asyncio.to_thread(embed_texts, texts, self.model)
+
+
+class EmbeddingClient:
+    """Order-preserving batched embedding with bounded concurrency."""
+
+    def __init__(
+        self,
+        backend: EmbeddingBackend,
+        concurrency: Optional[int] = None,
+        cache: Optional[EmbeddingCache] = None,
+    ):
+        self.backend = backend
+        self.concurrency = concurrency or settings.EMBEDDING_CONCURRENCY
+        self.cache = cache
+        self.stats: Dict[str, int] = {"texts": 0, "batches": 0}
+
+    @property
+    def model(self) -> str:
+        return self.backend.model
+
+    async def embed(
+        self,
+        texts: List[str],
+        input_type: str = "document",
+        db=None,
+        persist: bool = True,
+    ) -> List[List[float]]:
+        """
+        Vectors for texts, in order. db (AsyncSession) enables the cache's
+        table tier; persist=False only reads it.
+        """
+        if not texts:
+            return []
+        if self.cache is None:
+            return await self._embed_uncached(texts, input_type)
+        return await self.cache.embed(
+            self.backend.cache_key(input_type),
+            texts,
+            lambda missing: self._embed_uncached(missing, input_type),
+            db=db,
+            persist=persist,
+        )
+
+    async def _embed_uncached(self, texts: List[str], input_type: str) -> List[List[float]]:
+        size = self.backend.batch_size
+        batches = [texts[i:i + size] for i in range(0, len(texts), size)]
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def run(batch: List[str]) -> List[List[float]]:
+            async with semaphore:
+                return await self.backend.embed_batch(batch, input_type)
+
+        results = await asyncio.gather(*(run(batch) for batch in batches))
+        self.stats["texts"] += len(texts)
+        self.stats["batches"] += len(batches)
+        return [vector for batch in results for vector in batch]
+
+    async def embed_query(self, text: str, db=None) -> List[float]:
+        return (await self.embed([text], input_type="query", db=db, persist=False))[0]
+
+    async def aclose(self):
+        await self.backend.aclose()
+
+
+_default_client: Optional[EmbeddingClient] = None
+
+
+def get_embedding_client() -> EmbeddingClient:
+    """Process-wide client for settings.EMBEDDING_BACKEND (voyage | local)."""
+    global _default_client
+    if _default_client is None:
+        if settings.EMBEDDING_BACKEND == "local":
+            backend: EmbeddingBackend = LocalBackend()
+        else:
+            backend = VoyageBackend()
+        _default_client = EmbeddingClient(backend, cache=embedding_cache)
+    return _default_client
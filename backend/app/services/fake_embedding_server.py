@@ -0,0 +1,139 @@
+# app/services/fake_embedding_server.py
+"""
+Local fake embedding server for tests and ingest benchmarks.
+
+Speaks the Voyage /v1/embeddings shape ({"input": [...]} ->
+{"data": [{"index", "embedding"}]}) over HTTP/1.1 keep-alive. Vectors are
+deterministic unit vectors seeded from sha256(text), so equal texts embed
+equally. Optional per-request latency mimics the remote API, and
+fail_every=N answers every Nth request with 429 to exercise retries.
+Counts connections, requests and texts so callers can compare strategies.
+"""
+import asyncio
+import hashlib
+import json
+import threading
+from typing import List, Optional
+
+import numpy as np
+
+
+def fake_embedding(text: str, dim: int) -> List[float]:
+    seed = int.from_bytes(hashlib.sha256(text.encode("utf-8")).digest()[:8], "little")
+    vector = np.random.default_rng(seed).standard_normal(dim).astype(np.float32)
+    return (vector / np.linalg.norm(vector)).tolist()
+
+
+class FakeEmbeddingServer:
+    """Tiny asyncio HTTP responder for POST /v1/embeddings."""
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        dim: int = 1536,
+        latency: float = 0.0,
+        fail_every: int = 0,
+    ):
+        self.host = host
+        self.port = port
+        self.dim = dim
+        self.latency = latency
+        self.fail_every = fail_every
+        self.stats = {"connections": 0, "requests": 0, "texts": 0, "rejected": 0}
+
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}/v1/embeddings"
+
+    async def _respond(self, writer: asyncio.StreamWriter, status: str, body: dict):
+        payload = json.dumps(body).encode()
+        writer.write(
+            f"HTTP/1.1 {status}\r\nContent-Type: application/json\r\n"
+            f"Content-Length: {len(payload)}\r\n\r\n".encode() + payload
+        )
+        await writer.drain()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.stats["connections"] += 1
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                headers = {}
+                while True:
+                    line = (await reader.readline()).decode("latin-1").strip()
+                    if not line:
+                        break
+                    name, _, value = line.partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                body = await reader.readexactly(int(headers.get("content-length", 0)))
+
+                self.stats["requests"] += 1
+                if self.latency:
+                    await asyncio.sleep(self.latency)
+                if self.fail_every and self.stats["requests"] % self.fail_every == 0:
+                    self.stats["rejected"] += 1
+                    await self._respond(writer, "429 Too Many Requests", {"detail": "rate limited"})
+                    continue
+
+                texts = json.loads(body or b"{}").get("input", [])
+                if isinstance(texts, str):
+                    texts = [texts]
+                self.stats["texts"] += len(texts)
+                await self._respond(writer, "200 OK", {
+                    "object": "list",
+                    "data": [
+                        {"object": "embedding", "index": i, "embedding": fake_embedding(text, self.dim)}
+                        for i, text in enumerate(texts)
+                    ],
+                })
+        except (ConnectionResetError, BrokenPipeError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def start(self):
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        if self._server:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    # Background-thread mode: the server keeps its own loop
+
+    def start_in_thread(self) -> "FakeEmbeddingServer":
+        ready = threading.Event()
+
+        def run():
+            self._loop = asyncio.new_event_loop()
+            self._loop.run_until_complete(self.start())
+            ready.set()
+            self._loop.run_forever()
+            self._loop.run_until_complete(self.stop())
+            self._loop.close()
+
+        self._thread = threading.Thread(target=run, daemon=True)
+        self._thread.start()
+        ready.wait()
+        return self
+
+    def stop_thread(self):
+        if self._loop and self._thread:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self) -> "FakeEmbeddingServer":
+        return self.start_in_thread()
+
+    def __exit__(self, *exc):
+        self.stop_thread()
@@ -0,0 +1,104 @@
+# app/services/hybrid_search.py
+"""
+Lexical leg and rank fusion for hybrid retrieval.
+
+Chunks are matched with Postgres full-text search: the GIN index from
+Alembic 0006 covers to_tsvector('english', coalesce(chunk_text, content))
+for chunk rows, and the query becomes an OR of its terms ranked with
+ts_rank_cd, so a short query like "newsletter content" still matches
+chunks containing only one of the words.
+
+RAGService.hybrid_search runs this leg on its own session concurrently
+with the vector leg and merges the two rankings with weighted reciprocal
+rank fusion: score(d) = sum over legs of weight / (rrf_k + rank).
+Only ranks matter, so cosine similarities and ts_rank values never have
+to be put on one scale.
+"""
+import re
+from typing import Dict, List, Optional, Sequence, Tuple
+from uuid import UUID
+
+from sqlalchemy import func, literal_column, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import load_only
+
+from app.models.document import Document
+
+TS_CONFIG = literal_column("'english'::regconfig")
+MAX_QUERY_TERMS = 32
+
+_term_re = re.compile(r"[^\W_]+")
+
+
+def chunk_tsvector():
+    """Must stay identical to the expression indexed by Alembic 0006."""
+    return func.to_tsvector(TS_CONFIG, func.coalesce(Document.chunk_text, Document.content))
+
+
+def tsquery_text(query: str) -> str:
+    """OR of the query's distinct terms in to_tsquery syntax ("" if none)."""
+    terms = []
+    for term in _term_re.findall(query.lower()):
+        if term not in terms:
+            terms.append(term)
+        if len(terms) == MAX_QUERY_TERMS:
+            break
+    return " | ".join(terms)
+
+
+async def search_lexical(
+    db: AsyncSession,
+    brand_id: UUID,
+    query: str,
+    limit: int = 20,
+    category: Optional[str] = None
+) -> List[Tuple[Document, float]]:
+    """Brand chunks matching any query term, best ts_rank_cd first."""
+    terms = tsquery_text(query)
+    if not terms or limit <= 0:
+        return []
+
+    tsvector = chunk_tsvector()
+    tsquery = func.to_tsquery(TS_CONFIG, terms)
+    rank = func.ts_rank_cd(tsvector, tsquery)
+
+    stmt = (
+        select(Document, rank.label("rank"))
+        .options(load_only(
+            Document.id, Document.brand_id, Document.title, Document.source,
+            Document.document_type, Document.category, Document.content,
+            Document.chunk_text, Document.parent_document_id, Document.chunk_index,
+            Document.doc_metadata
+        ))
+        .where(Document.brand_id == brand_id, Document.is_chunk == True, tsvector.op("@@")(tsquery))
+        .order_by(rank.desc())
+        .limit(limit)
+    )
+    if category:
+        stmt = stmt.where(Document.category == category)
+
+    result = await db.execute(stmt)
+    return [(doc, float(score)) for doc, score in result.all()]
+
+
+def reciprocal_rank_fusion(
+    legs: Sequence[Tuple[List[Tuple[Document, float]], float]],
+    rrf_k: int = 60,
+    limit: int = 10
+) -> List[Tuple[Document, float]]:
+    """
+    Merge ranked (document, score) lists given as (results, weight) pairs.
+    A chunk found by several legs is kept once, with the summed score.
+    """
+    fused: Dict[str, float] = {}
+    docs: Dict[str, Document] = {}
+    for results, weight in legs:
+        if weight <= 0:
+            continue
+        for rank, (doc, _) in enumerate(results, start=1):
+            key = str(doc.id)
+            docs.setdefault(key, doc)
+            fused[key] = fused.get(key, 0.0) + weight / (rrf_k + rank)
+
+    ranked = sorted(fused.items(), key=lambda item: item[1], reverse=True)[:limit]
+    return [(docs[key], score) for key, score in ranked]
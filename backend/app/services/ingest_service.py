@@ -1,6 +1,6 @@
 # app/services/ingest_service.py
 from app.services.chunker import chunk_text
-from app.services.embedder import embed_texts
+from app.services.embedding_cache import embed_texts_cached
 from app.db.database import SessionLocal
 from app.models.document import Document
 from sqlalchemy.orm import Session
@@ -13,7 +13,8 @@ def ingest_raw_text_for_brand(brand_id: int, source: str, text: str, metadata: d
         close_db = True
     try:
         chunks = chunk_text(text, chunk_size=1200, overlap=200)
-        embeddings = embed_texts(chunks)  # ensure embedding dim matches Document.embedding
+        # unchanged chunks come from the embedding cache; ensure dim matches Document.embedding
+        embeddings = embed_texts_cached(chunks, db=db)
         docs = []
         for chunk, emb in zip(chunks, embeddings):
             doc = Document(
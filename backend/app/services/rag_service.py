@@ -1,4 +1,6 @@
+import asyncio
 import os
+import time
 from typing import List, Optional, Dict, Any
 from uuid import UUID
 
@@ -6,18 +8,27 @@ import numpy as np
 from llama_cpp import Llama
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, text, func, and_
+from sqlalchemy.orm import load_only
 from sentence_transformers import SentenceTransformer
 from huggingface_hub import login
 from dotenv import load_dotenv
 
 from app.models.document import Document
 from app.core.config import settings
+from app.db.database import AsyncSessionLocal
+from app.services.embedding_client import EmbeddingClient, get_embedding_client
+from app.services.vector_indexes import ensure_brand_index
+from app.services.brand_vector_index import (
+    BrandVectorIndex, build_brand_index, drop_brand_index, get_brand_index, index_chunks, is_too_large,
+    mark_too_large, unindex_documents
+)
+from app.services.hybrid_search import reciprocal_rank_fusion, search_lexical
 
 load_dotenv()  # Load environment variables early
 
 
 class RAGService:
-    def __init__(self):
+    def __init__(self, embedding_client: Optional[EmbeddingClient] = None, session_factory=None):
         # --- Local GGUF LLaMA model for offline generation ---
         # Only load if model path is configured and exists
         self.local_llm = None
@@ -27,23 +38,28 @@ class RAGService:
             except Exception as e:
                 print(f"Warning: Could not load local LLM: {e}")
 
-        # --- Voyage API for cloud embeddings ---
-        self.voyage_api_key = settings.VOYAGE_API_KEY
-        self.voyage_model = settings.VOYAGE_MODEL
+        # --- Batched embeddings (Voyage API or local SentenceTransformer) ---
+        self.embedding_client = embedding_client or get_embedding_client()
+
+        # Sessions for the lexical leg, which runs beside the caller's session
+        self.session_factory = session_factory or AsyncSessionLocal
 
         self.chunk_size = getattr(settings, "CHUNK_SIZE", 500)
         self.chunk_overlap = getattr(settings, "CHUNK_OVERLAP", 50)
 
     # -------------------- Embeddings --------------------
-    def generate_embedding(self, text: str) -> list:
-        """Generate embedding using Voyage API."""
-        import requests
-
-        headers = {"Authorization": f"Bearer {self.voyage_api_key}"}
-        payload = {"model": self.voyage_model, "input": text}
-        response = requests.post("https://api.voyage.xyz/embeddings", json=payload, headers=headers)
-        response.raise_for_status()
-        return response.json()["embedding"]
+    async def generate_embedding(self, text: str, db: Optional[AsyncSession] = None) -> list:
+        """Embed a single query text (read-through embedding cache)."""
+        return await self.embedding_client.embed_query(text, db=db)
+
+    async def generate_embeddings(self, texts: List[str], db: Optional[AsyncSession] = None) -> List[list]:
+        """
+        Embed document chunks in provider-sized batches (one call per batch).
+        Chunks already in the embedding cache are not re-embedded; new
+        vectors are cached in db's transaction
+        """
+        return await self.embedding_client.embed(texts, db=db)
+
     # -------------------- Text Chunking --------------------
     def chunk_text(self, text: str) -> List[str]:
         """Split text into overlapping chunks."""
@@ -89,9 +105,11 @@ class RAGService:
         await db.flush()
 
         # --- Chunking and embeddings ---
+        chunks = self.chunk_text(content)
+        embeddings = await self.generate_embeddings(chunks, db=db)
+
         chunk_docs = []
-        for idx, chunk_text in enumerate(self.chunk_text(content)):
-            embedding = self.generate_embedding(chunk_text)
+        for idx, (chunk_text, embedding) in enumerate(zip(chunks, embeddings)):
             chunk_doc = Document(
                 brand_id=brand_id,
                 title=f"{title} - Chunk {idx+1}",
@@ -103,9 +121,9 @@ class RAGService:
                 is_chunk=True,
                 parent_document_id=parent_doc.id,
                 chunk_index=idx,
-                total_chunks=len(chunk_docs) + 1,
+                total_chunks=len(chunks),
                 embedding=embedding,
-                embedding_model=settings.EMBEDDING_MODEL,
+                embedding_model=self.embedding_client.model,
                 doc_metadata=metadata,
                 category=category,
                 word_count=len(chunk_text.split()),
@@ -119,6 +137,21 @@ class RAGService:
         for c in chunk_docs:
             await db.refresh(c)
 
+        # In-process index (if this brand has one) picks the new chunks up now
+        if settings.RAG_LOCAL_INDEX:
+            await asyncio.to_thread(
+                index_chunks, brand_id, [self._index_row(c) for c in chunk_docs], embeddings,
+                self.embedding_client.model
+            )
+
+        # First document of a brand: build its partial HNSW index
+        try:
+            if await ensure_brand_index(db, brand_id):
+                await db.commit()
+        except Exception as e:
+            await db.rollback()
+            print(f"Warning: Could not create vector index for brand {brand_id}: {e}")
+
         return [parent_doc] + chunk_docs
 
     # -------------------- Similarity Search --------------------
@@ -131,40 +164,174 @@ class RAGService:
         category: Optional[str] = None,
         similarity_threshold: float = 0.7
     ) -> List[tuple[Document, float]]:
-        """Search for most similar document chunks."""
-        query_embedding = self.generate_embedding(query)
-
-        sql = """
-        SELECT id, 1 - (embedding <=> :query_embedding) AS similarity
-        FROM documents
-        WHERE brand_id = :brand_id
-          AND is_chunk = true
-          AND (1 - (embedding <=> :query_embedding)) >= :threshold
         """
+        Search for most similar document chunks.
+
+        One query: ORDER BY embedding <=> :query LIMIT :limit walks the
+        brand's HNSW index (vector_indexes.py) and returns the chunk columns
+        with the distance, computed once per row. The threshold is applied
+        to those top-k rows afterwards, a WHERE on the distance would force
+        an exact scan.
+
+        Brands with an in-process index (RAG_LOCAL_INDEX, brand_vector_index.py)
+        are served from it without touching Postgres.
+        """
+        query_embedding = await self.generate_embedding(query, db=db)
+
+        index = await self._local_index(db, brand_id)
+        if index is not None and index.dim == len(query_embedding):
+            # A full mat-vec over the brand's chunks: keep it off the event loop
+            hits = await asyncio.to_thread(index.search, query_embedding, limit, category)
+            return [
+                (self._document_from_row(brand_id, row), similarity)
+                for row, similarity in hits
+                if similarity >= similarity_threshold
+            ]
+
+        distance = Document.embedding.cosine_distance(query_embedding)
+
+        stmt = (
+            select(Document, distance.label("distance"))
+            .options(load_only(
+                Document.id, Document.brand_id, Document.title, Document.source,
+                Document.document_type, Document.category, Document.content,
+                Document.chunk_text, Document.parent_document_id, Document.chunk_index,
+                Document.doc_metadata
+            ))
+            .where(Document.brand_id == brand_id, Document.is_chunk == True)
+            .order_by(distance)
+            .limit(limit)
+        )
         if category:
-            sql += " AND category = :category"
-        sql += " ORDER BY similarity DESC LIMIT :limit"
-
-        params = {
-            "query_embedding": str(query_embedding),
-            "brand_id": str(brand_id),
-            "threshold": similarity_threshold,
-            "limit": limit
-        }
-        if category:
-            params["category"] = category
+            stmt = stmt.where(Document.category == category)
+            # Filtered after the index scan: widen the candidate list so top-k stays full
+            await db.execute(text(f"SET LOCAL hnsw.ef_search = {max(settings.RAG_HNSW_EF_SEARCH, limit)}"))
 
-        result = await db.execute(text(sql), params)
-        rows = result.fetchall()
+        result = await db.execute(stmt)
 
         docs_with_scores = []
-        for row in rows:
-            doc = await db.get(Document, row.id)
-            if doc:
-                docs_with_scores.append((doc, row.similarity))
+        for doc, dist in result.all():
+            similarity = 1 - dist
+            if similarity >= similarity_threshold:
+                docs_with_scores.append((doc, similarity))
 
         return docs_with_scores
 
+    # -------------------- In-process Index --------------------
+    @staticmethod
+    def _index_row(doc: Document) -> Dict[str, Any]:
+        return {
+            "id": str(doc.id),
+            "parent_id": str(doc.parent_document_id) if doc.parent_document_id is not None else None,
+            "category": doc.category,
+            "title": doc.title,
+            "content": doc.chunk_text or doc.content,
+        }
+
+    @staticmethod
+    def _document_from_row(brand_id: UUID, row: Dict[str, Any]) -> Document:
+        """Detached, read-only Document carrying the indexed chunk."""
+        return Document(
+            id=row["id"],
+            brand_id=brand_id,
+            parent_document_id=row.get("parent_id"),
+            category=row.get("category"),
+            title=row.get("title"),
+            content=row["content"],
+            chunk_text=row["content"],
+            is_chunk=True,
+        )
+
+    async def _local_index(self, db: AsyncSession, brand_id: UUID) -> Optional[BrandVectorIndex]:
+        """
+        The brand's in-process index, built from its chunks on first use;
+        None when disabled or the brand exceeds RAG_LOCAL_INDEX_MAX_CHUNKS.
+        Every RAG_LOCAL_INDEX_CHECK_INTERVAL its row count is compared with
+        Postgres, so chunks written by other paths (ingest_service, raw SQL)
+        trigger a rebuild; so does an index built with another model
+        """
+        if not settings.RAG_LOCAL_INDEX or is_too_large(brand_id):
+            return None
+        model = self.embedding_client.model
+        index = await asyncio.to_thread(get_brand_index, brand_id)
+        if index is not None and index.model == model and not index.check_due():
+            return index
+
+        indexed = (Document.brand_id == brand_id, Document.is_chunk == True, Document.embedding.isnot(None))
+        count = await db.scalar(select(func.count()).select_from(Document).where(*indexed))
+        if index is not None:
+            if index.model == model and len(index) == count:
+                index.checked_at = time.monotonic()
+                return index
+            await asyncio.to_thread(drop_brand_index, brand_id)
+        if count > settings.RAG_LOCAL_INDEX_MAX_CHUNKS:
+            await asyncio.to_thread(mark_too_large, brand_id)
+            return None
+
+        result = await db.execute(
+            select(
+                Document.id, Document.parent_document_id, Document.category, Document.title,
+                Document.chunk_text, Document.content, Document.embedding
+            )
+            .where(*indexed)
+            .limit(settings.RAG_LOCAL_INDEX_MAX_CHUNKS + 1)
+        )
+        chunks = result.all()
+        rows = [self._index_row(chunk) for chunk in chunks]
+        vectors = [chunk.embedding for chunk in chunks]
+        return await asyncio.to_thread(
+            build_brand_index, brand_id, rows, vectors, self.embedding_client.model
+        )
+
+    # -------------------- Hybrid Search --------------------
+    async def hybrid_search(
+        self,
+        db: AsyncSession,
+        brand_id: UUID,
+        query: str,
+        limit: int = 10,
+        category: Optional[str] = None,
+        vector_weight: Optional[float] = None,
+        lexical_weight: Optional[float] = None,
+        rrf_k: Optional[int] = None
+    ) -> List[tuple[Document, float]]:
+        """
+        Vector and full-text chunk search fused by reciprocal rank
+        (hybrid_search.py). The legs run concurrently, the lexical one on its
+        own session, so a hybrid search costs the slower leg rather than both.
+        The vector leg only drops hits below RAG_HYBRID_MIN_SIMILARITY; a
+        weight of 0 skips that leg. Scores returned are fused RRF scores
+        """
+        vector_weight = settings.RAG_VECTOR_WEIGHT if vector_weight is None else vector_weight
+        lexical_weight = settings.RAG_LEXICAL_WEIGHT if lexical_weight is None else lexical_weight
+        candidates = max(limit, settings.RAG_HYBRID_CANDIDATES)
+
+        async def vector_leg():
+            if vector_weight <= 0:
+                return []
+            return await self.search_similar_documents(
+                db, brand_id, query, limit=candidates, category=category,
+                similarity_threshold=settings.RAG_HYBRID_MIN_SIMILARITY
+            )
+
+        async def lexical_leg():
+            if lexical_weight <= 0:
+                return []
+            try:
+                async with self.session_factory() as lexical_db:
+                    return await search_lexical(lexical_db, brand_id, query, candidates, category)
+            except Exception as e:
+                # Vector results alone are still a usable answer
+                print(f"Warning: Lexical search failed for brand {brand_id}: {e}")
+                return []
+
+        vector_hits, lexical_hits = await asyncio.gather(vector_leg(), lexical_leg())
+        return reciprocal_rank_fusion(
+            [(vector_hits, vector_weight), (lexical_hits, lexical_weight)],
+            rrf_k=settings.RAG_RRF_K if rrf_k is None else rrf_k,
+            limit=limit
+        )
+
     # -------------------- Context for Generation --------------------
     async def get_context_for_generation(
         self,
@@ -172,12 +339,25 @@ class RAGService:
         brand_id: UUID,
         query: str,
         max_context_length: int = 2000,
-        category: Optional[str] = None
+        category: Optional[str] = None,
+        vector_weight: Optional[float] = None,
+        lexical_weight: Optional[float] = None
     ) -> str:
-        """Build context by concatenating top relevant chunks."""
-        similar_docs = await self.search_similar_documents(
-            db, brand_id, query, limit=10, category=category
-        )
+        """
+        Build context by concatenating top relevant chunks. With RAG_HYBRID
+        the chunks come from hybrid_search (weights default to
+        RAG_VECTOR_WEIGHT / RAG_LEXICAL_WEIGHT), otherwise from vector search
+        with its 0.7 similarity threshold
+        """
+        if settings.RAG_HYBRID:
+            similar_docs = await self.hybrid_search(
+                db, brand_id, query, limit=10, category=category,
+                vector_weight=vector_weight, lexical_weight=lexical_weight
+            )
+        else:
+            similar_docs = await self.search_similar_documents(
+                db, brand_id, query, limit=10, category=category
+            )
         if not similar_docs:
             return ""
 
@@ -212,6 +392,7 @@ class RAGService:
         doc = await db.get(Document, document_id)
         if not doc:
             return False
+        brand_id = doc.brand_id
 
         if not doc.is_chunk:
             await db.execute(
@@ -221,6 +402,9 @@ class RAGService:
 
         await db.delete(doc)
         await db.commit()
+
+        if settings.RAG_LOCAL_INDEX:
+            await asyncio.to_thread(unindex_documents, brand_id, [document_id])
         return True
 
     # -------------------- Document Stats --------------------
@@ -0,0 +1,40 @@
+# app/services/retrieval.py
+"""
+Top-k passage retrieval for the /generate_rag route.
+
+Served by the brand's in-process index (brand_vector_index.py) when one is
+built; otherwise one pgvector query ordered by distance on the caller's
+synchronous session.
+"""
+from typing import Dict, List, Optional
+
+from sqlalchemy import text
+
+from app.core.config import settings
+from app.services.brand_vector_index import get_brand_index
+
+
+def retrieve_top_k(brand_id, query_embedding, k: int = 4, db=None, model: Optional[str] = None) -> List[Dict]:
+    """
+    [{"id", "content", "score"}] best first. model is the one that embedded
+    the query (embed_texts_cached's default if None); the local index is
+    only used when it was built with the same one.
+    """
+    model = model or settings.LOCAL_EMBEDDING_MODEL
+    index = get_brand_index(brand_id)
+    if index is not None and index.model == model and index.dim == len(query_embedding):
+        return [
+            {"id": row["id"], "content": row["content"], "score": score}
+            for row, score in index.search(query_embedding, k)
+        ]
+    if db is None:
+        return []
+
+    rows = db.execute(text("""
+        SELECT id, content, 1 - (embedding <=> CAST(:q AS vector)) AS score
+        FROM documents
+        WHERE brand_id = :brand_id AND embedding IS NOT NULL
+        ORDER BY embedding <=> CAST(:q AS vector)
+        LIMIT :k
+    """), {"q": str(list(query_embedding)), "brand_id": brand_id, "k": k}).fetchall()
+    return [{"id": row.id, "content": row.content, "score": float(row.score)} for row in rows]
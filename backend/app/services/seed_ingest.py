@@ -4,6 +4,7 @@ import os
 import sys
 from app.db.database import SessionLocal
 from app.services.ingest_service import ingest_raw_text_for_brand
+from app.services.embedding_cache import embedding_cache
 
 def main():
     if len(sys.argv) < 2:
@@ -27,6 +28,9 @@ def main():
         total += len(docs)
     db.close()
     print("Total chunks ingested:", total)
+    stats = embedding_cache.stats()
+    print(f"Embedding cache: {stats['misses']} embedded, "
+          f"{stats['memory_hits'] + stats['db_hits']} cached (hit rate {stats['hit_rate']:.0%})")
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,54 @@
+# app/services/vector_indexes.py
+"""
+Per-brand HNSW indexes on documents.embedding.
+
+Every retrieval filters on one brand, so each brand gets a partial index
+(WHERE brand_id = ...). The ANN scan then only walks that brand's graph
+and a top-k never comes back short because other brands' rows were
+filtered out after the index scan. Existing brands are indexed by Alembic
+0005; brands first seen by RAGService.add_document get theirs on ingest.
+"""
+from typing import Set
+from uuid import UUID
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+
+_indexed_brands: Set[str] = set()
+
+
+def brand_index_name(brand_id) -> str:
+    return f"ix_documents_embedding_hnsw_{UUID(str(brand_id)).hex}"
+
+
+def brand_index_ddl(brand_id, concurrently: bool = False) -> str:
+    """CREATE INDEX for one brand (brand_id is validated as a UUID, DDL cannot bind it)."""
+    brand_uuid = UUID(str(brand_id))
+    return (
+        f"CREATE INDEX {'CONCURRENTLY ' if concurrently else ''}IF NOT EXISTS {brand_index_name(brand_uuid)} "
+        f"ON documents USING hnsw (embedding vector_cosine_ops) "
+        f"WITH (m = {settings.RAG_HNSW_M}, ef_construction = {settings.RAG_HNSW_EF_CONSTRUCTION}) "
+        f"WHERE brand_id = '{brand_uuid}'"
+    )
+
+
+async def ensure_brand_index(db: AsyncSession, brand_id) -> bool:
+    """
+    Create the brand's partial index if it is missing (catalog check first,
+    so the common case takes no lock on documents). Returns True if created
+    """
+    key = str(brand_id)
+    if key in _indexed_brands:
+        return False
+    exists = (await db.execute(
+        text("SELECT 1 FROM pg_indexes WHERE tablename = 'documents' AND indexname = :name"),
+        {"name": brand_index_name(brand_id)}
+    )).first()
+    created = False
+    if not exists:
+        await db.execute(text(brand_index_ddl(brand_id)))
+        created = True
+    _indexed_brands.add(key)
+    return created
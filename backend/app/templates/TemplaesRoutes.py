@@ -244,7 +244,8 @@ async def generate_from_template(
     if request.rag_enabled:
         query = user_prompt[:500]  # Use first part of prompt as query
         rag_context = await rag_service.get_context_for_generation(
-            db, template.brand_id, query, category=template.category
+            db, template.brand_id, query, category=template.category,
+            vector_weight=request.rag_vector_weight, lexical_weight=request.rag_lexical_weight
         )
     
     # Add RAG context to prompt
@@ -96,6 +96,8 @@ class TemplateGenerateRequest(BaseModel):
     variations_count: int = Field(default=1, ge=1, le=5)
     temperature: float = Field(default=0.7, ge=0.0, le=2.0)
     rag_enabled: bool = False
+    rag_vector_weight: Optional[float] = Field(None, ge=0.0)  # hybrid retrieval weights, None = server default
+    rag_lexical_weight: Optional[float] = Field(None, ge=0.0)
     custom_instructions: Optional[str] = None
 
 # Generate Response Schema
@@ -0,0 +1,84 @@
+"""EmbeddingClient + VoyageBackend against the local FakeEmbeddingServer."""
+import asyncio
+import os
+
+import httpx
+
+# app.db.database builds its clients at import; they are never connected here
+os.environ.setdefault("DATABASE_URL", "postgresql+asyncpg://localhost/test")
+os.environ.setdefault("MONGO_DB_NAME", "test")
+
+from app.services.embedding_cache import EmbeddingCache  # noqa: E402
+from app.services.embedding_client import EmbeddingClient, VoyageBackend  # noqa: E402
+from app.services.fake_embedding_server import FakeEmbeddingServer, fake_embedding  # noqa: E402
+
+DIM = 8
+
+
+def embed(server, texts, cache=None, batch_size=3, concurrency=4, **backend_kwargs):
+    """Run one EmbeddingClient.embed call; returns (vectors, backend)."""
+    async def run():
+        backend = VoyageBackend(
+            api_key="test", url=server.url, batch_size=batch_size, **backend_kwargs
+        )
+        backend._backoff = lambda attempt, response: 0.0  # retry immediately
+        client = EmbeddingClient(backend, concurrency=concurrency, cache=cache)
+        try:
+            return await client.embed(texts), backend
+        finally:
+            await client.aclose()
+
+    return asyncio.run(run())
+
+
+def test_order_preserved_across_concurrent_batches():
+    texts = [f"chunk {i}" for i in range(20)]
+    with FakeEmbeddingServer(dim=DIM, latency=0.01) as server:
+        vectors, _ = embed(server, texts)
+
+    assert vectors == [fake_embedding(text, DIM) for text in texts]
+    assert server.stats["requests"] == 7  # ceil(20 / 3)
+
+
+def test_duplicates_embedded_once_with_cache():
+    texts = ["a", "b", "a", "c", "b", "a"]
+    with FakeEmbeddingServer(dim=DIM) as server:
+        vectors, _ = embed(server, texts, cache=EmbeddingCache(capacity=100))
+
+    assert vectors == [fake_embedding(text, DIM) for text in texts]
+    assert server.stats["texts"] == 3
+
+
+def test_duplicates_kept_in_place_without_cache():
+    texts = ["a", "b", "a"]
+    with FakeEmbeddingServer(dim=DIM) as server:
+        vectors, _ = embed(server, texts, batch_size=2)
+
+    assert vectors[0] == vectors[2] == fake_embedding("a", DIM)
+    assert vectors[1] == fake_embedding("b", DIM)
+
+
+def test_429_is_retried():
+    texts = [f"chunk {i}" for i in range(12)]
+    with FakeEmbeddingServer(dim=DIM, fail_every=2) as server:
+        vectors, backend = embed(server, texts, concurrency=1, max_retries=4)
+
+    assert vectors == [fake_embedding(text, DIM) for text in texts]
+    assert server.stats["rejected"] > 0
+    assert backend.retries == server.stats["rejected"]
+
+
+def test_retry_after_is_capped():
+    async def run():
+        backend = VoyageBackend(api_key="test", url="http://127.0.0.1:9/")
+        try:
+            return (
+                backend._backoff(0, httpx.Response(429, headers={"retry-after": "3600"})),
+                backend._backoff(0, httpx.Response(429, headers={"retry-after": "2"})),
+            )
+        finally:
+            await backend.aclose()
+
+    capped, honoured = asyncio.run(run())
+    assert capped == VoyageBackend.MAX_BACKOFF
+    assert honoured == 2.0